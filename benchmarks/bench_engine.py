@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Banking Application - Sharded Engine Benchmark
+Throughput of the multi-process ShardedEngine against single-process apply_batch()
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.python.banking_batch import apply_batch
+from src.python.banking_engine import ShardedEngine
+from src.python.python_oop_banking import CheckingAccount
+
+
+def make_workload(accounts, operations, batch_size, seed=7):
+    rng = np.random.default_rng(seed)
+    ids = rng.integers(0, accounts, operations)
+    kinds = rng.integers(0, 2, operations)
+    amounts = np.round(rng.uniform(1, 400, operations), 2)
+    numbers = [f"AC{i:08d}" for i in range(accounts)]
+    batches = []
+    for start in range(0, operations, batch_size):
+        stop = start + batch_size
+        batches.append((ids[start:stop], kinds[start:stop], amounts[start:stop],
+                        [(numbers[i], k, a) for i, k, a in
+                         zip(ids[start:stop].tolist(), kinds[start:stop].tolist(), amounts[start:stop].tolist())]))
+    return numbers, batches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accounts", type=int, default=100_000)
+    parser.add_argument("--operations", type=int, default=2_000_000)
+    parser.add_argument("--batch-size", type=int, default=200_000)
+    parser.add_argument("--shards", default="1,2,4", help="comma-separated shard counts")
+    args = parser.parse_args()
+
+    numbers, batches = make_workload(args.accounts, args.operations, args.batch_size)
+    print(f"{args.operations:,} operations over {args.accounts:,} accounts in batches of {args.batch_size:,}")
+    print("-" * 60)
+    print(f"{'engine':<28}{'ops/sec':>16}{'total':>16}")
+
+    accounts = [CheckingAccount(number, "Customer", 1000.0) for number in numbers]
+    start = time.perf_counter()
+    for ids, kinds, amounts, _tuples in batches:
+        apply_batch(accounts, list(zip(ids.tolist(), kinds.tolist(), amounts.tolist())))
+    elapsed = time.perf_counter() - start
+    expected = sum(a.balance.cents for a in accounts)
+    print(f"{'apply_batch (1 process)':<28}{args.operations / elapsed:>16,.0f}{expected / 100:>16,.2f}")
+
+    for shards in (int(s) for s in args.shards.split(",")):
+        accounts = [CheckingAccount(number, "Customer", 1000.0) for number in numbers]
+        with ShardedEngine(accounts, shards=shards) as engine:
+            start = time.perf_counter()
+            for _ids, _kinds, _amounts, operations in batches:
+                engine.apply(operations)
+            elapsed = time.perf_counter() - start
+            total = engine.total_balance()
+        print(f"{f'ShardedEngine ({shards} shards)':<28}{args.operations / elapsed:>16,.0f}{float(total):>16,.2f}")
+
+
+if __name__ == "__main__":
+    main()
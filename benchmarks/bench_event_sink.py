@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Banking Application - Event Sink Benchmark
+Deposit/withdraw throughput with each event sink versus print() per operation
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.python.banking_events import ConsoleSink, JsonlFileSink, MemorySink, NullSink
+from src.python.python_oop_banking import CheckingAccount, set_event_sink
+
+
+def run_operations(count):
+    """Alternate deposits and withdrawals on one account; returns ops/sec"""
+    account = CheckingAccount("CA001", "Bench User", 1000.0, 500.0)
+    start = time.perf_counter()
+    for _ in range(count // 2):
+        account.deposit(25.0)
+        account.withdraw(25.0)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000, help="operations per sink")
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, 'w')
+    tmpdir = tempfile.mkdtemp()
+    sinks = [
+        ("print per operation", ConsoleSink(stream=devnull)),
+        ("buffered console", ConsoleSink(stream=devnull, buffer_size=1000)),
+        ("jsonl file", JsonlFileSink(os.path.join(tmpdir, "events.jsonl"))),
+        ("memory", MemorySink()),
+        ("null", NullSink()),
+    ]
+
+    print(f"Running {args.count:,} operations per sink (console output goes to {os.devnull})")
+    print("-" * 60)
+    print(f"{'sink':<24}{'ops/sec':>16}")
+    for name, sink in sinks:
+        previous = set_event_sink(sink)
+        try:
+            rate = run_operations(args.count)
+        finally:
+            set_event_sink(previous)
+            sink.close()
+        print(f"{name:<24}{rate:>16,.0f}")
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
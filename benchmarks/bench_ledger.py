@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Banking Application - Ledger Benchmark
+Compares the legacy list-of-dicts history with the columnar TransactionLedger
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.python.banking_ledger import TransactionLedger
+
+
+class DictLedger:
+    """The original representation: one dict per transaction"""
+
+    def __init__(self):
+        self.transactions = []
+
+    def append(self, transaction_type, amount, balance_after):
+        self.transactions.append({
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'type': transaction_type,
+            'amount': amount,
+            'balance_after': balance_after
+        })
+
+
+def measure(ledger_factory, count):
+    """Return (bytes per entry, appends per second) for a ledger type"""
+    tracemalloc.start()
+    ledger = ledger_factory()
+    balance = 0.0
+    start = time.perf_counter()
+    for i in range(count):
+        amount = float(i % 500) + 0.25
+        balance += amount
+        ledger.append("Deposit", amount, balance)
+    elapsed = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / count, count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000, help="transactions to record")
+    args = parser.parse_args()
+
+    print(f"Recording {args.count:,} transactions per representation")
+    print("-" * 60)
+    print(f"{'representation':<22}{'bytes/entry':>14}{'appends/sec':>18}")
+    for name, factory in (("list of dicts", DictLedger), ("TransactionLedger", TransactionLedger)):
+        per_entry, rate = measure(factory, args.count)
+        print(f"{name:<22}{per_entry:>14.1f}{rate:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Banking Application - Account Memory Benchmark
+Per-account footprint of the slotted, integer-cent accounts versus the
+original __dict__/float/datetime representation
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.python.python_oop_banking import CheckingAccount
+
+
+class LegacyCheckingAccount:
+    """The original layout: instance __dict__, float balance, datetime, list history"""
+
+    def __init__(self, account_number, account_holder, initial_balance=0.0, overdraft_limit=500.0):
+        self.account_number = account_number
+        self.account_holder = account_holder
+        self.balance = initial_balance
+        self.transactions = []
+        self.account_type = "Basic"
+        self.created_date = datetime.now()
+        self.account_type = "Checking"
+        self.overdraft_limit = overdraft_limit
+
+
+def build(account_class, numbers, holders):
+    return [account_class(number, holders[i % len(holders)], 0.0) for i, number in enumerate(numbers)]
+
+
+def measure(account_class, count):
+    """Return (bytes per account, seconds) to build ``count`` accounts"""
+    holders = [f"Customer {i}" for i in range(1000)]
+    numbers = [f"CA{i:08d}" for i in range(count)]
+
+    gc.collect()
+    start = time.perf_counter()
+    accounts = build(account_class, numbers, holders)
+    elapsed = time.perf_counter() - start
+    del accounts
+
+    gc.collect()
+    tracemalloc.start()
+    accounts = build(account_class, numbers, holders)
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    list_overhead = sys.getsizeof(accounts)
+    del accounts
+    return (current - list_overhead) / count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000, help="accounts to instantiate")
+    args = parser.parse_args()
+
+    print(f"Instantiating {args.count:,} checking accounts per layout")
+    print("-" * 60)
+    print(f"{'layout':<24}{'bytes/account':>16}{'seconds':>12}")
+    for name, account_class in (("legacy (__dict__)", LegacyCheckingAccount),
+                                ("slotted (cents)", CheckingAccount)):
+        per_account, elapsed = measure(account_class, args.count)
+        print(f"{name:<24}{per_account:>16.0f}{elapsed:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Banking Application - Multi-threaded Transfer Benchmark
+Compares one global lock with per-account locks and ordered transfer()
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.python.python_oop_banking import CheckingAccount, transfer
+
+GLOBAL_LOCK = threading.Lock()
+
+
+def transfer_with_global_lock(source, destination, amount):
+    """The previous approach: serialize all account work behind one lock"""
+    with GLOBAL_LOCK:
+        if source.withdraw(amount):
+            destination.deposit(amount)
+            return True
+        return False
+
+
+def run(transfer_function, accounts, threads, count):
+    """Run ``count`` random transfers on a thread pool; returns transfers/sec"""
+    rng = random.Random(42)
+    pairs = [tuple(rng.sample(accounts, 2)) for _ in range(count)]
+    chunk = count // threads
+
+    def worker(start):
+        for source, destination in pairs[start:start + chunk]:
+            transfer_function(source, destination, 1.0)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(worker, range(0, chunk * threads, chunk)))
+    return chunk * threads / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--count", type=int, default=200_000, help="transfers per run")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{args.count:,} random transfers across {args.accounts:,} checking accounts")
+    print("-" * 60)
+    print(f"{'threads':>8}{'global lock/sec':>20}{'per-account/sec':>20}")
+    for threads in args.threads:
+        rates = []
+        for function in (transfer_with_global_lock, transfer):
+            accounts = [CheckingAccount(f"CA{i:07d}", "Bench", 1000.0) for i in range(args.accounts)]
+            rates.append(run(function, accounts, threads, args.count))
+        print(f"{threads:>8}{rates[0]:>20,.0f}{rates[1]:>20,.0f}")
+
+
+if __name__ == "__main__":
+    main()
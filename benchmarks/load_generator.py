@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Banking Application - Service Load Generator
+Opens many concurrent sessions against the asyncio banking service and
+reports throughput and p50/p99 latency
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.python.banking_service import BankingService, create_demo_book
+
+
+async def session(host, port, requests, accounts, seed, latencies, errors):
+    """One client connection sending ``requests`` requests back to back"""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for request_id in range(requests):
+            request = {
+                'id': request_id,
+                'op': rng.choice(("deposit", "withdraw")),
+                'account': f"AC{rng.randrange(accounts):06d}",
+                'amount': rng.randrange(1, 5000) / 100,
+            }
+            started = time.perf_counter()
+            writer.write(json.dumps(request).encode('utf-8') + b"\n")
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - started)
+            if not response['ok']:
+                errors[response['error']] = errors.get(response['error'], 0) + 1
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run(args):
+    server = None
+    if args.in_process:
+        service = BankingService(create_demo_book(args.accounts), max_pending=args.max_pending)
+        server = await service.start(args.host, args.port)
+
+    latencies, errors = [], {}
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        session(args.host, args.port, args.requests, args.accounts, seed, latencies, errors)
+        for seed in range(args.sessions)
+    ))
+    elapsed = time.perf_counter() - started
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+        print(f"Server ran {service.batches_run:,} batches for {len(latencies):,} requests")
+
+    latencies.sort()
+    print(f"{args.sessions:,} sessions x {args.requests:,} requests in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:,.0f} req/s)")
+    print(f"p50 {percentile(latencies, 0.50) * 1000:.2f} ms   "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms   "
+          f"max {latencies[-1] * 1000:.2f} ms")
+    if errors:
+        print(f"Errors: {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", type=int, default=1000, help="concurrent connections")
+    parser.add_argument("--requests", type=int, default=50, help="requests per session")
+    parser.add_argument("--accounts", type=int, default=1000, help="AC###### accounts on the server")
+    parser.add_argument("--in-process", action="store_true", help="start the service in this process")
+    parser.add_argument("--max-pending", type=int, default=10000)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Banking Application - Benchmark Suite
+Throughput and memory of the banking core, saved as JSON and checked against
+a stored baseline so regressions fail before they ship
+
+    python benchmarks/suite.py                       # run and compare with baseline.json
+    python benchmarks/suite.py --sizes 1000,100000   # other population sizes
+    python benchmarks/suite.py --save-baseline       # accept the current numbers
+"""
+
+import argparse
+import csv
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.python.banking_interest import accrue_interest
+from src.python.banking_jobs import InterestJob, MaintenanceJob, MonthlyFeeJob, run_maintenance
+from src.python.python_data_structures import read_customers_from_csv
+from src.python.python_oop_banking import BankAccount, SavingsAccount, CheckingAccount
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+ACCOUNT_CLASSES = (BankAccount, SavingsAccount, CheckingAccount)
+
+HIGHER = "higher"
+LOWER = "lower"
+
+
+def best_of(repeat, run):
+    """Shortest wall time of ``repeat`` calls to ``run(...)``; setup happens inside ``run``"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        timings.append(run())
+    return min(timings)
+
+
+def make_accounts(account_class, size):
+    return [account_class(f"AC{i:08d}", f"Customer {i % 1000}", 1000.0) for i in range(size)]
+
+
+def bench_deposit_withdraw(size, repeat):
+    """Deposit/withdraw pairs per second, per account class"""
+    results = {}
+    for account_class in ACCOUNT_CLASSES:
+        def run():
+            accounts = make_accounts(account_class, size)
+            start = time.perf_counter()
+            for account in accounts:
+                account.deposit(25.5)
+                account.withdraw(10.25)
+            return time.perf_counter() - start
+        results[f"deposit_withdraw.{account_class.account_type}"] = (size / best_of(repeat, run), "pairs/s", HIGHER)
+    return results
+
+
+def bench_memory(size, repeat):
+    """Bytes per account (per class) and per ledger entry"""
+    results = {}
+    for account_class in ACCOUNT_CLASSES:
+        gc.collect()
+        tracemalloc.start()
+        accounts = [account_class(f"AC{i:08d}", "Customer", 0.0) for i in range(size)]
+        current, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        per_account = (current - sys.getsizeof(accounts)) / size
+        results[f"memory_per_account.{account_class.account_type}"] = (per_account, "bytes", LOWER)
+        del accounts
+
+    account = BankAccount("AC00000000", "Customer")
+    account.deposit(1.0)
+    gc.collect()
+    tracemalloc.start()
+    for _ in range(size):
+        account.deposit(1.25)
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results["memory_per_transaction"] = (current / size, "bytes", LOWER)
+    return results
+
+
+def bench_history(size, repeat):
+    """Recent-history lookups and full history copies on an account with ``size`` entries"""
+    account = BankAccount("AC00000000", "Customer", 1.0)
+    for _ in range(size):
+        account.deposit(1.0)
+    lookups = 10_000
+
+    def recent():
+        start = time.perf_counter()
+        for _ in range(lookups):
+            account.get_recent_transactions(5)
+        return time.perf_counter() - start
+
+    def full():
+        start = time.perf_counter()
+        account.get_transaction_history()
+        return time.perf_counter() - start
+
+    return {
+        "history_recent_5": (lookups / best_of(repeat, recent), "calls/s", HIGHER),
+        "history_full": (size / best_of(repeat, full), "entries/s", HIGHER),
+    }
+
+
+def bench_interest(size, repeat):
+    """calculate_interest() per account against vectorized accrue_interest()"""
+    last_date = datetime.now() - timedelta(days=100)
+
+    def make_savings():
+        accounts = make_accounts(SavingsAccount, size)
+        for account in accounts:
+            account.last_interest_date = last_date
+        return accounts
+
+    def per_account():
+        accounts = make_savings()
+        start = time.perf_counter()
+        for account in accounts:
+            account.calculate_interest()
+        return time.perf_counter() - start
+
+    def vectorized():
+        accounts = make_savings()
+        start = time.perf_counter()
+        accrue_interest(accounts)
+        return time.perf_counter() - start
+
+    return {
+        "interest_per_account": (size / best_of(repeat, per_account), "accounts/s", HIGHER),
+        "interest_vectorized": (size / best_of(repeat, vectorized), "accounts/s", HIGHER),
+    }
+
+
+class PerAccountFeeJob(MonthlyFeeJob):
+    """Monthly fees posted through withdraw() one account at a time"""
+    post_batch = MaintenanceJob.post_batch
+
+
+class PerAccountInterestJob(InterestJob):
+    """Interest posted through post_interest() one account at a time"""
+    post_batch = MaintenanceJob.post_batch
+
+
+def bench_maintenance(size, repeat):
+    """Month-end fees and interest with per-account posting against the bulk post_batch()"""
+    as_of = datetime.now()
+    last_date = as_of - timedelta(days=100)
+
+    def make_population():
+        accounts = []
+        for account_class in ACCOUNT_CLASSES:
+            accounts.extend(make_accounts(account_class, size // len(ACCOUNT_CLASSES)))
+        for account in accounts:
+            if isinstance(account, SavingsAccount):
+                account.last_interest_date = last_date
+        return accounts
+
+    def timed(jobs):
+        def run():
+            accounts = make_population()
+            start = time.perf_counter()
+            run_maintenance(accounts, jobs, as_of=as_of)
+            return time.perf_counter() - start
+        return len(make_population()) / best_of(repeat, run)
+
+    return {
+        "maintenance_per_account": (timed([PerAccountFeeJob(), PerAccountInterestJob()]), "accounts/s", HIGHER),
+        "maintenance_bulk": (timed([MonthlyFeeJob(), InterestJob()]), "accounts/s", HIGHER),
+    }
+
+
+def bench_csv_loading(size, repeat):
+    """read_customers_from_csv() on a generated file of ``size`` customers"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "customers.csv")
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(["customer_id", "name", "email", "phone", "account_type", "balance"])
+            for i in range(size):
+                writer.writerow([i + 1, f"Customer {i}", f"customer{i}@email.com", f"555-{i % 10000:04d}",
+                                 ("Savings", "Checking")[i % 2], f"{(i * 37) % 10000}.00"])
+
+        def run():
+            start = time.perf_counter()
+            read_customers_from_csv(path)
+            return time.perf_counter() - start
+
+        return {"csv_loading": (size / best_of(repeat, run), "rows/s", HIGHER)}
+
+
+BENCHMARKS = {
+    "deposit_withdraw": bench_deposit_withdraw,
+    "memory": bench_memory,
+    "history": bench_history,
+    "interest": bench_interest,
+    "maintenance": bench_maintenance,
+    "csv_loading": bench_csv_loading,
+}
+
+
+def run_suite(names, sizes, repeat):
+    """Run the selected benchmarks for every size; returns {result name: record}"""
+    results = {}
+    for size in sizes:
+        for name in names:
+            for key, (value, unit, better) in BENCHMARKS[name](size, repeat).items():
+                results[f"{key}@{size}"] = {'value': round(value, 2), 'unit': unit, 'better': better}
+                print(f"  {key + '@' + str(size):<42}{value:>16,.1f} {unit}")
+    return results
+
+
+def compare(results, baseline, threshold, memory_threshold):
+    """Regressions of ``results`` against ``baseline`` beyond the thresholds"""
+    regressions = []
+    for name, record in results.items():
+        reference = baseline.get(name)
+        if reference is None or not reference['value']:
+            continue
+        change = record['value'] / reference['value'] - 1
+        allowed = memory_threshold if record['unit'] == "bytes" else threshold
+        worse = -change if record['better'] == HIGHER else change
+        if worse > allowed:
+            regressions.append((name, reference['value'], record['value'], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated population sizes")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="comma-separated: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement; the best is kept")
+    parser.add_argument("--output", default=None, help="write results JSON here")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.40,
+                        help="allowed throughput slowdown before failing (0.40 = 40%%); "
+                             "tighten it on dedicated benchmark hardware")
+    parser.add_argument("--memory-threshold", type=float, default=0.10,
+                        help="allowed memory growth before failing")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    names = args.only.split(",")
+    for name in names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+
+    print(f"Banking benchmark suite: sizes {sizes}, best of {args.repeat}")
+    print("-" * 70)
+    results = run_suite(names, sizes, args.repeat)
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    with open(args.baseline) as file:
+        stored = json.load(file)
+    regressions = compare(results, stored['results'], args.threshold, args.memory_threshold)
+    print("-" * 70)
+    if (stored.get('python'), stored.get('machine')) != (report['python'], report['machine']):
+        print(f"Note: baseline was recorded on Python {stored.get('python')} / {stored.get('machine')}")
+    if not regressions:
+        print(f"No regressions against {os.path.basename(args.baseline)}")
+        return 0
+    for name, before, after, change in regressions:
+        print(f"REGRESSION {name}: {before:,.1f} -> {after:,.1f} ({change:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
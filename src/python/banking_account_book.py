@@ -0,0 +1,82 @@
+"""
+Python Programming Concepts - Indexed Account Registry
+Banking Application: Looking up accounts by number, holder and type
+"""
+
+
+class AccountBook:
+    """Container of accounts with O(1) lookup by account number and
+    secondary indexes by holder and account type.
+
+    The indexes map a key to an insertion-ordered dict of account number ->
+    account, so adding and closing accounts stays O(1) as well.
+    """
+
+    def __init__(self, accounts=()):
+        self._by_number = {}
+        self._by_holder = {}
+        self._by_type = {}
+        for account in accounts:
+            self.add(account)
+
+    def add(self, account):
+        """Register an account; account numbers must be unique"""
+        number = account.account_number
+        if number in self._by_number:
+            raise ValueError(f"Account {number} already exists")
+        self._by_number[number] = account
+        self._by_holder.setdefault(account.account_holder, {})[number] = account
+        self._by_type.setdefault(account.account_type, {})[number] = account
+        return account
+
+    def close(self, account_number):
+        """Remove an account from the book and all of its indexes"""
+        account = self._by_number.pop(account_number)
+        self._remove_from_index(self._by_holder, account.account_holder, account_number)
+        self._remove_from_index(self._by_type, account.account_type, account_number)
+        return account
+
+    def get(self, account_number, default=None):
+        """Get an account by number"""
+        return self._by_number.get(account_number, default)
+
+    def find_by_holder(self, account_holder):
+        """Get all accounts held by one customer"""
+        return list(self._by_holder.get(account_holder, {}).values())
+
+    def iter_by_type(self, account_type):
+        """Iterate over accounts of one type without scanning the others.
+
+        Like any dict view, the iterator must not outlive an add() or close()
+        of an account of the same type.
+        """
+        return iter(self._by_type.get(account_type, {}).values())
+
+    def count_by_type(self, account_type):
+        """Number of open accounts of one type"""
+        return len(self._by_type.get(account_type, {}))
+
+    def account_types(self):
+        """Account types currently present in the book"""
+        return list(self._by_type)
+
+    def _remove_from_index(self, index, key, account_number):
+        bucket = index[key]
+        del bucket[account_number]
+        if not bucket:
+            del index[key]
+
+    def __getitem__(self, account_number):
+        return self._by_number[account_number]
+
+    def __contains__(self, account_number):
+        return account_number in self._by_number
+
+    def __iter__(self):
+        return iter(self._by_number.values())
+
+    def __len__(self):
+        return len(self._by_number)
+
+    def __repr__(self):
+        return f"AccountBook({len(self._by_number)} accounts)"
@@ -0,0 +1,194 @@
+"""
+Python Programming Concepts - Batch Order Approvals
+Banking Application: Clearing the PENDING backlog of the Orders table in bulk
+"""
+
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from .banking_ledger import to_cents
+
+PENDING = 0
+APPROVED = 1
+REJECTED_AMOUNT = 2
+REJECTED_BALANCE = 3
+
+# What each decision means for the Orders row; PENDING rows are left for manual review
+DECISIONS = {
+    PENDING: ('PENDING', 'manual_review'),
+    APPROVED: ('APPROVED', 'approved'),
+    REJECTED_AMOUNT: ('REJECTED', 'amount_limit'),
+    REJECTED_BALANCE: ('REJECTED', 'insufficient_balance'),
+}
+
+# Largest amount approved automatically per Orders.order_type
+APPROVAL_LIMITS = {
+    'LOAN': 50_000.00,
+    'CREDIT_CARD': 20_000.00,
+    'MORTGAGE': 1_000_000.00,
+    'INVESTMENT': 250_000.00,
+}
+
+# Share of the order amount the customer must hold across active Accounts
+BALANCE_COVERAGE = {
+    'LOAN': 0.10,
+    'CREDIT_CARD': 0.05,
+    'MORTGAGE': 0.01,
+    'INVESTMENT': 1.00,
+}
+
+PENDING_QUERY = """
+SELECT o.order_id, o.order_type, o.amount, COALESCE(SUM(a.balance), 0)
+FROM Orders o
+LEFT JOIN Accounts a ON a.customer_id = o.customer_id AND a.is_active
+WHERE o.status = 'PENDING' AND o.order_id > {p}
+GROUP BY o.order_id, o.order_type, o.amount
+ORDER BY o.order_id
+LIMIT {p}
+"""
+
+UPDATE_STATEMENT = "UPDATE Orders SET status = {p}, approved_date = {p} WHERE order_id = {p} AND status = 'PENDING'"
+
+
+def pending_chunks(connection, chunk_size=10_000, placeholder='?'):
+    """Yield PENDING orders as (order ids, types, amount cents, customer balance cents).
+
+    Pages by order_id (keyset pagination), so each chunk is an indexed range
+    scan and rows decided by earlier chunks never shift later pages.
+    ``placeholder`` is the driver's parameter marker (``%s`` for MySQL).
+    """
+    query = PENDING_QUERY.format(p=placeholder)
+    last_id = 0
+    while True:
+        cursor = connection.cursor()
+        cursor.execute(query, (last_id, chunk_size))
+        rows = cursor.fetchall()
+        cursor.close()
+        if not rows:
+            return
+        ids, types, amounts, balances = zip(*rows)
+        yield (np.array(ids, dtype=np.int64), list(types),
+               np.array([to_cents(amount) for amount in amounts], dtype=np.int64),
+               np.array([to_cents(balance) for balance in balances], dtype=np.int64))
+        last_id = ids[-1]
+
+
+def evaluate_orders(order_types, amounts, balances, limits=APPROVAL_LIMITS, coverage=BALANCE_COVERAGE):
+    """Decision code per order, vectorized over a chunk.
+
+    Orders over their type's limit are rejected, then orders whose customer
+    holds less than the required share of the amount; order types without a
+    limit stay PENDING. Each order is checked against the customer's whole
+    balance, independently of their other pending orders.
+    """
+    amounts = np.asarray(amounts, dtype=np.int64)
+    balances = np.asarray(balances, dtype=np.int64)
+    known = np.array([order_type in limits for order_type in order_types], dtype=bool)
+    limit = np.array([to_cents(limits.get(order_type, 0)) for order_type in order_types], dtype=np.int64)
+    share = np.array([coverage.get(order_type, 0.0) for order_type in order_types], dtype=np.float64)
+
+    decisions = np.full(len(amounts), APPROVED, dtype=np.int8)
+    decisions[balances < np.rint(amounts * share)] = REJECTED_BALANCE
+    decisions[amounts > limit] = REJECTED_AMOUNT
+    decisions[~known] = PENDING
+    return decisions
+
+
+def evaluate_chunk(chunk, limits=APPROVAL_LIMITS, coverage=BALANCE_COVERAGE):
+    """Worker entry point: (order ids, decisions) for one chunk from pending_chunks()"""
+    ids, types, amounts, balances = chunk
+    return ids, evaluate_orders(types, amounts, balances, limits, coverage)
+
+
+def write_decisions(connection, ids, decisions, approved_at, placeholder='?'):
+    """Write one chunk of decisions with a single executemany() and commit it.
+
+    The ``status = 'PENDING'`` guard keeps a rerun, or an order decided by
+    hand meanwhile, from being overwritten. Returns the rows changed.
+    """
+    stamp = approved_at.strftime('%Y-%m-%d %H:%M:%S')
+    rows = [
+        (DECISIONS[code][0], stamp if code == APPROVED else None, order_id)
+        for order_id, code in zip(ids.tolist(), decisions.tolist())
+        if code != PENDING
+    ]
+    if not rows:
+        return 0
+    cursor = connection.cursor()
+    cursor.executemany(UPDATE_STATEMENT.format(p=placeholder), rows)
+    changed = cursor.rowcount
+    cursor.close()
+    connection.commit()
+    return changed if changed >= 0 else len(rows)
+
+
+def approve_pending(connection, chunk_size=10_000, workers=None, limits=APPROVAL_LIMITS,
+                    coverage=BALANCE_COVERAGE, approved_at=None, placeholder='?'):
+    """Decide every PENDING order in ``connection``'s Orders table.
+
+    Chunks stream out of the database, are evaluated by a process pool
+    (``workers=0`` evaluates in-process) with at most two chunks per worker
+    in flight, and each chunk's decisions are written back as one batched
+    update. Every chunk commits on its own, so an interrupted run can simply
+    be started again.
+
+    Returns a dict counting orders per outcome plus 'orders' and 'updated'.
+    """
+    approved_at = approved_at or datetime.now()
+    totals = {'orders': 0, 'updated': 0}
+    totals.update((reason, 0) for _status, reason in DECISIONS.values())
+
+    def record(result):
+        ids, decisions = result
+        totals['orders'] += len(ids)
+        for code, count in zip(*np.unique(decisions, return_counts=True)):
+            totals[DECISIONS[int(code)][1]] += int(count)
+        totals['updated'] += write_decisions(connection, ids, decisions, approved_at, placeholder)
+
+    chunks = pending_chunks(connection, chunk_size, placeholder)
+    if workers == 0:
+        for chunk in chunks:
+            record(evaluate_chunk(chunk, limits, coverage))
+        return totals
+
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = set()
+        for chunk in chunks:
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record(future.result())
+            in_flight.add(executor.submit(evaluate_chunk, chunk, limits, coverage))
+        for future in in_flight:
+            record(future.result())
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Approve or reject PENDING orders in a SQLite banking database")
+    parser.add_argument("database", help="SQLite file with the Orders and Accounts tables")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=None, help="0 evaluates in-process")
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(args.database)
+    try:
+        start = time.perf_counter()
+        totals = approve_pending(connection, args.chunk_size, args.workers)
+        elapsed = time.perf_counter() - start
+    finally:
+        connection.close()
+    print(f"✅ {totals['orders']:,} pending orders in {elapsed:.1f}s: {totals['approved']:,} approved, "
+          f"{totals['amount_limit']:,} over limit, {totals['insufficient_balance']:,} insufficient balance, "
+          f"{totals['manual_review']:,} left for review")
+
+
+if __name__ == "__main__":
+    main()
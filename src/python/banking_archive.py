@@ -0,0 +1,183 @@
+"""
+Python Programming Concepts - Compressed History Archive
+Banking Application: Sealing old ledger entries into zlib-compressed blocks
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+import threading
+import zlib
+
+DEFAULT_BLOCK_SIZE = 4096
+DECODED_CACHE_BLOCKS = 4
+
+
+class ArchiveBlock:
+    """One sealed run of ledger entries plus the index used to avoid decoding it.
+
+    The index holds the time range, the balances after the first and after
+    the last entry, and the total amount per transaction type, which is
+    enough to answer balance lookups at the block edges and whole-block
+    range sums without decompressing anything.
+    """
+
+    __slots__ = ('start', 'count', 'first_timestamp', 'last_timestamp',
+                 'first_balance', 'last_balance', 'type_totals', 'data')
+
+    def __init__(self, start, timestamps, type_codes, amounts, balances):
+        self.start = start
+        self.count = len(timestamps)
+        self.first_timestamp = timestamps[0]
+        self.last_timestamp = timestamps[-1]
+        self.first_balance = balances[0]
+        self.last_balance = balances[-1]
+        totals = {}
+        for code, amount in zip(type_codes, amounts):
+            totals[code] = totals.get(code, 0) + amount
+        self.type_totals = totals
+
+        # Timestamps are stored as offsets from the first one; small numbers compress well
+        first = timestamps[0]
+        offsets = array('q', [timestamp - first for timestamp in timestamps])
+        self.data = zlib.compress(offsets.tobytes() + type_codes.tobytes()
+                                  + amounts.tobytes() + balances.tobytes())
+
+    def decode(self):
+        """Decompress into (timestamps, type codes, amounts, balances) arrays"""
+        raw = zlib.decompress(self.data)
+        count = self.count
+        q_bytes = 8 * count
+        timestamps = array('q')
+        timestamps.frombytes(raw[:q_bytes])
+        type_codes = array('H')
+        type_codes.frombytes(raw[q_bytes:q_bytes + 2 * count])
+        amounts = array('q')
+        amounts.frombytes(raw[q_bytes + 2 * count:2 * q_bytes + 2 * count])
+        balances = array('q')
+        balances.frombytes(raw[2 * q_bytes + 2 * count:])
+        first = self.first_timestamp
+        timestamps = array('q', [first + offset for offset in timestamps])
+        return timestamps, type_codes, amounts, balances
+
+
+class LedgerArchive:
+    """Cold tier of a TransactionLedger: the oldest entries in sealed blocks.
+
+    Positions are global ledger indices, so block ``b`` covers
+    ``[blocks[b].start, blocks[b].start + blocks[b].count)``. The last few
+    decoded blocks are cached so paging through old history does not
+    decompress the same block repeatedly; a lock guards the cache because
+    readers on several threads share it.
+    """
+
+    __slots__ = ('blocks', 'count', '_starts', '_last_timestamps', '_cache', '_cache_lock')
+
+    def __init__(self):
+        self.blocks = []
+        self.count = 0
+        self._starts = []
+        self._last_timestamps = []
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def seal(self, timestamps, type_codes, amounts, balances):
+        """Append one block; the columns must directly follow the archived entries"""
+        block = ArchiveBlock(self.count, timestamps, type_codes, amounts, balances)
+        self.blocks.append(block)
+        self._starts.append(block.start)
+        self._last_timestamps.append(block.last_timestamp)
+        self.count += block.count
+        return block
+
+    @property
+    def last_timestamp(self):
+        return self._last_timestamps[-1] if self.blocks else None
+
+    def compressed_size(self):
+        return sum(len(block.data) for block in self.blocks)
+
+    def _decoded(self, index):
+        with self._cache_lock:
+            columns = self._cache.get(index)
+            if columns is not None:
+                self._cache.move_to_end(index)
+                return columns
+        # Decompress outside the lock; two threads may decode the same block once each
+        columns = self.blocks[index].decode()
+        with self._cache_lock:
+            self._cache[index] = columns
+            self._cache.move_to_end(index)
+            while len(self._cache) > DECODED_CACHE_BLOCKS:
+                self._cache.popitem(last=False)
+        return columns
+
+    def _block_of(self, position):
+        return bisect_right(self._starts, position) - 1
+
+    def bisect(self, epoch, right):
+        """Global position of ``epoch`` among archived timestamps (bisect_left/right semantics)"""
+        search = bisect_right if right else bisect_left
+        index = search(self._last_timestamps, epoch)
+        if index == len(self.blocks):
+            return self.count
+        block = self.blocks[index]
+        if epoch < block.first_timestamp or (not right and epoch == block.first_timestamp):
+            return block.start
+        return block.start + search(self._decoded(index)[0], epoch)
+
+    def balance(self, position):
+        """Balance after the entry at a global position"""
+        index = self._block_of(position)
+        block = self.blocks[index]
+        offset = position - block.start
+        if offset == block.count - 1:
+            return block.last_balance
+        if offset == 0:
+            return block.first_balance
+        return self._decoded(index)[3][offset]
+
+    def columns(self, first, stop):
+        """Columns for global positions [first, stop), decoding only the blocks touched"""
+        result = (array('q'), array('H'), array('q'), array('q'))
+        if first >= stop:
+            return result
+        for index in range(self._block_of(first), len(self.blocks)):
+            block = self.blocks[index]
+            if block.start >= stop:
+                break
+            low = max(first - block.start, 0)
+            high = min(stop - block.start, block.count)
+            for target, column in zip(result, self._decoded(index)):
+                target.extend(column[low:high])
+        return result
+
+    def sum_by_type(self, first, stop, totals):
+        """Add per-type amounts for global positions [first, stop) into ``totals``"""
+        if first >= stop:
+            return totals
+        for index in range(self._block_of(first), len(self.blocks)):
+            block = self.blocks[index]
+            if block.start >= stop:
+                break
+            low = max(first - block.start, 0)
+            high = min(stop - block.start, block.count)
+            if low == 0 and high == block.count:
+                for code, amount in block.type_totals.items():
+                    totals[code] = totals.get(code, 0) + amount
+                continue
+            _timestamps, type_codes, amounts, _balances = self._decoded(index)
+            for code, amount in zip(type_codes[low:high], amounts[low:high]):
+                totals[code] = totals.get(code, 0) + amount
+        return totals
+
+    def __getstate__(self):
+        # The decoded-block cache is rebuilt on demand
+        return {'blocks': self.blocks, 'count': self.count,
+                '_starts': self._starts, '_last_timestamps': self._last_timestamps}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
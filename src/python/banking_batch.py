@@ -0,0 +1,149 @@
+"""
+Python Programming Concepts - Vectorized Batch Operations
+Banking Application: Applying large batches of deposits and withdrawals with NumPy
+"""
+
+import time
+
+import numpy as np
+
+from .banking_ledger import TransactionLedger, to_cents
+from .banking_money import Money
+from .python_oop_banking import _lock_order
+
+DEPOSIT = 0
+WITHDRAW = 1
+
+# One row per operation: index into the accounts sequence, DEPOSIT/WITHDRAW, amount
+OPERATION_DTYPE = np.dtype([('account', np.int64), ('kind', np.int8), ('amount', np.float64)])
+
+
+def apply_batch(accounts, operations):
+    """Apply deposits and withdrawals to many accounts in one pass.
+
+    ``operations`` is a structured array with OPERATION_DTYPE (or anything
+    convertible to one, such as a list of ``(account, kind, amount)`` tuples).
+    Operations for the same account are applied in input order with the
+    same balance rules as deposit()/withdraw(): non-positive amounts are
+    rejected and a withdrawal may not take the balance below the account's
+    withdrawal floor. Amounts are converted to cents exactly as Money.of()
+    converts them (see amounts_to_cents()), so 1.005 is applied as 1.00.
+
+    Every touched account's lock is held (in the global transfer order) from
+    reading its opening balance until its results are posted, so concurrent
+    operations are neither lost nor interleaved. This is a bulk balance path:
+    it does not check velocity rules, emit events or write to the journal,
+    so take an AccountJournal.snapshot() afterwards to make it durable.
+
+    Returns a boolean mask aligned with ``operations``: True where accepted.
+    """
+    ops = np.asarray(operations, dtype=OPERATION_DTYPE)
+    accepted = np.zeros(len(ops), dtype=bool)
+    if len(ops) == 0:
+        return accepted
+
+    kinds = ops['kind']
+    if not np.isin(kinds, (DEPOSIT, WITHDRAW)).all():
+        raise ValueError("operation kind must be DEPOSIT or WITHDRAW")
+    account_ids = ops['account']
+    if account_ids.min() < 0 or account_ids.max() >= len(accounts):
+        raise IndexError("operation refers to an unknown account")
+
+    # Group operations by account while keeping their relative order
+    order = np.argsort(account_ids, kind='stable')
+    acc = account_ids[order]
+    withdraw = kinds[order] == WITHDRAW
+    cents = amounts_to_cents(ops['amount'][order])
+
+    touched, starts, counts = np.unique(acc, return_index=True, return_counts=True)
+    touched_accounts = [accounts[i] for i in touched.tolist()]
+    locks = [account.lock for account in sorted(touched_accounts, key=_lock_order)]
+    for lock in locks:
+        lock.acquire()
+    try:
+        opening = np.array([to_cents(account.balance) for account in touched_accounts], dtype=np.int64)
+        floors = np.array([to_cents(account.get_withdrawal_floor()) for account in touched_accounts],
+                          dtype=np.int64)
+        ok, delta, running = settle(withdraw, cents, opening, floors, starts, counts)
+        _post_results(touched_accounts, starts, counts, ok, withdraw, delta, running)
+    finally:
+        for lock in reversed(locks):
+            lock.release()
+    accepted[order] = ok
+    return accepted
+
+
+def amounts_to_cents(amounts):
+    """Convert float amounts to int64 cents the way Money.of() converts each one.
+
+    Amounts within 1e-6 of a whole cent take the vectorized path; the rest
+    (half cents and finer) go through Money.of(), which rounds the decimal
+    value half to even rather than the nearest binary float.
+    """
+    amounts = np.asarray(amounts, dtype=np.float64)
+    scaled = amounts * 100
+    cents = np.rint(scaled)
+    inexact = ~(np.abs(scaled - cents) < 1e-6)
+    cents = np.where(inexact, 0, cents).astype(np.int64)
+    for i in np.flatnonzero(inexact).tolist():
+        cents[i] = Money.of(float(amounts[i])).cents
+    return cents
+
+
+def settle(withdraw, cents, opening, floors, starts, counts):
+    """Accept or reject operations that are already grouped by account.
+
+    ``withdraw`` and ``cents`` describe the operations; ``starts`` and
+    ``counts`` delimit each account's group and ``opening``/``floors`` hold
+    that account's balance and withdrawal floor in cents. Returns the
+    accepted mask, the signed amount of each operation and the running
+    balance after each accepted one.
+    """
+    valid = cents > 0
+    delta = np.where(withdraw, -cents, cents) * valid
+
+    # Optimistic pass: running balance per account assuming every valid operation succeeds
+    totals = np.cumsum(delta)
+    before_segment = np.concatenate(([0], totals))[starts]
+    running = totals - np.repeat(before_segment - opening, counts)
+    violations = withdraw & valid & (running < np.repeat(floors, counts))
+
+    ok = valid.copy()
+    segment_of = np.repeat(np.arange(len(starts)), counts)
+    for segment in np.unique(segment_of[violations]):
+        # Once a withdrawal is rejected the rest of the account's operations
+        # see a different balance, so replay this account one operation at a time
+        start, stop = starts[segment], starts[segment] + counts[segment]
+        balance = int(opening[segment])
+        floor = int(floors[segment])
+        for i in range(start, stop):
+            if not valid[i]:
+                continue
+            if withdraw[i]:
+                if balance + delta[i] < floor:
+                    ok[i] = False
+                    continue
+            balance += int(delta[i])
+            running[i] = balance
+    return ok, delta, running
+
+
+def _post_results(accounts, starts, counts, ok, withdraw, delta, running):
+    """Write final balances and ledger entries back to the (locked) touched accounts"""
+    timestamp = time.time()
+    deposit_code = TransactionLedger.type_code("Deposit")
+    withdrawal_code = TransactionLedger.type_code("Withdrawal")
+    codes = np.where(withdraw, withdrawal_code, deposit_code)
+    for segment, account in enumerate(accounts):
+        start, stop = starts[segment], starts[segment] + counts[segment]
+        posted = ok[start:stop]
+        if not posted.any():
+            continue
+        balances = running[start:stop][posted]
+        account.balance = Money(int(balances[-1]))
+        account.transactions.extend(
+            codes[start:stop][posted].tolist(),
+            delta[start:stop][posted].tolist(),
+            balances.tolist(),
+            timestamp
+        )
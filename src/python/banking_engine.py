@@ -0,0 +1,267 @@
+"""
+Python Programming Concepts - Multi-Process Sharded Engine
+Banking Application: Account balances in shared memory, one worker per shard
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from .banking_batch import DEPOSIT, WITHDRAW, amounts_to_cents, settle
+from .banking_jobs import shard_of
+from .banking_ledger import to_cents
+from .banking_money import Money
+
+
+def _shared_arrays(buffer, size):
+    """Balance and withdrawal-floor columns (int64 cents) over one shared block"""
+    balances = np.ndarray(size, dtype=np.int64, buffer=buffer)
+    floors = np.ndarray(size, dtype=np.int64, buffer=buffer, offset=size * 8)
+    return balances, floors
+
+
+def _request_arrays(buffer, capacity):
+    """Slot, cents, kind and accepted columns of one shard's request block"""
+    slots = np.ndarray(capacity, dtype=np.int64, buffer=buffer)
+    cents = np.ndarray(capacity, dtype=np.int64, buffer=buffer, offset=capacity * 8)
+    kinds = np.ndarray(capacity, dtype=np.int8, buffer=buffer, offset=capacity * 16)
+    accepted = np.ndarray(capacity, dtype=bool, buffer=buffer, offset=capacity * 17)
+    return slots, cents, kinds, accepted
+
+
+def _settle_request(balances, floors, buffer, capacity, count):
+    """Settle the first ``count`` requests in a block and write their accepted flags"""
+    slots, cents, kinds, accepted = (column[:count] for column in _request_arrays(buffer, capacity))
+    order = np.argsort(slots, kind='stable')
+    touched, starts, counts = np.unique(slots[order], return_index=True, return_counts=True)
+    ok, delta, _running = settle(kinds[order] == WITHDRAW, cents[order],
+                                 balances[touched], floors[touched], starts, counts)
+    balances[touched] += np.add.reduceat(np.where(ok, delta, 0), starts)
+    accepted[order] = ok
+
+
+def _shard_worker(shard, shm_name, size, requests, results):
+    """Apply batches for one shard until a ``None`` request arrives.
+
+    Each request names the shared block holding the batch; the accepted
+    flags are written back into it, so only the block name and row count
+    cross the queues. Only this process writes the balance slots of its
+    shard, so no locking is needed; the parent reads balances straight from
+    shared memory.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    block = None
+    try:
+        balances, floors = _shared_arrays(shm.buf, size)
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            block_name, capacity, count = request
+            try:
+                if block is None or block.name != block_name:
+                    if block is not None:
+                        block.close()
+                    block = shared_memory.SharedMemory(name=block_name)
+                _settle_request(balances, floors, block.buf, capacity, count)
+            except Exception as e:
+                results.put((shard, e.with_traceback(None)))
+            else:
+                results.put((shard, None))
+        del balances, floors
+    finally:
+        if block is not None:
+            block.close()
+        shm.close()
+
+
+class ShardedEngine:
+    """Deposits and withdrawals applied by one worker process per shard.
+
+    Accounts are partitioned by a hash of the account number. Their balances
+    and withdrawal floors (so the Savings minimum balance and the Checking
+    overdraft limit keep holding) live in a ``multiprocessing.shared_memory``
+    block, with each shard's accounts in one contiguous range. ``apply()``
+    routes every operation to the worker that owns its account, so shards
+    settle in parallel on separate cores without sharing any writes. Each
+    shard's batch is written to a shared request block as well, so only its
+    row count is sent to the worker.
+
+    If a worker dies or a batch outlives its timeout, ``apply()`` raises and
+    the engine refuses further batches; close it and start a new one.
+
+    The engine keeps balances only: no ledger entries, events or velocity
+    checks. Call ``sync()`` to copy the balances back to the account objects.
+    Use one thread per engine to call ``apply()``.
+    """
+
+    # How often apply() checks that the workers it waits on are still alive
+    poll_interval = 0.5
+
+    def __init__(self, accounts, shards=None):
+        accounts = list(accounts)
+        self.shards = shards or os.cpu_count() or 1
+        members = [[] for _ in range(self.shards)]
+        for account in accounts:
+            members[shard_of(account.account_number, self.shards)].append(account)
+
+        self.size = len(accounts)
+        self.slots = {}
+        self._shm = shared_memory.SharedMemory(create=True, size=max(16 * self.size, 16))
+        self._balances, floors = _shared_arrays(self._shm.buf, self.size)
+        slot_shards = []
+        for shard, shard_accounts in enumerate(members):
+            for account in shard_accounts:
+                slot = len(self.slots)
+                self.slots[account.account_number] = slot
+                self._balances[slot] = to_cents(account.balance)
+                floors[slot] = to_cents(account.get_withdrawal_floor())
+                slot_shards.append(shard)
+        del floors
+        self._slot_shards = np.array(slot_shards, dtype=np.int64)
+
+        self._lock = threading.Lock()
+        self._failure = None
+        self._blocks = [None] * self.shards
+        self._retired = []
+        self._results = multiprocessing.Queue()
+        self._requests = [multiprocessing.Queue() for _ in range(self.shards)]
+        self._workers = [
+            multiprocessing.Process(target=_shard_worker, daemon=True,
+                                    args=(shard, self._shm.name, self.size, queue, self._results))
+            for shard, queue in enumerate(self._requests)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def apply(self, operations, timeout=None):
+        """Apply ``(account_number, DEPOSIT|WITHDRAW, amount)`` operations.
+
+        Operations on the same account are settled in input order with the
+        same rules as apply_batch(). Returns a boolean accepted mask aligned
+        with ``operations``. Raises RuntimeError if a worker has died and
+        TimeoutError if the shards take longer than ``timeout`` seconds.
+        """
+        operations = list(operations)
+        accepted = np.zeros(len(operations), dtype=bool)
+        if not operations:
+            return accepted
+        numbers, kinds, amounts = zip(*operations)
+        try:
+            slots = np.fromiter((self.slots[number] for number in numbers), dtype=np.int64, count=len(numbers))
+        except KeyError as e:
+            raise KeyError(f"unknown account: {e.args[0]}") from None
+        kinds = np.asarray(kinds, dtype=np.int8)
+        if not np.isin(kinds, (DEPOSIT, WITHDRAW)).all():
+            raise ValueError("operation kind must be DEPOSIT or WITHDRAW")
+        cents = amounts_to_cents(amounts)
+
+        with self._lock:
+            if self._failure is not None:
+                raise RuntimeError("engine is unusable after an earlier failure") from self._failure
+            shard_ids = self._slot_shards[slots]
+            masks = {}
+            for shard in np.unique(shard_ids).tolist():
+                mask = masks[shard] = shard_ids == shard
+                count = int(np.count_nonzero(mask))
+                block, capacity = self._request_block(shard, count)
+                block_slots, block_cents, block_kinds, _ = _request_arrays(block.buf, capacity)
+                block_slots[:count] = slots[mask]
+                block_cents[:count] = cents[mask]
+                block_kinds[:count] = kinds[mask]
+                del block_slots, block_cents, block_kinds
+                self._requests[shard].put((block.name, capacity, count))
+
+            failure = None
+            deadline = None if timeout is None else time.monotonic() + timeout
+            pending = set(masks)
+            while pending:
+                try:
+                    shard, error = self._results.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    dead = [shard for shard in sorted(pending) if not self._workers[shard].is_alive()]
+                    if dead:
+                        self._failure = RuntimeError(
+                            f"shard worker {dead[0]} exited with code {self._workers[dead[0]].exitcode}")
+                        raise self._failure
+                    if deadline is not None and time.monotonic() >= deadline:
+                        self._failure = TimeoutError(f"shards {sorted(pending)} did not answer in {timeout}s")
+                        raise self._failure
+                    continue
+                pending.discard(shard)
+                if error is not None:
+                    failure = error
+                else:
+                    mask = masks[shard]
+                    block, capacity = self._blocks[shard]
+                    accepted[mask] = _request_arrays(block.buf, capacity)[3][:np.count_nonzero(mask)]
+            self._release_retired()
+        if failure is not None:
+            raise failure
+        return accepted
+
+    def _request_block(self, shard, count):
+        """The shard's request block, replaced by a larger one if ``count`` rows do not fit"""
+        current = self._blocks[shard]
+        if current is None or current[1] < count:
+            capacity = max(count, 1024 if current is None else 2 * current[1])
+            if current is not None:
+                # The worker may still be attached; free it once this batch is answered
+                self._retired.append(current[0])
+            block = shared_memory.SharedMemory(create=True, size=capacity * 18)
+            current = self._blocks[shard] = (block, capacity)
+        return current
+
+    def _release_retired(self):
+        for block in self._retired:
+            block.close()
+            block.unlink()
+        self._retired.clear()
+
+    def balance(self, account_number):
+        """Current balance of one account, read from shared memory"""
+        return Money(int(self._balances[self.slots[account_number]]))
+
+    def total_balance(self):
+        return Money(int(self._balances.sum()))
+
+    def sync(self, accounts):
+        """Copy engine balances back onto the account objects.
+
+        Nothing is journaled; take an AccountJournal.snapshot() afterwards
+        to make the synced balances durable.
+        """
+        for account in accounts:
+            slot = self.slots.get(account.account_number)
+            if slot is not None:
+                account.balance = Money(int(self._balances[slot]))
+
+    def close(self):
+        """Stop the workers and release the shared memory"""
+        if self._shm is None:
+            return
+        for requests in self._requests:
+            requests.put(None)
+        for worker in self._workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        del self._balances
+        self._retired.extend(current[0] for current in self._blocks if current is not None)
+        self._blocks = [None] * self.shards
+        self._release_retired()
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,207 @@
+"""
+Python Programming Concepts - Account Event Sinks
+Banking Application: Structured events instead of print() in account operations
+"""
+
+from contextlib import ExitStack, nullcontext
+import json
+import sys
+
+from .banking_money import json_default
+
+# Reasons attached to rejected operations
+INVALID_AMOUNT = "invalid_amount"
+INSUFFICIENT_FUNDS = "insufficient_funds"
+MINIMUM_BALANCE = "minimum_balance"
+OVERDRAFT_EXCEEDED = "overdraft_exceeded"
+VELOCITY_LIMIT = "velocity_limit"
+
+
+def format_event(event):
+    """Render an account event as the human-readable console message"""
+    kind = event['event']
+    amount = event['amount']
+    balance = event['balance']
+
+    if kind == "deposit":
+        if not event['accepted']:
+            return "Error: Deposit amount must be positive."
+        return f"Deposited ${amount:.2f}. New balance: ${balance:.2f}"
+
+    if kind == "withdraw":
+        reason = event['reason']
+        if reason == INVALID_AMOUNT:
+            return "Error: Withdrawal amount must be positive."
+        if reason == INSUFFICIENT_FUNDS:
+            return f"Error: Insufficient funds. Available balance: ${balance:.2f}"
+        if reason == MINIMUM_BALANCE:
+            return f"Error: Withdrawal would violate minimum balance requirement of ${event['floor']:.2f}"
+        if reason == OVERDRAFT_EXCEEDED:
+            return ("Error: Withdrawal exceeds available funds and overdraft limit.\n"
+                    f"Available: ${balance:.2f}, Overdraft limit: ${-event['floor']:.2f}")
+        if reason == VELOCITY_LIMIT:
+            return "Error: Withdrawal limit for this period reached. Please try again later."
+        if reason is not None:
+            return f"Error: Withdrawal rejected ({reason})."
+        if balance < 0:
+            return f"Withdrew ${amount:.2f}. New balance: ${balance:.2f} (Overdraft: ${abs(balance):.2f})"
+        return f"Withdrew ${amount:.2f}. New balance: ${balance:.2f}"
+
+    if kind == "interest":
+        return f"Interest of ${amount:.2f} added. New balance: ${balance:.2f}"
+
+    return f"{kind}: {amount} (balance {balance})"
+
+
+class EventSink:
+    """Base class for destinations of account events.
+
+    Accounts skip building events entirely when ``enabled`` is False.
+    """
+
+    enabled = True
+
+    def emit(self, event):
+        """Receive one event dictionary"""
+        raise NotImplementedError
+
+    def flush(self):
+        """Push any buffered events to their destination"""
+
+    def atomic(self):
+        """Context manager grouping the events emitted inside it.
+
+        Sinks that persist events (the journal) store such a group as one
+        unit, so a crash keeps all of it or none; the others ignore it.
+        """
+        return nullcontext()
+
+    def progress(self, name):
+        """Progress entries recorded under ``name`` by a resumable run.
+
+        Returns None when the sink stores no progress; the journal returns
+        the entries it holds, which are durable exactly when the events
+        recorded in the same atomic() group are.
+        """
+        return None
+
+    def record_progress(self, name, entries):
+        """Store progress entries (JSON lists) alongside the current events"""
+
+    def clear_progress(self, name):
+        """Forget the progress entries of a finished run"""
+
+    def close(self):
+        """Flush and release resources"""
+        self.flush()
+
+
+class NullSink(EventSink):
+    """Discards every event; the default for batch work"""
+
+    enabled = False
+
+    def emit(self, event):
+        pass
+
+
+class ConsoleSink(EventSink):
+    """Writes human-readable messages, buffering up to ``buffer_size`` lines"""
+
+    def __init__(self, stream=None, buffer_size=1):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._lines = []
+
+    def emit(self, event):
+        self._lines.append(format_event(event))
+        if len(self._lines) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if not self._lines:
+            return
+        stream = self.stream or sys.stdout
+        stream.write("\n".join(self._lines) + "\n")
+        stream.flush()
+        self._lines.clear()
+
+
+class JsonlFileSink(EventSink):
+    """Appends events to a JSON Lines file, writing in batches of ``batch_size``"""
+
+    def __init__(self, path, batch_size=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self._lines = []
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def emit(self, event):
+        self._lines.append(json.dumps(event, default=json_default))
+        if len(self._lines) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._lines:
+            return
+        self._file.write("\n".join(self._lines) + "\n")
+        self._file.flush()
+        self._lines.clear()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class MemorySink(EventSink):
+    """Collects events in a list, mainly for tests"""
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+    def clear(self):
+        self.events.clear()
+
+
+class TeeSink(EventSink):
+    """Forwards every event to several sinks, e.g. a journal and the console"""
+
+    def __init__(self, *sinks):
+        self.sinks = [sink for sink in sinks if sink.enabled]
+        self.enabled = bool(self.sinks)
+
+    def emit(self, event):
+        for sink in self.sinks:
+            sink.emit(event)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def atomic(self):
+        stack = ExitStack()
+        for sink in self.sinks:
+            stack.enter_context(sink.atomic())
+        return stack
+
+    def progress(self, name):
+        for sink in self.sinks:
+            entries = sink.progress(name)
+            if entries is not None:
+                return entries
+        return None
+
+    def record_progress(self, name, entries):
+        for sink in self.sinks:
+            sink.record_progress(name, entries)
+
+    def clear_progress(self, name):
+        for sink in self.sinks:
+            sink.clear_progress(name)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
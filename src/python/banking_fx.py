@@ -0,0 +1,163 @@
+"""
+Python Programming Concepts - Foreign Exchange
+Banking Application: Cached FX rates and vectorized multi-currency reporting
+"""
+
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from .banking_ledger import to_cents
+from .banking_money import DEFAULT_CURRENCY, Money
+
+DEFAULT_TTL = 300
+
+
+class FxRates:
+    """One immutable set of exchange rates.
+
+    ``rates`` maps each currency code to the units of that currency one unit
+    of ``base`` buys (``{"EUR": 0.92}`` with base USD), the usual layout of
+    published rate feeds. The base currency itself always has rate 1.
+    """
+
+    __slots__ = ('base', 'codes', 'rates', '_index')
+
+    def __init__(self, base, rates):
+        rates = {**rates, base: 1.0}
+        for code, rate in rates.items():
+            if not rate > 0:
+                raise ValueError(f"FX rate for {code} must be positive: {rate!r}")
+        self.base = base
+        self.codes = tuple(rates)
+        self.rates = np.array([float(rates[code]) for code in self.codes], dtype=np.float64)
+        self._index = {code: i for i, code in enumerate(self.codes)}
+
+    def rate(self, source, target):
+        """Units of ``target`` per unit of ``source``"""
+        return self.rates[self._position(target)] / self.rates[self._position(source)]
+
+    def _position(self, code):
+        try:
+            return self._index[code]
+        except KeyError:
+            raise KeyError(f"No FX rate for {code}") from None
+
+    def convert(self, amount, source, target):
+        """Convert an amount to Money in ``target``, rounded half to even to the cent"""
+        cents = Money.of(amount).cents
+        if source == target:
+            return Money(cents)
+        return Money(int(np.rint(cents * self.rate(source, target))))
+
+    def convert_cents(self, cents, currencies, target):
+        """Vectorized convert(): int64 cents in ``target`` for parallel cents/currency arrays.
+
+        ``currencies`` holds str or bytes codes; empty codes mean
+        DEFAULT_CURRENCY, as in snapshots written before accounts had one.
+        Each amount is rounded to the cent on its own, so results match
+        converting the accounts one at a time.
+        """
+        cents = np.asarray(cents, dtype=np.int64)
+        codes, inverse = np.unique(np.asarray(currencies), return_inverse=True)
+        factors = np.empty(len(codes), dtype=np.float64)
+        for i, code in enumerate(codes.tolist()):
+            if isinstance(code, bytes):
+                code = code.decode('ascii')
+            factors[i] = self.rate(code or DEFAULT_CURRENCY, target)
+        return np.rint(cents * factors[inverse.reshape(-1)]).astype(np.int64)
+
+
+def load_rates(path):
+    """Read an FX rate file: ``{"base": "USD", "rates": {"EUR": 0.92, ...}}``"""
+    with open(path) as file:
+        data = json.load(file)
+    return FxRates(data.get('base', DEFAULT_CURRENCY), data['rates'])
+
+
+class FxTable:
+    """FX rates loaded from a local file and cached for ``ttl`` seconds.
+
+    Lookups use the cached FxRates; once the TTL has passed the file is
+    checked again and parsed only if its modification time changed. A
+    reload that fails keeps serving the previous rates and raises only if
+    none were ever loaded.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.path = path
+        self.ttl = ttl
+        self.clock = clock
+        self._rates = None
+        self._mtime = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def rates(self):
+        """The current FxRates, reloading the file at most once per TTL"""
+        rates = self._rates
+        if rates is not None and self.clock() < self._expires:
+            return rates
+        with self._lock:
+            now = self.clock()
+            if self._rates is not None and now < self._expires:
+                return self._rates
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+                if self._rates is None or mtime != self._mtime:
+                    self._rates = load_rates(self.path)
+                    self._mtime = mtime
+            except (OSError, ValueError, KeyError):
+                if self._rates is None:
+                    raise
+            self._expires = now + self.ttl
+            return self._rates
+
+    def invalidate(self):
+        """Force the next lookup to check the file"""
+        self._expires = 0.0
+
+    def rate(self, source, target):
+        return self.rates().rate(source, target)
+
+    def convert(self, amount, source, target):
+        return self.rates().convert(amount, source, target)
+
+    def convert_account(self, account, target=DEFAULT_CURRENCY):
+        """An account's balance in ``target``"""
+        return self.rates().convert(account.balance, account.currency, target)
+
+    def convert_cents(self, cents, currencies, target):
+        return self.rates().convert_cents(cents, currencies, target)
+
+
+def book_columns(accounts):
+    """Balance cents and currency codes of many accounts as parallel arrays"""
+    accounts = list(accounts)
+    cents = np.fromiter((to_cents(account.balance) for account in accounts), dtype=np.int64, count=len(accounts))
+    currencies = np.array([account.currency for account in accounts], dtype=str)
+    return cents, currencies
+
+
+def total_balance(accounts, fx, target=DEFAULT_CURRENCY):
+    """Sum of all balances converted to ``target``, in one vectorized pass"""
+    cents, currencies = book_columns(accounts)
+    return Money(int(fx.convert_cents(cents, currencies, target).sum()))
+
+
+def balances_by_currency(accounts):
+    """Total balance per currency code, unconverted"""
+    cents, currencies = book_columns(accounts)
+    codes, inverse = np.unique(currencies, return_inverse=True)
+    totals = np.zeros(len(codes), dtype=np.int64)
+    np.add.at(totals, inverse.reshape(-1), cents)
+    return {code: Money(int(total)) for code, total in zip(codes.tolist(), totals.tolist())}
+
+
+def snapshot_total_balance(reader, fx, target=DEFAULT_CURRENCY):
+    """Converted total straight from a SnapshotReader's mapped columns"""
+    records = reader.records
+    return Money(int(fx.convert_cents(records['balance'], records['currency'], target).sum()))
@@ -0,0 +1,65 @@
+"""
+Python Programming Concepts - Idempotency Keys
+Banking Application: Remembering operation results so client retries apply once
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_TTL = 24 * 60 * 60
+
+
+class IdempotencyIndex:
+    """Bounded map from idempotency key to the recorded result of an operation.
+
+    Entries are kept in insertion order, which is also expiry order, so
+    dropping expired entries and evicting the oldest one when the index is
+    full are both O(1) per entry removed. A key is remembered for ``ttl``
+    seconds unless ``max_entries`` newer keys push it out first.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        if max_entries <= 0 or ttl <= 0:
+            raise ValueError("max_entries and ttl must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, now=None):
+        """The value recorded for ``key``, or None if unknown or expired"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(key)
+            return None if entry is None else entry[1]
+
+    def put(self, key, value, now=None):
+        """Record ``value`` for ``key``, evicting the oldest entries if full"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._expire(now)
+            self._entries.pop(key, None)
+            self._entries[key] = (now + self.ttl, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _expire(self, now):
+        entries = self._entries
+        while entries:
+            expires, _value = next(iter(entries.values()))
+            if expires > now:
+                break
+            entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
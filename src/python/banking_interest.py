@@ -0,0 +1,127 @@
+"""
+Python Programming Concepts - Bulk Interest Accrual
+Banking Application: Vectorized interest for whole SavingsAccount portfolios
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from .python_oop_banking import interest_columns, post_interest_batch
+
+DAILY = "daily"
+MONTHLY = "monthly"
+DAYS_PER_YEAR = 365
+MONTHS_PER_YEAR = 12
+
+_ONE_DAY = np.timedelta64(1, 'D')
+_ONE_MICROSECOND = np.timedelta64(1, 'us')
+
+
+def daily_interest(balances_cents, rates, days):
+    """Simple interest accrued day by day, in whole cents"""
+    principal = np.maximum(balances_cents, 0)
+    return np.rint(principal * rates * days / DAYS_PER_YEAR).astype(np.int64)
+
+
+def monthly_compound_interest(balances_cents, rates, months):
+    """Interest compounded once per elapsed month, in whole cents"""
+    principal = np.maximum(balances_cents, 0)
+    growth = np.power(1.0 + rates / MONTHS_PER_YEAR, months) - 1.0
+    return np.rint(principal * growth).astype(np.int64)
+
+
+def elapsed_days(last_dates, as_of):
+    """Whole days between each last interest date and ``as_of`` plus the advanced dates"""
+    days = np.maximum((as_of - last_dates) // _ONE_DAY, 0)
+    return days, last_dates + days * _ONE_DAY
+
+
+def _anchored_dates(months, days, times_of_day):
+    """Due date in each month: ``days`` clamped to the month's length, plus the time of day"""
+    first = months.astype('datetime64[D]')
+    last = (months + 1).astype('datetime64[D]') - _ONE_DAY
+    due = np.minimum(first + (days - 1) * _ONE_DAY, last)
+    return due.astype('datetime64[us]') + times_of_day
+
+
+def elapsed_months(last_dates, as_of, interest_days=None):
+    """Whole calendar months between each last interest date and ``as_of``.
+
+    Months fall due on each account's interest day (by default the day of
+    its last interest date), clamped to the end of shorter months. Also
+    returns each date moved forward by the months elapsed; the interest day
+    stays the anchor, so Jan 31 moves to Feb 29 and then to Mar 31.
+    """
+    last_dates = last_dates.astype('datetime64[us]')
+    last_days = last_dates.astype('datetime64[D]')
+    times_of_day = last_dates - last_days.astype('datetime64[us]')
+    last_months = last_dates.astype('datetime64[M]')
+    if interest_days is None:
+        interest_days = (last_days - last_months.astype('datetime64[D]')).astype(np.int64) + 1
+    interest_days = np.asarray(interest_days, dtype=np.int64)
+
+    as_of_month = np.asarray(as_of).astype('datetime64[M]')
+    months = (as_of_month - last_months).astype(np.int64)
+    months -= _anchored_dates(as_of_month, interest_days, times_of_day) > as_of
+    months = np.maximum(months, 0)
+
+    advanced = np.where(months > 0, _anchored_dates(last_months + months, interest_days, times_of_day), last_dates)
+    return months, advanced
+
+
+def _wall_times(epochs):
+    """Local wall-clock datetime64 for epoch seconds, converting each distinct value once"""
+    unique, inverse = np.unique(epochs, return_inverse=True)
+    walls = np.array([datetime.fromtimestamp(epoch) for epoch in unique.tolist()], dtype='datetime64[us]')
+    return walls[inverse.reshape(-1)]
+
+
+def _epochs(wall_times):
+    """Inverse of _wall_times()"""
+    unique, inverse = np.unique(wall_times, return_inverse=True)
+    epochs = np.array([moment.timestamp() for moment in unique.tolist()], dtype=np.float64)
+    return epochs[inverse.reshape(-1)]
+
+
+def accrue_interest(accounts, as_of=None, mode=MONTHLY):
+    """Accrue interest for many savings accounts in one vectorized pass.
+
+    Interest is keyed off each account's ``last_interest_date``: ``DAILY``
+    accrues simple interest for every whole day elapsed, ``MONTHLY``
+    compounds once per whole calendar month elapsed, due on the account's
+    interest day. An "Interest" ledger entry and event are posted for every
+    account that earned at least one cent and ``last_interest_date`` is
+    advanced by the periods consumed, so partial periods carry over to the
+    next run.
+
+    Account fields are read into arrays in one pass and dates are converted
+    once per distinct value. Postings take each account's lock and add to
+    the current balance, so concurrent operations are not overwritten.
+
+    Returns an array of the interest posted to each account.
+    """
+    accounts = list(accounts)
+    if as_of is None:
+        as_of = datetime.now()
+    if not accounts:
+        return np.zeros(0)
+
+    balances, rates, last_epochs, interest_days = (np.frombuffer(column, dtype=column.typecode)
+                                                   for column in interest_columns(accounts))
+    last_dates = _wall_times(last_epochs)
+    as_of64 = np.datetime64(as_of, 'us')
+
+    if mode == DAILY:
+        periods, advanced = elapsed_days(last_dates, as_of64)
+        interest = daily_interest(balances, rates, periods)
+    elif mode == MONTHLY:
+        periods, advanced = elapsed_months(last_dates, as_of64, interest_days)
+        interest = monthly_compound_interest(balances, rates, periods)
+    else:
+        raise ValueError(f"Unknown accrual mode: {mode}")
+
+    due = np.flatnonzero(periods > 0)
+    post_interest_batch([accounts[i] for i in due.tolist()], interest[due].tolist(),
+                        _epochs(advanced[due]).tolist(), as_of.timestamp())
+    return interest / 100
@@ -0,0 +1,441 @@
+"""
+Python Programming Concepts - Sharded Batch Jobs
+Banking Application: Resumable month-end maintenance (fees, interest, dormancy)
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import json
+import os
+import zlib
+
+import numpy as np
+
+from .banking_interest import elapsed_months, monthly_compound_interest
+from .banking_ledger import to_cents, to_epoch
+from .banking_money import Money
+from .banking_snapshot import ACCOUNT_TYPE_CODES
+from .python_oop_banking import (BankAccount, CheckingAccount, SavingsAccount, charge_fee_batch,
+                                 post_interest_batch)
+
+# Same rules as the polymorphism example in demonstrate_oop_concepts()
+MONTHLY_FEES = {"Basic": 5.0, "Savings": 0.0, "Checking": 10.0}
+DORMANT_AFTER_DAYS = 365
+# Postings applied between two progress entries of a checkpointed shard
+PROGRESS_CHUNK = 256
+
+# What a worker needs to know about each account in its shard
+SHARD_DTYPE = np.dtype([
+    ('type', 'u1'),
+    ('balance', 'i8'),
+    ('floor', 'i8'),
+    ('interest_rate', 'f8'),
+    ('last_interest', 'M8[us]'),
+    ('interest_day', 'u1'),
+    ('last_activity', 'f8'),
+])
+
+
+class MaintenanceJob:
+    """One maintenance rule applied to every account.
+
+    ``evaluate()`` runs over a shard's columns (in-process or in a worker) and picks
+    the rows to act on; ``post_batch()`` then applies the selected rows to the
+    live accounts in the parent. The default posts each row through ``post()``
+    and the account's own methods; the built-in jobs override it with the
+    bulk helpers of python_oop_banking, which keep the account's checks and
+    events but skip the per-call overhead. Jobs run in order and ``evaluate()``
+    updates the balance column with its expected effect, so later jobs see
+    balances after earlier ones.
+    """
+
+    name = "job"
+    flag_accounts = False
+
+    def evaluate(self, columns, as_of):
+        """Return (positions, amounts in cents, effective dates) for the shard"""
+        raise NotImplementedError
+
+    def post(self, account, cents, effective):
+        """Apply one selected row; returns False if the account declined it"""
+        raise NotImplementedError
+
+    def post_batch(self, accounts, cents, effective):
+        """Apply many selected rows, yielding post()'s result for each.
+
+        Results should be produced as rows are applied, so the caller can
+        record the postings that happened before a failure.
+        """
+        for account, amount, moment in zip(accounts, cents, effective):
+            yield self.post(account, amount, moment)
+
+
+class MonthlyFeeJob(MaintenanceJob):
+    """Charge each account type's monthly fee"""
+
+    name = "monthly_fee"
+
+    def __init__(self, fees=None):
+        fees = MONTHLY_FEES if fees is None else fees
+        self.fee_by_type = np.zeros(max(ACCOUNT_TYPE_CODES.values()) + 1, dtype=np.int64)
+        for account_type, fee in fees.items():
+            self.fee_by_type[ACCOUNT_TYPE_CODES[account_type]] = to_cents(fee)
+
+    def evaluate(self, columns, as_of):
+        fees = self.fee_by_type[columns['type']]
+        positions = np.flatnonzero(fees > 0)
+        charged = (fees > 0) & (columns['balance'] - fees >= columns['floor'])
+        columns['balance'] -= np.where(charged, fees, 0)
+        return positions, fees[positions], np.full(len(positions), as_of)
+
+    def post(self, account, cents, effective):
+        return account.withdraw(Money(cents))
+
+    def post_batch(self, accounts, cents, effective):
+        return charge_fee_batch(accounts, cents)
+
+
+class InterestJob(MaintenanceJob):
+    """Compound savings interest once per whole month since the last posting"""
+
+    name = "interest"
+
+    def evaluate(self, columns, as_of):
+        savings = columns['type'] == ACCOUNT_TYPE_CODES["Savings"]
+        months, advanced = elapsed_months(columns['last_interest'], as_of, columns['interest_day'])
+        interest = monthly_compound_interest(columns['balance'], columns['interest_rate'], months)
+        positions = np.flatnonzero(savings & (months > 0))
+        columns['balance'][positions] += interest[positions]
+        return positions, interest[positions], advanced[positions]
+
+    def post(self, account, cents, effective):
+        if cents > 0:
+            account.post_interest(Money(cents), effective)
+        else:
+            account.advance_interest_date(effective)
+        return True
+
+    def post_batch(self, accounts, cents, effective):
+        # Not lazy, but safe to repeat: a posted row's interest date has
+        # moved, so a rerun no longer selects it
+        post_interest_batch(accounts, cents, [to_epoch(moment) for moment in effective])
+        return [True] * len(accounts)
+
+
+class DormancyJob(MaintenanceJob):
+    """Flag accounts without activity for ``days`` and charge an optional fee"""
+
+    name = "dormancy"
+    flag_accounts = True
+
+    def __init__(self, days=DORMANT_AFTER_DAYS, fee=0.0):
+        self.days = days
+        self.fee_cents = to_cents(fee)
+
+    def evaluate(self, columns, as_of):
+        cutoff = as_of.astype('datetime64[s]').astype(np.int64) - self.days * 86400
+        positions = np.flatnonzero(columns['last_activity'] < cutoff)
+        fees = np.full(len(positions), self.fee_cents, dtype=np.int64)
+        if self.fee_cents:
+            charged = columns['balance'][positions] - fees >= columns['floor'][positions]
+            columns['balance'][positions[charged]] -= self.fee_cents
+        return positions, fees, np.full(len(positions), as_of)
+
+    def post(self, account, cents, effective):
+        return account.withdraw(Money(cents)) if cents else True
+
+    def post_batch(self, accounts, cents, effective):
+        return charge_fee_batch(accounts, cents) if self.fee_cents else [True] * len(accounts)
+
+
+def shard_of(account_number, shards):
+    """Stable shard index for an account number"""
+    return zlib.crc32(account_number.encode('utf-8')) % shards
+
+
+def shard_columns(accounts):
+    """Extract the SHARD_DTYPE columns for a list of accounts"""
+    columns = np.zeros(len(accounts), dtype=SHARD_DTYPE)
+    columns['type'] = [ACCOUNT_TYPE_CODES[a.account_type] for a in accounts]
+    columns['balance'] = [a._balance_cents for a in accounts]
+    columns['floor'] = [a.get_withdrawal_floor().cents for a in accounts]
+    columns['last_activity'] = [a.last_activity() for a in accounts]
+    for i, account in enumerate(accounts):
+        if isinstance(account, SavingsAccount):
+            columns['interest_rate'][i] = account.interest_rate
+            columns['last_interest'][i] = account.last_interest_date
+            columns['interest_day'][i] = account.interest_day
+    return columns
+
+
+def evaluate_shard(shard, jobs, columns, as_of):
+    """Worker entry point: run every job's rules over one shard"""
+    return shard, [job.evaluate(columns, as_of) for job in jobs]
+
+
+def run_maintenance(accounts, jobs, as_of=None, shards=8, workers=0,
+                    checkpoint_dir=None, run_id=None):
+    """Run maintenance jobs over many accounts, one shard at a time.
+
+    Accounts are split into ``shards`` by a stable hash of the account
+    number. Each shard's columns are extracted and its rules evaluated in
+    one vectorized pass, then its postings are applied in bulk through each
+    job's ``post_batch()`` (see the ``maintenance`` benchmark in
+    benchmarks/suite.py). Extraction and posting need the live accounts, so
+    they always run in this process and, holding the GIL, on one core;
+    ``workers`` only moves rule evaluation into a process pool, which pays
+    off for costly rules, not for the built-in ones.
+
+    With a ``checkpoint_dir``, postings are applied in chunks and each chunk
+    is recorded in the shard's progress only together with (journal) or
+    after (any other sink) the sink commit that covers it; a finished shard
+    writes its results to ``<checkpoint_dir>/<run_id>/`` after the sink has
+    been flushed. A rerun with the same ``run_id`` skips finished shards and,
+    within an interrupted shard, every (job, account) already in the
+    progress, so a month-end close resumes without charging anyone twice.
+
+    Returns the merged report for all shards.
+    """
+    accounts = list(accounts)
+    as_of = datetime.now() if as_of is None else as_of
+    as_of64 = np.datetime64(as_of, 'us')
+    if run_id is None:
+        run_id = f"{as_of:%Y%m%d}-" + "-".join(job.name for job in jobs)
+
+    members = [[] for _ in range(shards)]
+    for account in accounts:
+        members[shard_of(account.account_number, shards)].append(account)
+
+    run_dir = None if checkpoint_dir is None else os.path.join(checkpoint_dir, run_id)
+    finished = _load_checkpoints(run_dir, shards)
+    report = {
+        'run_id': run_id,
+        'as_of': as_of.strftime("%Y-%m-%d %H:%M:%S"),
+        'accounts': len(accounts),
+        'shards': shards,
+        'resumed_shards': len(finished),
+        'jobs': {job.name: _empty_result() for job in jobs},
+    }
+    for shard, results in finished.items():
+        _merge(report, results)
+        # Progress left behind by a crash between checkpoint and cleanup
+        _ShardProgress(BankAccount.event_sink, run_dir, run_id, shard).finish()
+
+    todo = [shard for shard in range(shards) if shard not in finished and members[shard]]
+    if workers == 0:
+        for shard in todo:
+            _, selections = evaluate_shard(shard, jobs, shard_columns(members[shard]), as_of64)
+            _finish_shard(report, run_dir, run_id, shards, shard, jobs, members[shard], selections)
+    elif todo:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(evaluate_shard, shard, jobs, shard_columns(members[shard]), as_of64)
+                       for shard in todo]
+            for future in as_completed(futures):
+                shard, selections = future.result()
+                _finish_shard(report, run_dir, run_id, shards, shard, jobs, members[shard], selections)
+
+    for result in report['jobs'].values():
+        result['total'] = Money(result['total'])
+    return report
+
+
+def _empty_result():
+    return {'processed': 0, 'selected': 0, 'posted': 0, 'declined': 0, 'total': 0,
+            'flagged': [], 'declined_accounts': []}
+
+
+def _tally(result, job, account_number, posted, cents):
+    result['selected'] += 1
+    if job.flag_accounts:
+        result['flagged'].append(account_number)
+    if posted:
+        result['posted'] += 1
+        result['total'] += cents
+    else:
+        result['declined'] += 1
+        result['declined_accounts'].append(account_number)
+
+
+def _finish_shard(report, run_dir, run_id, shards, shard, jobs, accounts, selections):
+    """Post a shard's selections, checkpoint it and merge it into the report"""
+    sink = BankAccount.event_sink
+    progress = None if run_dir is None else _ShardProgress(sink, run_dir, run_id, shard)
+    done = {} if progress is None else progress.load()
+    results = {}
+    for job, (positions, amounts, effective) in zip(jobs, selections):
+        result = results[job.name] = _empty_result()
+        result['processed'] = len(accounts)
+        recorded = done.get(job.name, {})
+        pending, pending_cents, pending_effective = [], [], []
+        for position, cents, when in zip(positions.tolist(), amounts.tolist(), effective.tolist()):
+            account = accounts[position]
+            entry = recorded.pop(account.account_number, None)
+            if entry is None:
+                pending.append(account)
+                pending_cents.append(cents)
+                pending_effective.append(when)
+            else:
+                # Applied by an interrupted attempt: report it, do not post again
+                posted, cents = entry
+                _tally(result, job, account.account_number, posted, cents)
+        for account_number, (posted, cents) in recorded.items():
+            _tally(result, job, account_number, posted, cents)
+
+        for start in range(0, len(pending), PROGRESS_CHUNK):
+            chunk = slice(start, start + PROGRESS_CHUNK)
+            entries = []
+            with sink.atomic():
+                try:
+                    posted_flags = job.post_batch(pending[chunk], pending_cents[chunk], pending_effective[chunk])
+                    for account, cents, posted in zip(pending[chunk], pending_cents[chunk], posted_flags):
+                        entries.append([job.name, account.account_number, posted, cents])
+                finally:
+                    # Also record what was applied before a posting failed
+                    if progress is not None and entries:
+                        progress.record(entries)
+            for _, account_number, posted, cents in entries:
+                _tally(result, job, account_number, posted, cents)
+
+    # Make the postings durable before recording the shard as done
+    sink.flush()
+    if progress is not None:
+        _write_checkpoint(run_dir, shards, shard, results)
+        progress.finish()
+    _merge(report, results)
+
+
+class _ShardProgress:
+    """The postings of one shard that an attempt has applied.
+
+    An entry is only written once the sink has committed the posting it
+    describes. The journal stores the entries in the same atomic() group as
+    the postings, so both survive a crash or neither does; with any other
+    sink they go to ``shard-NNNN.progress`` after the sink has been flushed.
+    """
+
+    def __init__(self, sink, run_dir, run_id, shard):
+        self.sink = sink
+        self.run_dir = run_dir
+        self.name = f"{run_id}/{shard:04d}"
+        self.path = _progress_path(run_dir, shard)
+        self.in_sink = sink.progress(self.name) is not None
+
+    def load(self):
+        """{job: {account: (posted, cents)}} applied by an interrupted attempt"""
+        entries = self.sink.progress(self.name) if self.in_sink else _read_progress(self.path)
+        done = {}
+        for job, account_number, posted, cents in entries:
+            done.setdefault(job, {})[account_number] = (posted, cents)
+        return done
+
+    def record(self, entries):
+        if self.in_sink:
+            self.sink.record_progress(self.name, entries)
+            return
+        self.sink.flush()
+        os.makedirs(self.run_dir, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write("".join(json.dumps(entry) + "\n" for entry in entries))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def finish(self):
+        if self.in_sink:
+            self.sink.clear_progress(self.name)
+            return
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _merge(report, results):
+    for name, result in results.items():
+        merged = report['jobs'].get(name)
+        if merged is None:
+            continue
+        for key, value in result.items():
+            merged[key] += value
+
+
+def _checkpoint_path(run_dir, shard):
+    return os.path.join(run_dir, f"shard-{shard:04d}.json")
+
+
+def _progress_path(run_dir, shard):
+    return os.path.join(run_dir, f"shard-{shard:04d}.progress")
+
+
+def _read_progress(path):
+    entries = []
+    try:
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break  # torn last line
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def _write_checkpoint(run_dir, shards, shard, results):
+    os.makedirs(run_dir, exist_ok=True)
+    path = _checkpoint_path(run_dir, shard)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump({'shard': shard, 'shards': shards, 'jobs': results}, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def _load_checkpoints(run_dir, shards):
+    """Results of shards already finished by an earlier attempt of this run"""
+    finished = {}
+    if run_dir is None or not os.path.isdir(run_dir):
+        return finished
+    for shard in range(shards):
+        path = _checkpoint_path(run_dir, shard)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding='utf-8') as file:
+            checkpoint = json.load(file)
+        if checkpoint['shards'] != shards:
+            raise ValueError(f"Checkpoint {path} was written for {checkpoint['shards']} shards, not {shards}")
+        finished[shard] = checkpoint['jobs']
+    return finished
+
+
+JOBS = {
+    MonthlyFeeJob.name: MonthlyFeeJob,
+    InterestJob.name: InterestJob,
+    DormancyJob.name: DormancyJob,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run month-end maintenance jobs over generated accounts")
+    parser.add_argument("--accounts", type=int, default=100000, help="generated checking accounts")
+    parser.add_argument("--jobs", default="monthly_fee,interest,dormancy", help="comma-separated: " + ", ".join(JOBS))
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=0, help="processes evaluating rules; 0 runs in-process")
+    parser.add_argument("--checkpoint-dir", default=None)
+    parser.add_argument("--run-id", default=None)
+    args = parser.parse_args()
+
+    jobs = [JOBS[name]() for name in args.jobs.split(",")]
+    accounts = [CheckingAccount(f"AC{i:06d}", f"Customer {i}", 1000.0, 500.0) for i in range(args.accounts)]
+    report = run_maintenance(accounts, jobs, shards=args.shards, workers=args.workers,
+                             checkpoint_dir=args.checkpoint_dir, run_id=args.run_id)
+    print(f"🗓️  Run {report['run_id']}: {report['accounts']} accounts in {report['shards']} shards "
+          f"({report['resumed_shards']} resumed)")
+    for name, result in report['jobs'].items():
+        print(f"  {name}: {result['posted']} posted, {result['declined']} declined, "
+              f"{len(result['flagged'])} flagged, total ${result['total']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Python Programming Concepts - Write-Ahead Journal
+Banking Application: Durable account state with group commit and snapshots
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import os
+import threading
+import time
+
+from .banking_account_book import AccountBook
+from .banking_events import EventSink
+from .banking_money import DEFAULT_CURRENCY, json_default
+from .python_oop_banking import BankAccount, SavingsAccount, CheckingAccount
+
+SNAPSHOT_FILE = "snapshot.json"
+SEGMENT_PREFIX = "journal-"
+SEGMENT_SUFFIX = ".log"
+
+ACCOUNT_CLASSES = {
+    "Basic": BankAccount,
+    "Savings": SavingsAccount,
+    "Checking": CheckingAccount,
+}
+
+# Ledger entry written when a journaled event is replayed
+REPLAY_TYPES = {
+    "deposit": ("Deposit", 1),
+    "withdraw": ("Withdrawal", -1),
+    "interest": ("Interest", 1),
+}
+
+
+def account_to_state(account):
+    """Capture the persistent fields of an account as a JSON-friendly dict"""
+    state = {
+        'account_type': account.account_type,
+        'account_number': account.account_number,
+        'account_holder': account.account_holder,
+        'balance': account.balance,
+        'currency': account.currency,
+    }
+    if isinstance(account, SavingsAccount):
+        state['interest_rate'] = account.interest_rate
+        state['minimum_balance'] = account.minimum_balance
+        state['last_interest_date'] = account.last_interest_date.timestamp()
+        state['interest_day'] = account.interest_day
+    if isinstance(account, CheckingAccount):
+        state['overdraft_limit'] = account.overdraft_limit
+    return state
+
+
+def account_from_state(state):
+    """Rebuild an account from account_to_state() output.
+
+    Only the balance is restored; the transaction history starts empty.
+    """
+    account_class = ACCOUNT_CLASSES[state['account_type']]
+    if account_class is SavingsAccount:
+        account = SavingsAccount(state['account_number'], state['account_holder'],
+                                 interest_rate=state['interest_rate'],
+                                 minimum_balance=state['minimum_balance'])
+        account.last_interest_date = datetime.fromtimestamp(state['last_interest_date'])
+        account.interest_day = state.get('interest_day') or account.interest_day
+    elif account_class is CheckingAccount:
+        account = CheckingAccount(state['account_number'], state['account_holder'],
+                                  overdraft_limit=state['overdraft_limit'])
+    else:
+        account = BankAccount(state['account_number'], state['account_holder'])
+    account.balance = state['balance']
+    account.currency = state.get('currency', DEFAULT_CURRENCY)
+    return account
+
+
+class AccountJournal(EventSink):
+    """Event sink that journals accepted account operations to disk.
+
+    Records are buffered and group-committed: the journal is written and
+    fsync'ed once ``fsync_batch_size`` records are pending or
+    ``fsync_interval`` seconds have passed since the last commit, so a crash
+    loses at most one uncommitted group. A background flusher thread enforces the interval
+    even when no further records arrive. Every ``snapshot_every`` records
+    the flusher also writes the registered accounts to a snapshot and
+    deletes the journal segments it covers, which keeps recovery time
+    bounded without stalling the thread that appended the record.
+
+    Events emitted inside ``atomic()`` (as ``transfer()`` does for its debit
+    and credit) are journaled as a single record, so recovery never keeps
+    one half without the other.
+
+    The bulk balance paths (``apply_batch()`` and ``ShardedEngine.sync()``)
+    emit no events and so are not journaled; call ``snapshot()`` once they
+    return to make their results durable.
+
+    Resumable runs (see banking_jobs) keep their progress entries here too,
+    recorded in the same atomic() group as the postings they describe.
+
+    Use ``AccountJournal.recover(directory)`` to open a journal; it restores
+    the accounts from the latest snapshot plus the journal tail.
+    """
+
+    def __init__(self, directory, fsync_batch_size=100, fsync_interval=0.05, snapshot_every=10000):
+        self.directory = directory
+        self.fsync_batch_size = fsync_batch_size
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.accounts = AccountBook()
+        self._seq = 0
+        self._since_snapshot = 0
+        self._pending = []
+        self._group = None
+        self._progress = {}
+        self._last_commit = time.monotonic()
+        self._file = None
+        # Account operations on several threads share one journal
+        self._lock = threading.RLock()
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_due = False
+        self._closed = False
+        self._wake = threading.Event()
+        os.makedirs(directory, exist_ok=True)
+        self._flusher = threading.Thread(target=self._run_flusher, name="journal-flusher", daemon=True)
+        self._flusher.start()
+
+    @classmethod
+    def recover(cls, directory, **options):
+        """Open a journal directory, restoring accounts from snapshot and journal tail"""
+        journal = cls(directory, **options)
+        snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, 'r', encoding='utf-8') as file:
+                snapshot = json.load(file)
+            journal._seq = snapshot['seq']
+            journal._progress = snapshot.get('progress', {})
+            for state in snapshot['accounts']:
+                journal.accounts.add(account_from_state(state))
+
+        for path in journal._segments():
+            for record in _read_records(path):
+                if record['seq'] <= journal._seq:
+                    continue
+                journal._replay(record)
+                journal._seq = record['seq']
+                journal._since_snapshot += 1
+
+        journal._open_segment()
+        return journal
+
+    def register(self, account):
+        """Start tracking an account and journal its opening state"""
+        # One critical section, so a snapshot sees both or neither
+        with self._lock:
+            self.accounts.add(account)
+            self._append({'op': 'open', 'state': account_to_state(account)})
+        return account
+
+    def close_account(self, account_number):
+        """Stop tracking an account and journal the closure"""
+        with self._lock:
+            account = self.accounts.close(account_number)
+            self._append({'op': 'close', 'account_number': account_number})
+        return account
+
+    def progress(self, name):
+        with self._lock:
+            return list(self._progress.get(name, ()))
+
+    def record_progress(self, name, entries):
+        with self._lock:
+            self._progress.setdefault(name, []).extend(entries)
+            self._append({'op': 'progress', 'name': name, 'entries': entries})
+
+    def clear_progress(self, name):
+        with self._lock:
+            if self._progress.pop(name, None) is not None:
+                self._append({'op': 'progress_done', 'name': name})
+
+    @contextmanager
+    def atomic(self):
+        """Journal every record appended inside the block as one record"""
+        with self._lock:
+            if self._group is not None:
+                yield
+                return
+            self._group = []
+            try:
+                yield
+            finally:
+                records, self._group = self._group, None
+                if len(records) == 1:
+                    self._append(records[0])
+                elif records:
+                    self._append({'op': 'group', 'records': records})
+
+    def emit(self, event):
+        if not event['accepted'] or event['account_number'] not in self.accounts:
+            return
+        self._append({
+            'op': event['event'],
+            'account_number': event['account_number'],
+            'amount': event['amount'],
+            'balance': event['balance'],
+            'timestamp': time.time(),
+        })
+
+    def commit(self):
+        """Write and fsync every pending record"""
+        with self._lock:
+            if self._pending:
+                if self._file is None:
+                    self._open_segment()
+                self._file.write("\n".join(self._pending) + "\n")
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._pending.clear()
+            self._last_commit = time.monotonic()
+
+    def snapshot(self):
+        """Persist all registered accounts and drop journal segments they cover.
+
+        Only capturing the account states and switching to a new segment
+        holds the journal lock; writing the snapshot and deleting old
+        segments happen while appends continue.
+        """
+        with self._snapshot_lock:
+            with self._lock:
+                self.commit()
+                self._snapshot_due = False
+                self._since_snapshot = 0
+                snapshot = {
+                    'seq': self._seq,
+                    'created': time.time(),
+                    'accounts': [account_to_state(account) for account in self.accounts],
+                    'progress': {name: list(entries) for name, entries in self._progress.items()},
+                }
+                old_segments = self._segments()
+                current = self._open_segment()
+            self._write_snapshot(snapshot)
+
+            # Compaction: everything before the current segment is now in the snapshot
+            for segment in old_segments:
+                if segment != current:
+                    os.remove(segment)
+
+    def _write_snapshot(self, snapshot):
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(snapshot, file, default=json_default)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+        self._sync_directory()
+
+    def flush(self):
+        self.commit()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        if self._flusher is not threading.current_thread():
+            self._flusher.join()
+        if self._snapshot_due:
+            self.snapshot()
+        with self._lock:
+            self.commit()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _run_flusher(self):
+        """Commit records older than fsync_interval and take due snapshots"""
+        while not self._closed:
+            timeout = self.fsync_interval or None
+            with self._lock:
+                if self._pending and self.fsync_interval:
+                    wait = self._last_commit + self.fsync_interval - time.monotonic()
+                    if wait <= 0:
+                        self.commit()
+                    else:
+                        timeout = wait
+            if self._snapshot_due and not self._closed:
+                self.snapshot()
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def _append(self, record):
+        with self._lock:
+            if self._group is not None:
+                self._group.append(record)
+                return
+            self._seq += 1
+            record['seq'] = self._seq
+            self._pending.append(json.dumps(record, default=json_default))
+            self._since_snapshot += 1
+            if (len(self._pending) >= self.fsync_batch_size
+                    or time.monotonic() - self._last_commit >= self.fsync_interval):
+                self.commit()
+            if (self.snapshot_every and self._since_snapshot >= self.snapshot_every
+                    and not self._snapshot_due):
+                self._snapshot_due = True
+                self._wake.set()
+
+    def _replay(self, record):
+        op = record['op']
+        if op == 'group':
+            for member in record['records']:
+                self._replay(member)
+        elif op == 'progress':
+            self._progress.setdefault(record['name'], []).extend(record['entries'])
+        elif op == 'progress_done':
+            self._progress.pop(record['name'], None)
+        elif op == 'open':
+            # Journals written before register() held the lock may follow a
+            # snapshot that already has the account
+            if record['state']['account_number'] not in self.accounts:
+                self.accounts.add(account_from_state(record['state']))
+        elif op == 'close':
+            if record['account_number'] in self.accounts:
+                self.accounts.close(record['account_number'])
+        else:
+            account = self.accounts.get(record['account_number'])
+            if account is None:
+                return
+            transaction_type, sign = REPLAY_TYPES[op]
+            account.balance = record['balance']
+            account.transactions.append(transaction_type, sign * record['amount'], account.balance,
+                                        record['timestamp'])
+            if op == 'interest':
+                account.advance_interest_date(record['timestamp'])
+
+    def _segments(self):
+        names = sorted(name for name in os.listdir(self.directory)
+                       if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX))
+        return [os.path.join(self.directory, name) for name in names]
+
+    def _open_segment(self):
+        if self._file is not None:
+            self._file.close()
+        path = os.path.join(self.directory, f"{SEGMENT_PREFIX}{self._seq + 1:012d}{SEGMENT_SUFFIX}")
+        self._file = open(path, 'a', encoding='utf-8')
+        return path
+
+    def _sync_directory(self):
+        if hasattr(os, 'O_DIRECTORY'):
+            fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+
+def _read_records(path):
+    """Yield journal records, truncating a torn final line left by a crash"""
+    with open(path, 'rb') as file:
+        data = file.read()
+    valid_length = 0
+    for line in data.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            break
+        valid_length += len(line)
+        yield record
+    if valid_length < len(data):
+        with open(path, 'r+b') as file:
+            file.truncate(valid_length)
@@ -0,0 +1,390 @@
+"""
+Python Programming Concepts - Compact Transaction Ledger
+Banking Application: Columnar storage for account transaction history
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+import threading
+import time
+
+from .banking_archive import DEFAULT_BLOCK_SIZE, LedgerArchive
+from .banking_money import Money
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def to_cents(amount):
+    """Convert a currency amount (Money or a plain number) to integer cents"""
+    if isinstance(amount, Money):
+        return amount.cents
+    return Money.of(amount).cents
+
+
+def to_epoch(moment):
+    """Convert a datetime or epoch number to epoch seconds"""
+    if isinstance(moment, datetime):
+        return moment.timestamp()
+    return moment
+
+
+class TransactionLedger:
+    """Append-only transaction history stored as typed columns.
+
+    Each transaction costs 26 bytes (epoch-second timestamp, amount and
+    balance in cents, interned type code). Dictionaries are only built when
+    entries are read back.
+
+    Timestamps never decrease, so time-range queries binary-search them.
+    Per-type prefix sums for sum_by_type() are built lazily on the first
+    query and extended incrementally afterwards.
+
+    History can be tiered: archive() seals the oldest entries into
+    zlib-compressed blocks (see banking_archive) and keeps only recent ones
+    as hot columns. Positions stay global, and reads decompress only the
+    blocks they touch. Setting ``hot_limit`` archives automatically once
+    that many recent entries plus a full block have accumulated.
+
+    A per-ledger lock covers appends, archiving and every read, so readers
+    on other threads (including HistoryCursor) never see the lazily built
+    type index or a half-finished archive() pass.
+    """
+
+    __slots__ = ('_timestamps', '_amounts', '_balances', '_type_codes',
+                 '_indexed', '_type_positions', '_type_prefix', '_archive', '_lock')
+
+    # Transaction type names are interned once and shared by every ledger
+    _type_names = []
+    _type_codes_by_name = {}
+
+    # Tiering policy shared by every ledger; None keeps all history hot
+    hot_limit = None
+    block_size = DEFAULT_BLOCK_SIZE
+
+    def __init__(self):
+        self._timestamps = array('q')
+        self._amounts = array('q')
+        self._balances = array('q')
+        self._type_codes = array('H')
+        self._indexed = 0
+        self._type_positions = None
+        self._type_prefix = None
+        self._archive = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def type_code(cls, transaction_type):
+        """Get the interned code for a transaction type name"""
+        code = cls._type_codes_by_name.get(transaction_type)
+        if code is None:
+            code = len(cls._type_names)
+            cls._type_names.append(transaction_type)
+            cls._type_codes_by_name[transaction_type] = code
+        return code
+
+    @classmethod
+    def type_names(cls):
+        """All interned type names, indexed by code"""
+        return list(cls._type_names)
+
+    def append(self, transaction_type, amount, balance_after, timestamp=None):
+        """Record a transaction; amounts are given in currency units"""
+        amount_cents = to_cents(amount)
+        balance_cents = to_cents(balance_after)
+        type_code = self.type_code(transaction_type)
+        with self._lock:
+            self._timestamps.append(self._next_timestamp(timestamp))
+            self._amounts.append(amount_cents)
+            self._balances.append(balance_cents)
+            self._type_codes.append(type_code)
+            if self.hot_limit is not None and len(self._timestamps) >= self.hot_limit + self.block_size:
+                self.archive(self.hot_limit)
+
+    def append_cents(self, type_code, amount_cents, balance_cents, timestamp=None):
+        """Record one transaction given as an interned type code and integer cents"""
+        with self._lock:
+            self._timestamps.append(self._next_timestamp(timestamp))
+            self._amounts.append(amount_cents)
+            self._balances.append(balance_cents)
+            self._type_codes.append(type_code)
+            if self.hot_limit is not None and len(self._timestamps) >= self.hot_limit + self.block_size:
+                self.archive(self.hot_limit)
+
+    def extend(self, type_codes, amounts_cents, balances_cents, timestamp=None):
+        """Record many transactions at once; amounts are given in integer cents"""
+        with self._lock:
+            timestamp = self._next_timestamp(timestamp)
+            self._timestamps.extend([timestamp] * len(amounts_cents))
+            self._amounts.extend(amounts_cents)
+            self._balances.extend(balances_cents)
+            self._type_codes.extend(type_codes)
+            if self.hot_limit is not None and len(self._timestamps) >= self.hot_limit + self.block_size:
+                self.archive(self.hot_limit)
+
+    def _next_timestamp(self, timestamp):
+        # Clamp to the previous entry so a clock step backwards keeps the order
+        timestamp = int(time.time() if timestamp is None else timestamp)
+        last = self._newest_timestamp()
+        if last is not None and timestamp < last:
+            return last
+        return timestamp
+
+    def archive(self, keep_recent=0, block_size=None):
+        """Seal the oldest hot entries into compressed blocks of ``block_size``.
+
+        At least ``keep_recent`` entries stay hot; only whole blocks are
+        sealed. Returns the number of entries archived.
+        """
+        block_size = block_size or self.block_size
+        with self._lock:
+            sealable = (len(self._timestamps) - keep_recent) // block_size * block_size
+            if sealable <= 0:
+                return 0
+            if self._archive is None:
+                self._archive = LedgerArchive()
+            for start in range(0, sealable, block_size):
+                stop = start + block_size
+                self._archive.seal(self._timestamps[start:stop], self._type_codes[start:stop],
+                                   self._amounts[start:stop], self._balances[start:stop])
+            self._timestamps = self._timestamps[sealable:]
+            self._type_codes = self._type_codes[sealable:]
+            self._amounts = self._amounts[sealable:]
+            self._balances = self._balances[sealable:]
+            # Type index positions are relative to the hot columns; rebuild on next use
+            self._indexed = 0
+            self._type_positions = None
+            self._type_prefix = None
+            return sealable
+
+    def archived_count(self):
+        """Number of entries held in compressed blocks"""
+        return 0 if self._archive is None else self._archive.count
+
+    def last_timestamp(self):
+        """Epoch seconds of the newest entry, or None when empty"""
+        with self._lock:
+            return self._newest_timestamp()
+
+    def _newest_timestamp(self):
+        if self._timestamps:
+            return self._timestamps[-1]
+        return None if self._archive is None else self._archive.last_timestamp
+
+    def _bisect(self, moment, right):
+        """Global bisect_left/bisect_right of ``moment`` over all timestamps"""
+        epoch = to_epoch(moment)
+        hot = self._timestamps
+        offset = self.archived_count()
+        if offset and (not hot or epoch < hot[0] or (not right and epoch == hot[0])):
+            return self._archive.bisect(epoch, right)
+        return offset + (bisect_right(hot, epoch) if right else bisect_left(hot, epoch))
+
+    def _balance(self, position):
+        """Balance after the entry at a global position"""
+        offset = self.archived_count()
+        if position < offset:
+            return self._archive.balance(position)
+        return self._balances[position - offset]
+
+    def position_at(self, moment):
+        """Number of entries recorded at or before ``moment``"""
+        with self._lock:
+            return self._bisect(moment, right=True)
+
+    def _range(self, start, end):
+        """Index range of entries with start <= timestamp < end"""
+        return self._bisect(start, right=False), self._bisect(end, right=False)
+
+    def balance_at(self, moment):
+        """Balance after the last entry at or before ``moment`` (zero before any entry)"""
+        with self._lock:
+            index = self._bisect(moment, right=True)
+            return Money(self._balance(index - 1) if index else 0)
+
+    def balance_before(self, moment):
+        """Balance after the last entry strictly before ``moment``"""
+        with self._lock:
+            index = self._bisect(moment, right=False)
+            return Money(self._balance(index - 1) if index else 0)
+
+    def transactions_between(self, start, end):
+        """Entries with start <= timestamp < end, as dictionaries"""
+        with self._lock:
+            return self._entries(*self._range(start, end))
+
+    def columns_between(self, start, end):
+        """Raw (timestamps, type codes, amounts, balances) columns for start <= timestamp < end"""
+        with self._lock:
+            return self._columns(*self._range(start, end))
+
+    def _columns(self, first, stop):
+        """Columns for global positions [first, stop) across both tiers"""
+        offset = self.archived_count()
+        low, high = max(first - offset, 0), max(stop - offset, 0)
+        hot = (self._timestamps[low:high], self._type_codes[low:high],
+               self._amounts[low:high], self._balances[low:high])
+        if first >= offset:
+            return hot
+        cold = self._archive.columns(first, min(stop, offset))
+        for target, column in zip(cold, hot):
+            target.extend(column)
+        return cold
+
+    def sum_by_type(self, start, end):
+        """Total amount per transaction type for start <= timestamp < end"""
+        cents = {}
+        with self._lock:
+            first, stop = self._range(start, end)
+            offset = self.archived_count()
+            if first < offset:
+                self._archive.sum_by_type(first, min(stop, offset), cents)
+            first, stop = max(first - offset, 0), max(stop - offset, 0)
+            self._update_type_index()
+            for code, positions in self._type_positions.items():
+                low = bisect_left(positions, first)
+                high = bisect_left(positions, stop)
+                if high > low:
+                    prefix = self._type_prefix[code]
+                    cents[code] = cents.get(code, 0) + prefix[high] - prefix[low]
+        return {self._type_names[code]: Money(total) for code, total in cents.items()}
+
+    def _update_type_index(self):
+        # Called with the lock held
+        if self._type_positions is None:
+            self._type_positions = {}
+            self._type_prefix = {}
+        for index in range(self._indexed, len(self._type_codes)):
+            code = self._type_codes[index]
+            positions = self._type_positions.get(code)
+            if positions is None:
+                positions = self._type_positions[code] = array('q')
+                self._type_prefix[code] = array('q', [0])
+            prefix = self._type_prefix[code]
+            positions.append(index)
+            prefix.append(prefix[-1] + self._amounts[index])
+        self._indexed = len(self._type_codes)
+
+    def _entries(self, first, stop):
+        """Materialize global positions [first, stop) as dictionaries"""
+        timestamps, type_codes, amounts, balances = self._columns(first, stop)
+        names = self._type_names
+        return [{
+            'timestamp': datetime.fromtimestamp(timestamp).strftime(TIMESTAMP_FORMAT),
+            'type': names[code],
+            'amount': Money(amount),
+            'balance_after': Money(balance)
+        } for timestamp, code, amount, balance in zip(timestamps, type_codes, amounts, balances)]
+
+    def entry(self, index):
+        """Materialize a single transaction as a dictionary"""
+        with self._lock:
+            return self._entries(index, index + 1)[0]
+
+    def last(self, count):
+        """The most recent ``count`` entries, oldest first"""
+        if count <= 0:
+            return []
+        return self[-count:]
+
+    def cursor(self, position=None, page_size=20):
+        """A HistoryCursor at ``position`` (default: after the newest entry)"""
+        return HistoryCursor(self, len(self) if position is None else position, page_size)
+
+    def to_list(self):
+        """Materialize the full history as a list of dictionaries"""
+        with self._lock:
+            return self._entries(0, len(self))
+
+    def __len__(self):
+        with self._lock:
+            return self.archived_count() + len(self._timestamps)
+
+    def __getitem__(self, index):
+        with self._lock:
+            length = len(self)
+            if isinstance(index, slice):
+                first, stop, step = index.indices(length)
+                if step == 1:
+                    return self._entries(first, max(first, stop))
+                return [self.entry(i) for i in range(first, stop, step)]
+            if index < 0:
+                index += length
+            if not 0 <= index < length:
+                raise IndexError("ledger index out of range")
+            return self.entry(index)
+
+    def __iter__(self):
+        # One block's worth of dictionaries at a time, each read under the lock
+        first = 0
+        while True:
+            with self._lock:
+                if first >= len(self):
+                    return
+                entries = self._entries(first, min(first + self.block_size, len(self)))
+            first += len(entries)
+            yield from entries
+
+    def __getstate__(self):
+        # Locks cannot be pickled; each copy gets a fresh one
+        with self._lock:
+            return {name: getattr(self, name) for name in self.__slots__ if name != '_lock'}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return f"TransactionLedger({len(self)} entries, {self.archived_count()} archived)"
+
+
+class HistoryCursor:
+    """Pageable, lazy view over a TransactionLedger.
+
+    The cursor only holds a position, so it never copies the history. Pages
+    are materialized on demand; entries appended after the cursor was made
+    show up when paging forward past the old end.
+    """
+
+    __slots__ = ('ledger', 'position', 'page_size')
+
+    def __init__(self, ledger, position=0, page_size=20):
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        self.ledger = ledger
+        self.position = min(max(position, 0), len(ledger))
+        self.page_size = page_size
+
+    def next_page(self):
+        """Entries from the position onwards; advances the cursor past them"""
+        start = self.position
+        self.position = min(start + self.page_size, len(self.ledger))
+        return self.ledger[start:self.position]
+
+    def previous_page(self):
+        """Entries just before the position, oldest first; moves the cursor back"""
+        stop = self.position
+        self.position = max(stop - self.page_size, 0)
+        return self.ledger[self.position:stop]
+
+    def has_next(self):
+        return self.position < len(self.ledger)
+
+    def has_previous(self):
+        return self.position > 0
+
+    def seek(self, moment):
+        """Move to the first entry recorded after ``moment``"""
+        self.position = self.ledger.position_at(moment)
+        return self
+
+    def __iter__(self):
+        """Lazily yield entries from the position onwards, advancing the cursor"""
+        while self.position < len(self.ledger):
+            entry = self.ledger.entry(self.position)
+            self.position += 1
+            yield entry
+
+    def __repr__(self):
+        return f"HistoryCursor(position={self.position}, page_size={self.page_size}, entries={len(self.ledger)})"
@@ -0,0 +1,180 @@
+"""
+Python Programming Concepts - Vectorized Loan Amortization
+Banking Application: Repayment schedules for approved loans in the Orders book
+"""
+
+import csv
+
+import numpy as np
+
+from .banking_ledger import to_cents
+
+FIXED_RATE = 0
+INTEREST_ONLY = 1
+MONTHS_PER_YEAR = 12
+
+# Default pricing per Orders.order_type: (annual rate, term in months, kind).
+# Order types missing here (e.g. INVESTMENT) have no repayment schedule.
+LOAN_TERMS = {
+    'LOAN': (0.075, 60, FIXED_RATE),
+    'MORTGAGE': (0.065, 360, FIXED_RATE),
+    'CREDIT_CARD': (0.199, 12, INTEREST_ONLY),
+}
+
+# One row per payment; money columns are integer cents
+SCHEDULE_DTYPE = np.dtype([
+    ('loan', 'i8'),
+    ('period', 'i4'),
+    ('payment', 'i8'),
+    ('principal', 'i8'),
+    ('interest', 'i8'),
+    ('balance', 'i8'),
+])
+
+CSV_COLUMNS = ("loan", "period", "payment", "principal", "interest", "balance")
+
+
+def _principal_cents(principal):
+    """Loan amounts in currency units (numbers, Decimal or Money) as float cents"""
+    amounts = np.atleast_1d(np.asarray(principal))
+    if amounts.dtype.kind in 'iuf':
+        return np.rint(amounts * 100.0)
+    return np.array([to_cents(amount) for amount in amounts], dtype=np.float64)
+
+
+def monthly_payment(principal_cents, annual_rate, months):
+    """Level payment in cents that repays each loan over ``months``"""
+    principal = np.asarray(principal_cents, dtype=np.float64)
+    rate = np.asarray(annual_rate, dtype=np.float64) / MONTHS_PER_YEAR
+    months = np.asarray(months, dtype=np.int64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = principal * rate / (1.0 - (1.0 + rate) ** -months)
+    return np.rint(np.where(rate > 0, annuity, principal / months)).astype(np.int64)
+
+
+def amortize(principal, annual_rate, months, kind=FIXED_RATE, loan_ids=None):
+    """Full payment schedules for many loans in one vectorized pass.
+
+    ``principal`` is in currency units; every argument may be a scalar or an
+    array with one entry per loan. Fixed-rate loans pay a level amount each
+    month, with the last payment absorbing rounding; interest-only loans pay
+    interest monthly and repay the principal with the last payment. Each
+    row splits a payment into principal and interest and gives the balance
+    left afterwards, all in whole cents, so principal columns sum exactly to
+    the amount borrowed.
+
+    Returns a SCHEDULE_DTYPE array ordered by loan, then period.
+    """
+    principal = _principal_cents(principal)
+    count = len(principal)
+    rate = np.broadcast_to(np.asarray(annual_rate, dtype=np.float64), (count,)) / MONTHS_PER_YEAR
+    months = np.broadcast_to(np.asarray(months, dtype=np.int64), (count,))
+    kind = np.broadcast_to(np.asarray(kind, dtype=np.int8), (count,))
+    loan_ids = np.arange(count) if loan_ids is None else np.asarray(loan_ids, dtype=np.int64)
+    if count == 0:
+        return np.zeros(0, dtype=SCHEDULE_DTYPE)
+    if (months <= 0).any():
+        raise ValueError("loan terms must be at least one month")
+
+    periods = np.arange(1, months.max() + 1)
+    k = periods[None, :]
+    n = months[:, None]
+    r = rate[:, None]
+    p = principal[:, None]
+    last = k == n
+
+    # Fixed rate: closed-form balance after k level payments, rounded to cents
+    payment = monthly_payment(principal, rate * MONTHS_PER_YEAR, months)[:, None].astype(np.float64)
+    growth = (1.0 + r) ** k
+    with np.errstate(divide='ignore', invalid='ignore'):
+        remaining = np.where(r > 0, p * growth - payment * (growth - 1.0) / r, p - payment * k)
+    fixed_balance = np.where(k < n, np.clip(np.rint(remaining), 0, None), 0)
+
+    # Interest only: the balance stays at the principal until the final payment
+    interest_only = (kind == INTEREST_ONLY)[:, None]
+    balance = np.where(interest_only, np.where(last, 0, p), fixed_balance).astype(np.int64)
+
+    previous = np.concatenate((principal[:, None].astype(np.int64), balance[:, :-1]), axis=1)
+    principal_paid = previous - balance
+    period_interest = np.rint(previous * r).astype(np.int64)
+    interest = np.where(interest_only | last, period_interest,
+                        payment.astype(np.int64) - principal_paid)
+
+    valid = k <= n
+    schedule = np.zeros(int(valid.sum()), dtype=SCHEDULE_DTYPE)
+    schedule['loan'] = np.broadcast_to(loan_ids[:, None], valid.shape)[valid]
+    schedule['period'] = np.broadcast_to(k, valid.shape)[valid]
+    schedule['principal'] = principal_paid[valid]
+    schedule['interest'] = interest[valid]
+    schedule['payment'] = schedule['principal'] + schedule['interest']
+    schedule['balance'] = balance[valid]
+    return schedule
+
+
+def iter_amortize(principal, annual_rate, months, kind=FIXED_RATE, loan_ids=None, chunk_size=1000):
+    """Streaming amortize(): yield schedules for ``chunk_size`` loans at a time.
+
+    Memory stays proportional to one chunk, whatever the size of the book.
+    """
+    principal = np.atleast_1d(np.asarray(principal))
+    count = len(principal)
+    rate = np.broadcast_to(np.asarray(annual_rate, dtype=np.float64), (count,))
+    months = np.broadcast_to(np.asarray(months, dtype=np.int64), (count,))
+    kind = np.broadcast_to(np.asarray(kind, dtype=np.int8), (count,))
+    loan_ids = np.arange(count) if loan_ids is None else np.asarray(loan_ids, dtype=np.int64)
+    for start in range(0, count, chunk_size):
+        stop = start + chunk_size
+        yield amortize(principal[start:stop], rate[start:stop], months[start:stop],
+                       kind[start:stop], loan_ids[start:stop])
+
+
+def approved_loans(orders, terms=LOAN_TERMS):
+    """Pick approved, schedulable orders out of Orders rows.
+
+    ``orders`` is an iterable of mappings with the Orders columns
+    (``order_id``, ``order_type``, ``amount``, ``status``), for example from
+    a DB-API cursor. Returns (order ids, amounts, annual rates, months, kinds).
+    """
+    ids, amounts, rates, months, kinds = [], [], [], [], []
+    for order in orders:
+        pricing = terms.get(order['order_type'])
+        if order['status'] != 'APPROVED' or pricing is None:
+            continue
+        rate, term, kind = pricing
+        ids.append(order['order_id'])
+        amounts.append(order['amount'])
+        rates.append(rate)
+        months.append(term)
+        kinds.append(kind)
+    return (np.array(ids, dtype=np.int64), amounts, np.array(rates, dtype=np.float64),
+            np.array(months, dtype=np.int64), np.array(kinds, dtype=np.int8))
+
+
+def schedule_orders(orders, terms=LOAN_TERMS, chunk_size=None):
+    """Schedules for the approved loans among ``orders``, keyed by order_id in the ``loan`` column.
+
+    With a ``chunk_size`` a generator of per-chunk schedules is returned instead.
+    """
+    ids, amounts, rates, months, kinds = approved_loans(orders, terms)
+    if chunk_size is None:
+        return amortize(amounts, rates, months, kinds, ids)
+    return iter_amortize(amounts, rates, months, kinds, ids, chunk_size)
+
+
+def write_schedules_csv(path, schedules):
+    """Stream schedules (an array or an iterable of chunks) to a CSV file; returns rows written"""
+    if isinstance(schedules, np.ndarray):
+        schedules = (schedules,)
+    rows = 0
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_COLUMNS)
+        for chunk in schedules:
+            money = [chunk[column] / 100 for column in CSV_COLUMNS[2:]]
+            writer.writerows(
+                (loan, period, f"{payment:.2f}", f"{principal:.2f}", f"{interest:.2f}", f"{balance:.2f}")
+                for loan, period, payment, principal, interest, balance
+                in zip(chunk['loan'].tolist(), chunk['period'].tolist(), *(column.tolist() for column in money))
+            )
+            rows += len(chunk)
+    return rows
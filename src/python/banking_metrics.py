@@ -0,0 +1,141 @@
+"""
+Python Programming Concepts - Operation Metrics
+Banking Application: Outcome counters and latency histograms in Prometheus format
+"""
+
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import threading
+
+from .banking_events import EventSink
+
+# Upper bounds in seconds; the implicit last bucket is +Inf
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                   1e-3, 2.5e-3, 5e-3, 1e-2, 0.1, 1.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram, the way Prometheus stores them"""
+
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the ``q`` quantile (inf past the last bound)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+class MetricsSink(EventSink):
+    """Event sink that counts operations by outcome and records latencies.
+
+    Counters are keyed by (operation, account type, outcome), where the
+    outcome is "accepted" or the rejection reason; histograms by (operation,
+    account type). Accounts only build events while a sink is enabled, so
+    leaving the default NullSink installed keeps metrics at zero cost.
+    Combine with other sinks through TeeSink.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS, namespace="banking"):
+        self.buckets = buckets
+        self.namespace = namespace
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def emit(self, event):
+        operation, account_type = event['event'], event['account_type']
+        key = (operation, account_type, event['reason'] or "accepted")
+        latency = event.get('latency')
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+            if latency is not None:
+                histogram = self.histograms.get((operation, account_type))
+                if histogram is None:
+                    histogram = self.histograms[(operation, account_type)] = LatencyHistogram(self.buckets)
+                histogram.observe(latency)
+
+    def count(self, operation, outcome="accepted", account_type=None):
+        """Total of one counter, across account types unless one is given"""
+        with self._lock:
+            return sum(value for (op, kind, result), value in self.counters.items()
+                       if op == operation and result == outcome
+                       and (account_type is None or kind == account_type))
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def to_prometheus(self):
+        """Render every metric in the Prometheus text exposition format"""
+        operations = f"{self.namespace}_operations_total"
+        latency = f"{self.namespace}_operation_latency_seconds"
+        with self._lock:
+            lines = [f"# HELP {operations} Account operations by outcome",
+                     f"# TYPE {operations} counter"]
+            for (operation, account_type, outcome), value in sorted(self.counters.items()):
+                labels = f'operation="{operation}",account_type="{account_type}",outcome="{outcome}"'
+                lines.append(f"{operations}{{{labels}}} {value}")
+
+            lines += [f"# HELP {latency} Account operation latency",
+                      f"# TYPE {latency} histogram"]
+            for (operation, account_type), histogram in sorted(self.histograms.items()):
+                labels = f'operation="{operation}",account_type="{account_type}"'
+                cumulative = 0
+                for bound, count in zip(histogram.bounds + (float('inf'),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float('inf') else repr(bound)
+                    lines.append(f'{latency}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{latency}_sum{{{labels}}} {histogram.total!r}")
+                lines.append(f"{latency}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Atomically write the metrics to ``path`` (e.g. for node_exporter's textfile collector)"""
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+
+def start_metrics_server(metrics, host="127.0.0.1", port=9108):
+    """Serve ``metrics.to_prometheus()`` over HTTP from a daemon thread.
+
+    Returns the server; call ``shutdown()`` on it to stop.
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = metrics.to_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
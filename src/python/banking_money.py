@@ -0,0 +1,177 @@
+"""
+Python Programming Concepts - Exact Money Type
+Banking Application: Integer-cent amounts shared by balances and transactions
+"""
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
+from fractions import Fraction
+import math
+import numbers
+import operator
+
+_CENT = Decimal("0.01")
+
+# ISO 4217 code of accounts opened without an explicit currency
+DEFAULT_CURRENCY = "USD"
+
+
+def _decimal_to_cents(value):
+    try:
+        return int(value.quantize(_CENT, rounding=ROUND_HALF_EVEN).scaleb(2))
+    except InvalidOperation:
+        raise ValueError(f"Not a valid amount of money: {value}") from None
+
+
+class Money:
+    """An exact amount of money held as integer cents.
+
+    Arithmetic with plain numbers converts them to cents first (floats via
+    their shortest repr, rounding half to even), so repeated ``+=`` never
+    drifts the way float balances do.
+    """
+
+    __slots__ = ('cents',)
+
+    def __init__(self, cents=0):
+        self.cents = int(cents)
+
+    @classmethod
+    def of(cls, amount):
+        """Convert a Money, int, float, Decimal or numeric string to Money"""
+        kind = type(amount)
+        if kind is Money:
+            return amount
+        if kind is int:
+            return cls(amount * 100)
+        if isinstance(amount, float):
+            if not math.isfinite(amount):
+                raise ValueError(f"Not a valid amount of money: {amount!r}")
+            # Fast path: floats that are already a whole number of cents
+            scaled = amount * 100
+            cents = round(scaled)
+            if abs(scaled - cents) < 1e-6:
+                return cls(cents)
+        if isinstance(amount, Money):
+            return amount
+        if isinstance(amount, numbers.Integral):
+            return cls(int(amount) * 100)
+        if isinstance(amount, (numbers.Real, str)):
+            try:
+                amount = Decimal(str(amount))
+            except InvalidOperation:
+                raise ValueError(f"Not a valid amount of money: {amount!r}") from None
+        if isinstance(amount, Decimal):
+            return cls(_decimal_to_cents(amount))
+        raise TypeError(f"Cannot convert {type(amount).__name__} to Money")
+
+    def to_decimal(self):
+        return Decimal(self.cents).scaleb(-2)
+
+    def _scaled(self, factor):
+        return Money(_decimal_to_cents(self.to_decimal() * Decimal(str(factor))))
+
+    def __add__(self, other):
+        try:
+            return Money(self.cents + Money.of(other).cents)
+        except TypeError:
+            return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        try:
+            return Money(self.cents - Money.of(other).cents)
+        except TypeError:
+            return NotImplemented
+
+    def __rsub__(self, other):
+        try:
+            return Money(Money.of(other).cents - self.cents)
+        except TypeError:
+            return NotImplemented
+
+    def __mul__(self, factor):
+        if isinstance(factor, Money):
+            return NotImplemented
+        return self._scaled(factor)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor):
+        if isinstance(divisor, Money):
+            return self.cents / divisor.cents
+        return Money(_decimal_to_cents(self.to_decimal() / Decimal(str(divisor))))
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Money(abs(self.cents))
+
+    def __bool__(self):
+        return self.cents != 0
+
+    def __float__(self):
+        return self.cents / 100
+
+    def _compare(self, other, compare):
+        """Compare exactly: numbers are not rounded to cents first.
+
+        Floats compare by their shortest repr, as Money.of() reads them, so
+        ``Money.of(0.1) == 0.1`` but ``Money(100) != 1.004``.
+        """
+        if isinstance(other, Money):
+            return compare(self.cents, other.cents)
+        if isinstance(other, numbers.Integral):
+            return compare(self.cents, int(other) * 100)
+        if isinstance(other, float):
+            if not math.isfinite(other):
+                return compare(float(self), other)
+            return compare(self.to_decimal(), Decimal(repr(other)))
+        if isinstance(other, Decimal):
+            if other.is_nan():
+                return compare(float(self), float(other))
+            return compare(self.to_decimal(), other)
+        if isinstance(other, numbers.Real):
+            return compare(Fraction(self.cents, 100), other)
+        return NotImplemented
+
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+    def __hash__(self):
+        return hash(self.to_decimal())
+
+    def __format__(self, spec):
+        return format(self.to_decimal(), spec) if spec else str(self)
+
+    def __str__(self):
+        return str(self.to_decimal())
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+    def __reduce__(self):
+        return (Money, (self.cents,))
+
+
+def json_default(value):
+    """``json.dumps`` hook that writes Money as a number"""
+    if isinstance(value, Money):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,268 @@
+"""
+Python Programming Concepts - Hierarchical Timing Wheel
+Banking Application: Scheduling recurring interest, fee and standing-order runs
+"""
+
+import calendar
+from datetime import datetime
+import math
+import time
+
+from .banking_jobs import InterestJob, MonthlyFeeJob, run_maintenance
+from .banking_ledger import to_epoch
+from .banking_money import Money
+from .python_oop_banking import transfer
+
+WHEEL_SLOTS = 256
+WHEEL_LEVELS = 4
+
+
+def add_months(moment, months=1):
+    """Epoch seconds ``months`` calendar months after ``moment``, clamping the day to the month's end"""
+    when = datetime.fromtimestamp(to_epoch(moment))
+    month = when.month - 1 + months
+    year = when.year + month // 12
+    month = month % 12 + 1
+    day = min(when.day, calendar.monthrange(year, month)[1])
+    return when.replace(year=year, month=month, day=day).timestamp()
+
+
+def monthly(moment):
+    """Recurrence for TimingWheel.schedule(): the same time next calendar month"""
+    return add_months(moment)
+
+
+class TimerEvent:
+    """One scheduled (possibly recurring) event held by a TimingWheel.
+
+    ``interval`` is None for a one-shot event, a number of seconds, or a
+    callable mapping one due time to the next (e.g. ``monthly``).
+    """
+
+    __slots__ = ('due', 'interval', 'action', 'target', '_bucket', '_level')
+
+    def __init__(self, due, interval, action, target):
+        self.due = due
+        self.interval = interval
+        self.action = action
+        self.target = target
+        self._bucket = None
+        self._level = None
+
+    @property
+    def active(self):
+        return self._bucket is not None
+
+    def next_due(self, now):
+        """First recurrence after ``now``; missed periods are skipped, not replayed"""
+        if callable(self.interval):
+            due = self.interval(self.due)
+            while due <= now:
+                due = self.interval(due)
+            return due
+        due = self.due + self.interval
+        if due <= now:
+            due += ((now - due) // self.interval + 1) * self.interval
+        return due
+
+    def __repr__(self):
+        return f"TimerEvent(due={self.due}, action={self.action!r}, target={self.target!r})"
+
+
+class TimingWheel:
+    """Hierarchical timing wheel (Varghese & Lauck) keyed by epoch seconds.
+
+    Level ``L`` has ``slots`` buckets of ``slots**L`` ticks each, so four
+    levels of 256 one-minute slots reach about 8000 years ahead. An event
+    sits in the bucket of the lowest level whose span covers its delay and
+    is cascaded one level down each time the wheel below wraps, until it
+    lands on level 0 and fires. Buckets are insertion-ordered dicts, so
+    scheduling and cancelling are O(1), and advancing costs O(1) per tick
+    plus the events that move or fire; runs of ticks with nothing on the
+    lower levels are skipped outright.
+    """
+
+    def __init__(self, start=None, resolution=60, slots=WHEEL_SLOTS, levels=WHEEL_LEVELS):
+        if resolution <= 0 or slots < 2 or levels < 1:
+            raise ValueError("resolution must be positive, with at least two slots and one level")
+        self.origin = to_epoch(time.time() if start is None else start)
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self._tick = 0
+        self._spans = [slots ** level for level in range(levels + 1)]
+        self._buckets = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._counts = [0] * levels
+
+    @property
+    def now(self):
+        """Epoch seconds the wheel has advanced to"""
+        return self.origin + self._tick * self.resolution
+
+    def schedule(self, due, action, target=None, interval=None):
+        """Schedule ``action`` for ``target`` at ``due`` (datetime or epoch seconds).
+
+        An event already due fires at the wheel's next tick. Returns the
+        TimerEvent, which is the handle for cancel().
+        """
+        event = TimerEvent(to_epoch(due), interval, action, target)
+        self._insert(event)
+        return event
+
+    def cancel(self, event):
+        """Remove a pending event (and its recurrences); False if it was not pending"""
+        bucket = event._bucket
+        if bucket is None:
+            return False
+        del bucket[event]
+        self._counts[event._level] -= 1
+        event._bucket = None
+        return True
+
+    def _insert(self, event, earliest=None):
+        spans = self._spans
+        earliest = self._tick + 1 if earliest is None else earliest
+        tick = max(math.ceil((event.due - self.origin) / self.resolution), earliest)
+        # Beyond the top level: park in its furthest bucket and cascade from there
+        tick = min(tick, self._tick + spans[-1] - 1)
+        delay = tick - self._tick
+        level = 0
+        while delay >= spans[level + 1]:
+            level += 1
+        bucket = self._buckets[level][(tick // spans[level]) % self.slots]
+        bucket[event] = None
+        event._bucket = bucket
+        event._level = level
+        self._counts[level] += 1
+
+    def advance(self, now=None):
+        """Move the wheel to ``now`` and return the events that fell due, tick by tick.
+
+        A recurring event fires at most once per call and is rescheduled
+        for its first recurrence after ``now`` before it is returned, so a
+        batch never holds the same event twice.
+        """
+        now = to_epoch(time.time() if now is None else now)
+        target = math.floor((now - self.origin) / self.resolution)
+        slots = self.slots
+        fired = []
+        while self._tick < target:
+            # The smallest stride at which something can fire or cascade
+            stride = 1
+            for level in range(self.levels - 1):
+                if self._counts[level]:
+                    break
+                stride *= slots
+            else:
+                if not self._counts[-1]:
+                    self._tick = target
+                    break
+            tick = (self._tick // stride + 1) * stride
+            if tick > target:
+                self._tick = target
+                break
+            self._tick = tick
+            for level in range(self.levels - 1, 0, -1):
+                if tick % self._spans[level] == 0:
+                    self._cascade(level, (tick // self._spans[level]) % slots)
+            fired.extend(self._fire(tick % slots, now))
+        return fired
+
+    def _take(self, level, index):
+        bucket = self._buckets[level][index]
+        self._buckets[level][index] = {}
+        self._counts[level] -= len(bucket)
+        return bucket
+
+    def _cascade(self, level, index):
+        # Runs before the tick's level-0 bucket fires, so events due now still fire now
+        for event in self._take(level, index):
+            self._insert(event, self._tick)
+
+    def _fire(self, index, now):
+        fired = list(self._take(0, index))
+        for event in fired:
+            event._bucket = None
+            if event.interval is not None:
+                event.due = event.next_due(now)
+                self._insert(event)
+        return fired
+
+    def __len__(self):
+        return sum(self._counts)
+
+
+class StandingOrder:
+    """A fixed transfer from one account to another"""
+
+    __slots__ = ('source', 'destination', 'amount')
+
+    def __init__(self, source, destination, amount):
+        self.source = source
+        self.destination = destination
+        self.amount = Money.of(amount)
+
+    def __repr__(self):
+        return f"StandingOrder({self.source.account_number} -> {self.destination.account_number}, {self.amount})"
+
+
+STANDING_ORDER = "standing_order"
+
+
+class AccountScheduler:
+    """Recurring account work on a TimingWheel, fired in batches.
+
+    Interest and monthly fees are MaintenanceJob actions: every account due
+    in one run_due() call goes through a single vectorized run_maintenance()
+    pass. Standing orders are posted with transfer().
+    """
+
+    def __init__(self, start=None, resolution=60):
+        self.wheel = TimingWheel(start, resolution)
+        self.interest_job = InterestJob()
+        self.fee_job = MonthlyFeeJob()
+
+    def schedule_interest(self, account, first, interval=monthly):
+        return self.wheel.schedule(first, self.interest_job, account, interval)
+
+    def schedule_monthly_fee(self, account, first, interval=monthly):
+        return self.wheel.schedule(first, self.fee_job, account, interval)
+
+    def schedule_standing_order(self, source, destination, amount, first, interval=monthly):
+        return self.wheel.schedule(first, STANDING_ORDER, StandingOrder(source, destination, amount), interval)
+
+    def cancel(self, event):
+        return self.wheel.cancel(event)
+
+    def run_due(self, now=None):
+        """Fire everything due up to ``now``; returns a result dict per action name"""
+        now = time.time() if now is None else to_epoch(now)
+        batches = {}
+        for event in self.wheel.advance(now):
+            batches.setdefault(event.action, []).append(event.target)
+
+        report = {}
+        as_of = datetime.fromtimestamp(now)
+        for action, targets in batches.items():
+            if action == STANDING_ORDER:
+                report[STANDING_ORDER] = self._run_standing_orders(targets)
+            else:
+                report[action.name] = run_maintenance(targets, [action], as_of=as_of,
+                                                      shards=1, workers=0)['jobs'][action.name]
+        return report
+
+    @staticmethod
+    def _run_standing_orders(orders):
+        result = {'selected': len(orders), 'posted': 0, 'declined': 0,
+                  'total': Money(0), 'declined_accounts': []}
+        for order in orders:
+            if transfer(order.source, order.destination, order.amount):
+                result['posted'] += 1
+                result['total'] += order.amount
+            else:
+                result['declined'] += 1
+                result['declined_accounts'].append(order.source.account_number)
+        return result
+
+    def __len__(self):
+        return len(self.wheel)
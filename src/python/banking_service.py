@@ -0,0 +1,225 @@
+"""
+Python Programming Concepts - Asynchronous Banking Service
+Banking Application: asyncio TCP front-end with per-account request batching
+
+Protocol: one JSON object per line in each direction, for example
+    {"id": 1, "op": "deposit", "account": "CA001", "amount": 25.0}
+    {"id": 1, "ok": true, "accepted": true, "balance": 2025.0}
+
+Deposits, withdrawals and transfers may carry an "idempotency_key"; a retry
+with the same key gets the first outcome instead of being applied again.
+"""
+
+import argparse
+import asyncio
+import json
+
+from .banking_account_book import AccountBook
+from .banking_ledger import TransactionLedger
+from .banking_money import json_default
+from .python_oop_banking import BankAccount, SavingsAccount, CheckingAccount, transfer
+
+# Mark a request line that is not valid JSON / longer than the reader's limit
+_INVALID = object()
+_TOO_LONG = object()
+
+
+class BankingService:
+    """Applies client requests to an AccountBook from an asyncio event loop.
+
+    Requests for the same account that arrive while a batch is waiting to run
+    are coalesced and applied together in one callback, at most ``max_batch``
+    per turn of the loop. When ``max_pending`` requests are already queued,
+    new requests are refused with an ``overloaded`` error so clients back off
+    instead of growing the queues without bound.
+    """
+
+    OPERATIONS = ("deposit", "withdraw", "balance", "info", "interest", "history", "transfer")
+
+    def __init__(self, accounts, max_pending=10000, max_batch=256):
+        self.accounts = accounts
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.pending = 0
+        self.batches_run = 0
+        self._queues = {}
+
+    async def submit(self, request):
+        """Queue one request and wait for its response dict"""
+        op = request.get('op')
+        if op not in self.OPERATIONS:
+            return {'ok': False, 'error': f"unknown operation: {op}"}
+        account_number = request.get('account')
+        if not isinstance(account_number, str) or account_number not in self.accounts:
+            return {'ok': False, 'error': f"unknown account: {account_number}"}
+        if 'to' in request and not isinstance(request['to'], str):
+            return {'ok': False, 'error': f"unknown account: {request['to']}"}
+        if self.pending >= self.max_pending:
+            return {'ok': False, 'error': "overloaded"}
+
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues.get(account_number)
+        if queue is None:
+            queue = self._queues[account_number] = []
+            asyncio.get_running_loop().call_soon(self._run_batch, account_number)
+        queue.append((request, future))
+        self.pending += 1
+        return await future
+
+    def _run_batch(self, account_number):
+        """Apply every queued request for one account in arrival order"""
+        queue = self._queues.pop(account_number)
+        batch, rest = queue[:self.max_batch], queue[self.max_batch:]
+        if rest:
+            self._queues[account_number] = rest
+            asyncio.get_running_loop().call_soon(self._run_batch, account_number)
+
+        account = self.accounts.get(account_number)
+        self.batches_run += 1
+        for request, future in batch:
+            self.pending -= 1
+            if future.cancelled():
+                continue
+            # Any failure answers this request only; the rest of the batch still runs
+            try:
+                response = self._apply(account, request)
+            except Exception as e:
+                response = {'ok': False, 'error': str(e) or type(e).__name__}
+            future.set_result(response)
+
+    def _apply(self, account, request):
+        op = request['op']
+        if account is None:
+            return {'ok': False, 'error': "account closed"}
+        key = request.get('idempotency_key')
+        if op == "deposit":
+            accepted = account.deposit(float(request['amount']), key)
+        elif op == "withdraw":
+            accepted = account.withdraw(float(request['amount']), key)
+        elif op == "transfer":
+            destination = self.accounts[request['to']]
+            accepted = transfer(account, destination, float(request['amount']), key)
+        elif op == "interest":
+            if not isinstance(account, SavingsAccount):
+                return {'ok': False, 'error': "interest applies to savings accounts only"}
+            account.calculate_interest()
+            accepted = True
+        elif op == "info":
+            return {'ok': True, 'info': account.get_account_info()}
+        elif op == "history":
+            limit = int(request.get('limit', 5))
+            if 'before' in request:
+                # Page backwards from a position returned by an earlier call
+                cursor = account.history_cursor(int(request['before']), limit)
+                page = cursor.previous_page()
+                return {'ok': True, 'transactions': page, 'before': cursor.position}
+            return {'ok': True, 'transactions': account.get_recent_transactions(limit),
+                    'before': max(len(account.transactions) - limit, 0)}
+        else:
+            return {'ok': True, 'balance': account.balance}
+        return {'ok': True, 'accepted': accepted, 'balance': account.balance}
+
+    async def handle_connection(self, reader, writer):
+        """Serve one client: read request lines, write response lines"""
+        try:
+            while True:
+                line = await _read_line(reader)
+                if not line:
+                    break
+                if line is _TOO_LONG:
+                    request = _TOO_LONG
+                else:
+                    try:
+                        request = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        request = _INVALID
+                if request is _TOO_LONG:
+                    response = {'ok': False, 'error': "request line too long"}
+                elif request is _INVALID:
+                    response = {'ok': False, 'error': "invalid JSON"}
+                elif not isinstance(request, dict):
+                    response = {'ok': False, 'error': "request must be a JSON object"}
+                else:
+                    # Any failure answers this request only; the connection stays open
+                    try:
+                        response = await self.submit(request)
+                    except Exception as e:
+                        response = {'ok': False, 'error': str(e) or type(e).__name__}
+                    if 'id' in request:
+                        response = {'id': request['id'], **response}
+                writer.write(json.dumps(response, default=json_default).encode('utf-8') + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """Start listening; returns the asyncio server"""
+        return await asyncio.start_server(self.handle_connection, host, port, limit=1 << 16)
+
+
+async def _read_line(reader):
+    """The next request line, b"" at EOF or _TOO_LONG for a line over the limit.
+
+    An oversized line is read and discarded up to its newline, so the
+    following request starts cleanly.
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as e:
+        return e.partial
+    except asyncio.LimitOverrunError as e:
+        overrun = e
+    while True:
+        await reader.readexactly(overrun.consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return _TOO_LONG
+        except asyncio.IncompleteReadError:
+            return b""
+        except asyncio.LimitOverrunError as e:
+            overrun = e
+
+
+def create_demo_book(count=0):
+    """The interactive demo accounts, plus ``count`` generated checking accounts"""
+    book = AccountBook([
+        BankAccount("BA001", "Demo User", 1000.0),
+        SavingsAccount("SA001", "Demo Saver", 5000.0, 0.03, 500.0),
+        CheckingAccount("CA001", "Demo Checker", 2000.0, 1000.0),
+    ])
+    for i in range(count):
+        book.add(CheckingAccount(f"AC{i:06d}", f"Customer {i}", 1000.0, 500.0))
+    return book
+
+
+async def serve(host, port, accounts, **options):
+    service = BankingService(accounts, **options)
+    server = await service.start(host, port)
+    print(f"🏦 Banking service listening on {host}:{port} ({len(accounts)} accounts)")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the asyncio banking service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--accounts", type=int, default=1000, help="generated checking accounts")
+    parser.add_argument("--max-pending", type=int, default=10000)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--hot-history", type=int, default=None,
+                        help="keep this many recent entries per account uncompressed; older ones are archived")
+    args = parser.parse_args()
+    if args.hot_history is not None:
+        TransactionLedger.hot_limit = args.hot_history
+    try:
+        asyncio.run(serve(args.host, args.port, create_demo_book(args.accounts),
+                          max_pending=args.max_pending, max_batch=args.max_batch))
+    except KeyboardInterrupt:
+        print("\n👋 Service stopped")
+
+
+if __name__ == "__main__":
+    main()
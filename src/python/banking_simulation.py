@@ -0,0 +1,212 @@
+"""
+Python Programming Concepts - Monte Carlo Simulation
+Banking Application: Vectorized what-if runs over whole account populations
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import time
+
+import numpy as np
+
+from .banking_events import INSUFFICIENT_FUNDS, MINIMUM_BALANCE, OVERDRAFT_EXCEEDED
+from .banking_jobs import MONTHLY_FEES
+from .banking_ledger import to_cents
+from .banking_snapshot import ACCOUNT_TYPE_CODES
+from .python_oop_banking import SavingsAccount
+
+BASIC = ACCOUNT_TYPE_CODES["Basic"]
+SAVINGS = ACCOUNT_TYPE_CODES["Savings"]
+CHECKING = ACCOUNT_TYPE_CODES["Checking"]
+
+# Reasons withdraw() reports for a refused withdrawal, each counted per month
+REJECTION_REASONS = (INSUFFICIENT_FUNDS, MINIMUM_BALANCE, OVERDRAFT_EXCEEDED)
+
+# Per-step customer behaviour: probability of a deposit/withdrawal and its mean size
+DEFAULT_BEHAVIOUR = {
+    'deposit_probability': 0.10,
+    'deposit_mean': 200.0,
+    'withdraw_probability': 0.15,
+    'withdraw_mean': 120.0,
+    'amount_sigma': 0.8,
+}
+
+# Per-month totals reported by the simulation
+MONTH_FIELDS = ('total_balance', 'overdrawn_accounts', 'overdraft_used', 'interest_paid',
+                'fees_charged', 'fees_rejected', 'deposits', 'withdrawals',
+                INSUFFICIENT_FUNDS, MINIMUM_BALANCE, OVERDRAFT_EXCEEDED)
+
+
+def population_from_accounts(accounts):
+    """Column arrays (type, balance and floor in cents, rate) for existing accounts"""
+    accounts = list(accounts)
+    return {
+        'type': np.array([ACCOUNT_TYPE_CODES[a.account_type] for a in accounts], dtype=np.int8),
+        'balance': np.array([to_cents(a.balance) for a in accounts], dtype=np.int64),
+        'floor': np.array([to_cents(a.get_withdrawal_floor()) for a in accounts], dtype=np.int64),
+        'interest_rate': np.array([a.interest_rate if isinstance(a, SavingsAccount) else 0.0
+                                   for a in accounts], dtype=np.float64),
+    }
+
+
+def synthetic_population(count, seed=0, savings_share=0.5, interest_rate=0.02,
+                         minimum_balance=100.0, overdraft_limit=500.0):
+    """A random mix of savings and checking accounts with the classes' default terms"""
+    rng = np.random.default_rng(seed)
+    savings = rng.random(count) < savings_share
+    opening = np.rint(rng.lognormal(np.log(2000.0), 1.0, count) * 100).astype(np.int64)
+    floor = np.where(savings, to_cents(minimum_balance), -to_cents(overdraft_limit))
+    return {
+        'type': np.where(savings, SAVINGS, CHECKING).astype(np.int8),
+        'balance': np.maximum(opening, floor),
+        'floor': floor.astype(np.int64),
+        'interest_rate': np.where(savings, interest_rate, 0.0),
+    }
+
+
+def _amounts(rng, mean, sigma, count):
+    """Lognormal amounts in cents with the given mean in currency units"""
+    mu = np.log(mean) - sigma * sigma / 2
+    return np.maximum(np.rint(rng.lognormal(mu, sigma, count) * 100), 1).astype(np.int64)
+
+
+def simulate_chunk(population, steps, steps_per_month, seed, behaviour=None, fees=None):
+    """Run one chunk of accounts through ``steps`` steps with the account rules.
+
+    Every step each account may deposit and then withdraw; a withdrawal
+    that would take the balance below the account's floor is rejected and
+    counted under the reason withdraw() reports: a savings withdrawal larger
+    than the balance is INSUFFICIENT_FUNDS before it is MINIMUM_BALANCE.
+    At each month end savings accounts earn
+    ``interest_rate / 12`` on positive balances and the monthly fee is taken
+    through the same withdrawal rule, so it is refused when funds are short.
+
+    Returns (per-month totals dict, final balances).
+    """
+    behaviour = {**DEFAULT_BEHAVIOUR, **(behaviour or {})}
+    fees = MONTHLY_FEES if fees is None else fees
+    rng = np.random.default_rng(seed)
+    kinds = population['type']
+    balance = population['balance'].astype(np.int64, copy=True)
+    floor = population['floor']
+    monthly_rate = population['interest_rate'] / 12
+    fee = np.zeros(len(kinds), dtype=np.int64)
+    for account_type, amount in fees.items():
+        fee[kinds == ACCOUNT_TYPE_CODES[account_type]] = to_cents(amount)
+    count = len(kinds)
+    sigma = behaviour['amount_sigma']
+
+    months = steps // steps_per_month
+    totals = {field: np.zeros(months, dtype=np.int64) for field in MONTH_FIELDS}
+    for step in range(steps):
+        deposit = (rng.random(count) < behaviour['deposit_probability'])
+        deposit_amounts = _amounts(rng, behaviour['deposit_mean'], sigma, count) * deposit
+        balance += deposit_amounts
+
+        withdraw = (rng.random(count) < behaviour['withdraw_probability'])
+        withdraw_amounts = _amounts(rng, behaviour['withdraw_mean'], sigma, count)
+        accepted = withdraw & (balance - withdraw_amounts >= floor)
+        balance -= withdraw_amounts * accepted
+        rejected = withdraw & ~accepted
+
+        month = step // steps_per_month
+        if month >= months:
+            continue
+        totals['deposits'][month] += deposit.sum()
+        totals['withdrawals'][month] += accepted.sum()
+        if rejected.any():
+            checking = rejected & (kinds == CHECKING)
+            short = rejected & ~checking & (withdraw_amounts > balance)
+            totals[OVERDRAFT_EXCEEDED][month] += checking.sum()
+            totals[INSUFFICIENT_FUNDS][month] += short.sum()
+            totals[MINIMUM_BALANCE][month] += (rejected & ~checking & ~short).sum()
+        if (step + 1) % steps_per_month:
+            continue
+
+        interest = np.rint(np.maximum(balance, 0) * monthly_rate).astype(np.int64)
+        balance += interest
+        charge = (fee > 0) & (balance - fee >= floor)
+        balance -= fee * charge
+
+        totals['interest_paid'][month] = interest.sum()
+        totals['fees_charged'][month] = (fee * charge).sum()
+        totals['fees_rejected'][month] = ((fee > 0) & ~charge).sum()
+        totals['total_balance'][month] = balance.sum()
+        overdrawn = balance < 0
+        totals['overdrawn_accounts'][month] = overdrawn.sum()
+        totals['overdraft_used'][month] = -balance[overdrawn].sum()
+    return totals, balance
+
+
+def _run_chunk(args):
+    return simulate_chunk(*args)
+
+
+def simulate(population, steps=360, steps_per_month=30, seed=0, chunk_size=100_000,
+             workers=None, behaviour=None, fees=None):
+    """Simulate a population in chunks across a process pool.
+
+    Each chunk gets its own random stream spawned from ``seed`` by chunk
+    index, so a run is reproducible for a given seed and ``chunk_size``
+    however many workers execute it (``workers=0`` runs in-process).
+
+    Returns a dict with per-month totals (``months``), the ``final_balances``
+    array and summary percentiles of the final balances.
+    """
+    count = len(population['type'])
+    streams = np.random.SeedSequence(seed).spawn(max(1, -(-count // chunk_size)))
+    tasks = []
+    for index, start in enumerate(range(0, count, chunk_size)):
+        chunk = {name: column[start:start + chunk_size] for name, column in population.items()}
+        tasks.append((chunk, steps, steps_per_month, streams[index], behaviour, fees))
+
+    if workers == 0:
+        results = [_run_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_run_chunk, tasks))
+
+    months = {field: np.zeros(steps // steps_per_month, dtype=np.int64) for field in MONTH_FIELDS}
+    for totals, _balances in results:
+        for field, values in totals.items():
+            months[field] += values
+    final = np.concatenate([balances for _totals, balances in results]) if results else np.zeros(0, np.int64)
+    percentiles = np.percentile(final, (1, 50, 99)) / 100 if len(final) else np.zeros(3)
+    return {
+        'accounts': count,
+        'steps': steps,
+        'months': months,
+        'final_balances': final,
+        'final_percentiles': dict(zip(("p1", "p50", "p99"), percentiles.tolist())),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation of a synthetic account population")
+    parser.add_argument("--accounts", type=int, default=1_000_000)
+    parser.add_argument("--steps", type=int, default=360, help="simulation steps (days)")
+    parser.add_argument("--steps-per-month", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None, help="0 runs in-process")
+    args = parser.parse_args()
+
+    population = synthetic_population(args.accounts, args.seed)
+    start = time.perf_counter()
+    result = simulate(population, args.steps, args.steps_per_month, args.seed, args.chunk_size, args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(f"🎲 {args.accounts:,} accounts x {args.steps} steps in {elapsed:.1f}s")
+    print(f"{'month':>5}{'total balance':>20}{'overdrawn':>12}{'fees':>14}{'interest':>14}{'rejected':>10}")
+    months = result['months']
+    for month in range(len(months['total_balance'])):
+        rejected = sum(months[reason][month] for reason in REJECTION_REASONS)
+        print(f"{month + 1:>5}{months['total_balance'][month] / 100:>20,.2f}"
+              f"{months['overdrawn_accounts'][month]:>12,}{months['fees_charged'][month] / 100:>14,.2f}"
+              f"{months['interest_paid'][month] / 100:>14,.2f}{rejected:>10,}")
+    percentiles = result['final_percentiles']
+    print(f"Final balance p1 ${percentiles['p1']:,.2f}  p50 ${percentiles['p50']:,.2f}  p99 ${percentiles['p99']:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Python Programming Concepts - Memory-Mapped Account Snapshots
+Banking Application: Fixed-width binary account state opened with zero copy
+"""
+
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from .banking_journal import account_from_state
+from .banking_ledger import to_cents
+from .banking_money import DEFAULT_CURRENCY
+from .python_oop_banking import SavingsAccount, CheckingAccount
+
+MAGIC = b"BANKSNP1"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQ8x")
+
+ACCOUNT_TYPE_CODES = {"Basic": 0, "Savings": 1, "Checking": 2}
+ACCOUNT_TYPE_NAMES = {code: name for name, code in ACCOUNT_TYPE_CODES.items()}
+
+# Money fields are integer cents; dates are epoch seconds. The currency and
+# interest day occupy formerly reserved bytes; older snapshots read them as
+# DEFAULT_CURRENCY and the day of the last interest date.
+RECORD_DTYPE = np.dtype([
+    ('account_number', 'S16'),
+    ('account_holder', 'S48'),
+    ('account_type', 'u1'),
+    ('currency', 'S3'),
+    ('interest_day', 'u1'),
+    ('reserved', 'V3'),
+    ('balance', '<i8'),
+    ('interest_rate', '<f8'),
+    ('minimum_balance', '<i8'),
+    ('overdraft_limit', '<i8'),
+    ('last_interest_date', '<i8'),
+])
+
+
+def _encode(text, field):
+    encoded = text.encode('utf-8')
+    if len(encoded) > RECORD_DTYPE[field].itemsize:
+        raise ValueError(f"{field} too long for snapshot format: {text!r}")
+    return encoded
+
+
+def write_snapshot(path, accounts):
+    """Write accounts to a binary snapshot file, sorted by account number"""
+    accounts = list(accounts)
+    records = np.zeros(len(accounts), dtype=RECORD_DTYPE)
+    for i, account in enumerate(accounts):
+        record = records[i]
+        record['account_number'] = _encode(account.account_number, 'account_number')
+        record['account_holder'] = _encode(account.account_holder, 'account_holder')
+        record['account_type'] = ACCOUNT_TYPE_CODES[account.account_type]
+        record['currency'] = _encode(account.currency, 'currency')
+        record['balance'] = to_cents(account.balance)
+        if isinstance(account, SavingsAccount):
+            record['interest_rate'] = account.interest_rate
+            record['minimum_balance'] = to_cents(account.minimum_balance)
+            record['last_interest_date'] = int(account.last_interest_date.timestamp())
+            record['interest_day'] = account.interest_day
+        if isinstance(account, CheckingAccount):
+            record['overdraft_limit'] = to_cents(account.overdraft_limit)
+    records = records[np.argsort(records['account_number'], kind='stable')]
+
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize, len(records)))
+        file.write(records.tobytes())
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    return len(records)
+
+
+class SnapshotReader:
+    """Read-only view over a binary snapshot through mmap.
+
+    Opening is O(1): the records are a NumPy view straight over the mapped
+    file, so column scans such as total_balance() touch only the pages they
+    need. Account objects are built only when an entry is accessed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_DTYPE.itemsize:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} account snapshot")
+        self.records = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=count, offset=HEADER.size)
+        self._materialized = {}
+
+    def index_of(self, account_number):
+        """Position of an account in the snapshot, or -1 (binary search)"""
+        key = account_number.encode('utf-8')
+        numbers = self.records['account_number']
+        index = int(np.searchsorted(numbers, key))
+        if index < len(numbers) and numbers[index] == key:
+            return index
+        return -1
+
+    def get(self, account_number, default=None):
+        """Materialize an account by number"""
+        index = self.index_of(account_number)
+        return default if index < 0 else self[index]
+
+    def balances(self):
+        """All balances in currency units"""
+        return self.records['balance'] / 100
+
+    def total_balance(self):
+        """Sum of all balances without materializing any account"""
+        return int(self.records['balance'].sum()) / 100
+
+    def _materialize(self, index):
+        record = self.records[index]
+        state = {
+            'account_type': ACCOUNT_TYPE_NAMES[int(record['account_type'])],
+            'account_number': record['account_number'].decode('utf-8'),
+            'account_holder': record['account_holder'].decode('utf-8'),
+            'balance': int(record['balance']) / 100,
+            'interest_rate': float(record['interest_rate']),
+            'minimum_balance': int(record['minimum_balance']) / 100,
+            'last_interest_date': int(record['last_interest_date']),
+            'interest_day': int(record['interest_day']) or None,
+            'overdraft_limit': int(record['overdraft_limit']) / 100,
+            'currency': record['currency'].decode('utf-8') or DEFAULT_CURRENCY,
+        }
+        return account_from_state(state)
+
+    def close(self):
+        """Release the mapping; materialized accounts stay usable"""
+        self.records = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("snapshot index out of range")
+        account = self._materialized.get(index)
+        if account is None:
+            account = self._materialized[index] = self._materialize(index)
+        return account
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
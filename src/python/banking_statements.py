@@ -0,0 +1,171 @@
+"""
+Python Programming Concepts - Streaming Statement Export
+Banking Application: Monthly account statements written as CSV or JSON Lines
+"""
+
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import csv
+from datetime import datetime
+import json
+import os
+
+from .banking_ledger import TransactionLedger, TIMESTAMP_FORMAT, to_cents, to_epoch
+
+CSV = "csv"
+JSONL = "jsonl"
+FORMATS = (CSV, JSONL)
+
+# Every statement row has the same columns; ``record`` says what the row is
+CSV_COLUMNS = ("record", "account_number", "timestamp", "type", "amount", "balance")
+
+
+def _format_cents(cents):
+    sign = "-" if cents < 0 else ""
+    whole, part = divmod(abs(cents), 100)
+    return f"{sign}{whole}.{part:02d}"
+
+
+def _format_time(epoch):
+    return datetime.fromtimestamp(epoch).strftime(TIMESTAMP_FORMAT)
+
+
+def statement_data(account, start, end):
+    """Everything needed to render one statement, as compact picklable columns"""
+    with account.lock:
+        return {
+            'account_number': account.account_number,
+            'account_holder': account.account_holder,
+            'account_type': account.account_type,
+            'start': to_epoch(start),
+            'end': to_epoch(end),
+            'opening': to_cents(account.transactions.balance_before(start)),
+            'columns': account.transactions.columns_between(start, end),
+        }
+
+
+def render_statement(file, data, type_names, fmt=CSV):
+    """Stream one statement to an open text file.
+
+    Rows are written as they are formatted, one entry at a time: an opening
+    balance, every entry of the period, a total per transaction type and the
+    closing balance. Returns the number of entries written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown statement format: {fmt}")
+    number = data['account_number']
+    if fmt == CSV:
+        writer = csv.writer(file)
+        writer.writerow(CSV_COLUMNS)
+
+        def write(record, timestamp=None, transaction_type=None, amount=None, balance=None):
+            writer.writerow((record, number, timestamp or "", transaction_type or "",
+                             "" if amount is None else _format_cents(amount),
+                             "" if balance is None else _format_cents(balance)))
+    else:
+        file.write(json.dumps({'record': "statement", 'account_number': number,
+                               'account_holder': data['account_holder'],
+                               'account_type': data['account_type'],
+                               'start': _format_time(data['start']),
+                               'end': _format_time(data['end'])}) + "\n")
+
+        def write(record, timestamp=None, transaction_type=None, amount=None, balance=None):
+            row = {'record': record, 'account_number': number}
+            if timestamp is not None:
+                row['timestamp'] = timestamp
+            if transaction_type is not None:
+                row['type'] = transaction_type
+            if amount is not None:
+                row['amount'] = amount / 100
+            if balance is not None:
+                row['balance'] = balance / 100
+            file.write(json.dumps(row) + "\n")
+
+    timestamps, type_codes, amounts, balances = data['columns']
+    balance = data['opening']
+    totals = {}
+    last_epoch, last_text = None, ""
+    write("opening", _format_time(data['start']), balance=balance)
+    for epoch, code, amount, balance in zip(timestamps, type_codes, amounts, balances):
+        if epoch != last_epoch:
+            last_epoch, last_text = epoch, _format_time(epoch)
+        transaction_type = type_names[code]
+        totals[transaction_type] = totals.get(transaction_type, 0) + amount
+        write("entry", last_text, transaction_type, amount, balance)
+    for transaction_type, total in totals.items():
+        write("total", transaction_type=transaction_type, amount=total)
+    write("closing", _format_time(data['end']), balance=balance)
+    return len(amounts)
+
+
+def statement_path(directory, account_number, fmt=CSV):
+    return os.path.join(directory, f"statement-{account_number}.{fmt}")
+
+
+def write_statement(account, path, start, end, fmt=CSV):
+    """Write one account's statement for start <= time < end to ``path``"""
+    data = statement_data(account, start, end)
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        return render_statement(file, data, TransactionLedger.type_names(), fmt)
+
+
+def render_chunk(directory, chunk, type_names, fmt):
+    """Worker entry point: write a chunk of statements, one file per account"""
+    entries = 0
+    for data in chunk:
+        path = statement_path(directory, data['account_number'], fmt)
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            entries += render_statement(file, data, type_names, fmt)
+    return len(chunk), entries
+
+
+def export_statements(accounts, directory, start, end, fmt=CSV, workers=None, chunk_entries=50000):
+    """Write a statement file per account for start <= time < end, in parallel.
+
+    Accounts are grouped into chunks of about ``chunk_entries`` period
+    entries and rendered by a process pool (``workers=0`` renders
+    in-process). Only the period's raw columns are sent to the workers, and
+    at most two chunks per worker are in flight at once, so memory stays
+    bounded however many accounts are exported.
+
+    Returns a dict with the number of statements and entries written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown statement format: {fmt}")
+    os.makedirs(directory, exist_ok=True)
+    totals = {'statements': 0, 'entries': 0}
+
+    def add(result):
+        totals['statements'] += result[0]
+        totals['entries'] += result[1]
+
+    if workers == 0:
+        for chunk in _chunks(accounts, start, end, chunk_entries):
+            add(render_chunk(directory, chunk, TransactionLedger.type_names(), fmt))
+        return totals
+
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = set()
+        for chunk in _chunks(accounts, start, end, chunk_entries):
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    add(future.result())
+            # Type names travel with each chunk: workers may predate newly interned ones
+            in_flight.add(executor.submit(render_chunk, directory, chunk, TransactionLedger.type_names(), fmt))
+        for future in in_flight:
+            add(future.result())
+    return totals
+
+
+def _chunks(accounts, start, end, chunk_entries):
+    chunk, size = [], 0
+    for account in accounts:
+        data = statement_data(account, start, end)
+        chunk.append(data)
+        size += len(data['columns'][2]) + 1
+        if size >= chunk_entries:
+            yield chunk
+            chunk, size = [], 0
+    if chunk:
+        yield chunk
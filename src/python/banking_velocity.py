@@ -0,0 +1,112 @@
+"""
+Python Programming Concepts - Sliding-Window Velocity Limits
+Banking Application: Capping how often and how much an account can withdraw
+"""
+
+from array import array
+
+from .banking_ledger import to_cents
+
+
+class VelocityRule:
+    """At most ``max_count`` withdrawals and/or ``max_amount`` withdrawn per
+    rolling ``window`` seconds.
+
+    The window is tracked in ``buckets`` equal slices plus the slice in
+    progress, so a withdrawal always counts for at least ``window`` seconds
+    and leaves the window up to one slice late; more buckets make it more
+    precise at the cost of a little memory per account.
+
+    Rules are checked by ``BankAccount.withdraw()`` only; the bulk paths
+    (``apply_batch()`` and ``ShardedEngine``) do not enforce them.
+    """
+
+    __slots__ = ('window', 'max_count', 'max_amount_cents', 'buckets')
+
+    def __init__(self, window, max_count=None, max_amount=None, buckets=60):
+        if window <= 0 or buckets <= 0:
+            raise ValueError("window and buckets must be positive")
+        if max_count is None and max_amount is None:
+            raise ValueError("a velocity rule needs max_count or max_amount")
+        self.window = window
+        self.max_count = max_count
+        self.max_amount_cents = None if max_amount is None else to_cents(max_amount)
+        self.buckets = buckets
+
+    def counter(self):
+        """A fresh VelocityCounter enforcing this rule"""
+        return VelocityCounter(self)
+
+    def __repr__(self):
+        return (f"VelocityRule(window={self.window}, max_count={self.max_count}, "
+                f"max_amount_cents={self.max_amount_cents}, buckets={self.buckets})")
+
+
+class VelocityCounter:
+    """Ring of per-bucket withdrawal counts and amounts for one account.
+
+    The ring has ``rule.buckets + 1`` slots: the current, partly elapsed
+    bucket and the ``rule.buckets`` full ones before it. Running totals
+    cover all of them. Each check first clears the buckets that slid out
+    since the previous call, which is at most ``rule.buckets + 1`` slots
+    however long the account history is.
+    """
+
+    __slots__ = ('rule', '_width', '_slots', '_counts', '_amounts', '_head', '_count', '_amount')
+
+    def __init__(self, rule):
+        self.rule = rule
+        self._width = rule.window / rule.buckets
+        self._slots = rule.buckets + 1
+        self._counts = array('q', bytes(8 * self._slots))
+        self._amounts = array('q', bytes(8 * self._slots))
+        self._head = None
+        self._count = 0
+        self._amount = 0
+
+    def _advance(self, now):
+        """Expire buckets that left the window; returns the current bucket slot"""
+        index = int(now // self._width)
+        slots = self._slots
+        head = self._head
+        if head is None or index - head >= slots:
+            if self._count:
+                self._counts = array('q', bytes(8 * slots))
+                self._amounts = array('q', bytes(8 * slots))
+                self._count = self._amount = 0
+            self._head = index
+        elif index > head:
+            counts, amounts = self._counts, self._amounts
+            for expired in range(head + 1, index + 1):
+                slot = expired % slots
+                self._count -= counts[slot]
+                self._amount -= amounts[slot]
+                counts[slot] = amounts[slot] = 0
+            self._head = index
+        return self._head % slots
+
+    def allows(self, cents, now):
+        """Whether one more withdrawal of ``cents`` fits in the window"""
+        self._advance(now)
+        rule = self.rule
+        if rule.max_count is not None and self._count + 1 > rule.max_count:
+            return False
+        if rule.max_amount_cents is not None and self._amount + cents > rule.max_amount_cents:
+            return False
+        return True
+
+    def record(self, cents, now):
+        """Count a withdrawal that went through"""
+        slot = self._advance(now)
+        self._counts[slot] += 1
+        self._amounts[slot] += cents
+        self._count += 1
+        self._amount += cents
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def amount_cents(self):
+        return self._amount
@@ -87,28 +87,30 @@ def run_interactive_banking():
     print("🏦 INTERACTIVE BANKING SIMULATION")
     print("="*60)
     
+    previous_sink = None
     try:
-        from .python_oop_banking import BankAccount, SavingsAccount, CheckingAccount
+        from .python_oop_banking import BankAccount, SavingsAccount, CheckingAccount, set_event_sink
+        from .banking_account_book import AccountBook
+        from .banking_events import ConsoleSink
+        
+        previous_sink = set_event_sink(ConsoleSink())
         
         print("Welcome to Interactive Banking Simulation!")
         print("Let's create some accounts and perform transactions.\n")
         
         # Create sample accounts
-        accounts = []
+        accounts = AccountBook()
         
         # Create a basic account
-        basic_account = BankAccount("BA001", "Demo User", 1000.0)
-        accounts.append(basic_account)
+        basic_account = accounts.add(BankAccount("BA001", "Demo User", 1000.0))
         print(f"✅ Created: {basic_account}")
         
         # Create a savings account
-        savings_account = SavingsAccount("SA001", "Demo Saver", 5000.0, 0.03, 500.0)
-        accounts.append(savings_account)
+        savings_account = accounts.add(SavingsAccount("SA001", "Demo Saver", 5000.0, 0.03, 500.0))
         print(f"✅ Created: {savings_account}")
         
         # Create a checking account
-        checking_account = CheckingAccount("CA001", "Demo Checker", 2000.0, 1000.0)
-        accounts.append(checking_account)
+        checking_account = accounts.add(CheckingAccount("CA001", "Demo Checker", 2000.0, 1000.0))
         print(f"✅ Created: {checking_account}")
         
         print("\n🎮 Interactive Menu:")
@@ -125,41 +127,41 @@ def run_interactive_banking():
             choice = input("\nEnter choice (1-6): ").strip()
             
             if choice == "1":
-                account_choice = get_account_choice(accounts)
-                if account_choice is not None:
+                account = get_account_choice(accounts)
+                if account is not None:
                     amount = get_amount("deposit")
                     if amount > 0:
-                        accounts[account_choice].deposit(amount)
+                        account.deposit(amount)
             
             elif choice == "2":
-                account_choice = get_account_choice(accounts)
-                if account_choice is not None:
+                account = get_account_choice(accounts)
+                if account is not None:
                     amount = get_amount("withdraw")
                     if amount > 0:
-                        accounts[account_choice].withdraw(amount)
+                        account.withdraw(amount)
             
             elif choice == "3":
-                account_choice = get_account_choice(accounts)
-                if account_choice is not None:
-                    info = accounts[account_choice].get_account_info()
+                account = get_account_choice(accounts)
+                if account is not None:
+                    info = account.get_account_info()
                     print(f"\n📊 Account Information:")
                     for key, value in info.items():
                         print(f"   {key.replace('_', ' ').title()}: {value}")
             
             elif choice == "4":
-                savings_accounts = [i for i, acc in enumerate(accounts) if isinstance(acc, SavingsAccount)]
+                savings_accounts = list(accounts.iter_by_type("Savings"))
                 if savings_accounts:
                     print(f"\n💰 Calculating interest for savings account...")
-                    savings_account.calculate_interest()
+                    for savings_account in savings_accounts:
+                        savings_account.calculate_interest()
                 else:
                     print("❌ No savings accounts available for interest calculation.")
             
             elif choice == "5":
-                account_choice = get_account_choice(accounts)
-                if account_choice is not None:
-                    transactions = accounts[account_choice].get_transaction_history()
+                account = get_account_choice(accounts)
+                if account is not None:
                     print(f"\n📜 Transaction History:")
-                    for i, transaction in enumerate(transactions[-5:], 1):  # Show last 5
+                    for i, transaction in enumerate(account.get_recent_transactions(5), 1):
                         print(f"   {i}. {transaction['timestamp']}: {transaction['type']} ${transaction['amount']:.2f}")
             
             elif choice == "6":
@@ -170,22 +172,30 @@ def run_interactive_banking():
     
     except Exception as e:
         print(f"❌ Error in interactive banking: {e}")
+    finally:
+        if previous_sink is not None:
+            set_event_sink(previous_sink)
 
 def get_account_choice(accounts):
-    """Get user's account choice"""
+    """Get user's account choice from an AccountBook (by list position or account number)"""
+    listed = list(accounts)
     print(f"\nSelect an account:")
-    for i, account in enumerate(accounts):
+    for i, account in enumerate(listed):
         print(f"   {i+1}. {account}")
     
     while True:
+        choice = input("Enter account (1-{} or account number): ".format(len(listed))).strip()
+        account = accounts.get(choice)
+        if account is not None:
+            return account
         try:
-            choice = int(input("Enter account number (1-{}): ".format(len(accounts))))
-            if 1 <= choice <= len(accounts):
-                return choice - 1
+            position = int(choice)
+            if 1 <= position <= len(listed):
+                return listed[position - 1]
             else:
                 print("❌ Invalid choice!")
         except ValueError:
-            print("❌ Please enter a valid number!")
+            print("❌ Please enter a valid number or account number!")
 
 def get_amount(action):
     """Get amount from user"""
@@ -3,54 +3,191 @@ Python Programming Concepts - Object-Oriented Programming
 Banking Application: BankAccount and SavingsAccount Classes
 """
 
+from array import array
 from datetime import datetime
 import json
+import threading
+import time
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script (python src/python/python_oop_banking.py): the relative
+    # imports below need the package, so run the demo from there instead
+    import os
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+    from src.python.python_oop_banking import demonstrate_oop_concepts
+    demonstrate_oop_concepts()
+    sys.exit()
+
+from .banking_idempotency import IdempotencyIndex
+from .banking_ledger import TransactionLedger, to_epoch
+from .banking_money import DEFAULT_CURRENCY, Money
+from .banking_events import (ConsoleSink, NullSink, INVALID_AMOUNT, INSUFFICIENT_FUNDS,
+                             MINIMUM_BALANCE, OVERDRAFT_EXCEEDED, VELOCITY_LIMIT)
+
+# Guards lazy allocation of per-account ledgers and locks
+_ALLOCATION_LOCK = threading.Lock()
+
 
 class BankAccount:
     """Base class for bank accounts with basic deposit and withdraw functionality"""
     
-    def __init__(self, account_number, account_holder, initial_balance=0.0):
+    # Fixed per-instance fields keep accounts small: no __dict__, money in
+    # integer cents and dates as epoch timestamps
+    __slots__ = ('account_number', 'account_holder', 'currency', '_balance_cents', '_ledger',
+                 '_created_ts', '_lock', '_velocity')
+    
+    account_type = "Basic"
+    
+    # Where account events go; printing is opt-in via set_event_sink(ConsoleSink())
+    event_sink = NullSink()
+    
+    # Default VelocityRules for accounts of this class; see set_velocity_rules()
+    velocity_rules = ()
+    
+    # Results of operations submitted with an idempotency key, shared by all accounts
+    idempotency_index = IdempotencyIndex()
+    
+    def __init__(self, account_number, account_holder, initial_balance=0.0, currency=DEFAULT_CURRENCY):
+        initial_balance = Money.of(initial_balance)
         self.account_number = account_number
         self.account_holder = account_holder
-        self.balance = initial_balance
-        self.transactions = []
-        self.account_type = "Basic"
-        self.created_date = datetime.now()
+        self.currency = currency
+        self._balance_cents = initial_balance.cents
+        self._ledger = None
+        self._created_ts = time.time()
+        self._lock = None
+        self._velocity = None
         
         # Add initial transaction if there's an initial balance
-        if initial_balance > 0:
+        if initial_balance.cents > 0:
             self._add_transaction("Initial Deposit", initial_balance)
     
-    def deposit(self, amount):
-        """Deposit money into the account"""
-        if amount <= 0:
-            print("Error: Deposit amount must be positive.")
+    @property
+    def balance(self):
+        """Current balance as Money"""
+        return Money(self._balance_cents)
+    
+    @balance.setter
+    def balance(self, value):
+        self._balance_cents = Money.of(value).cents
+    
+    @property
+    def created_date(self):
+        return datetime.fromtimestamp(self._created_ts)
+    
+    @property
+    def transactions(self):
+        """Transaction ledger, allocated on first use"""
+        ledger = self._ledger
+        if ledger is None:
+            with _ALLOCATION_LOCK:
+                if self._ledger is None:
+                    self._ledger = TransactionLedger()
+                ledger = self._ledger
+        return ledger
+    
+    @property
+    def lock(self):
+        """Per-account re-entrant lock, allocated on first use"""
+        lock = self._lock
+        if lock is None:
+            with _ALLOCATION_LOCK:
+                if self._lock is None:
+                    self._lock = threading.RLock()
+                lock = self._lock
+        return lock
+    
+    def deposit(self, amount, idempotency_key=None):
+        """Deposit money into the account; a repeated idempotency key replays the first result"""
+        if idempotency_key is not None:
+            return self._apply_once("deposit", amount, idempotency_key, self.deposit)
+        started = time.perf_counter() if self.event_sink.enabled else None
+        amount = Money.of(amount)
+        if amount.cents <= 0:
+            self._emit("deposit", amount, reason=INVALID_AMOUNT, started=started)
             return False
         
-        self.balance += amount
-        self._add_transaction("Deposit", amount)
-        print(f"Deposited ${amount:.2f}. New balance: ${self.balance:.2f}")
+        with self.lock:
+            self._balance_cents += amount.cents
+            self._add_transaction("Deposit", amount)
+            self._emit("deposit", amount, started=started)
         return True
     
-    def withdraw(self, amount):
-        """Withdraw money from the account"""
-        if amount <= 0:
-            print("Error: Withdrawal amount must be positive.")
-            return False
-        
-        if amount > self.balance:
-            print(f"Error: Insufficient funds. Available balance: ${self.balance:.2f}")
+    def withdraw(self, amount, idempotency_key=None):
+        """Withdraw money from the account; a repeated idempotency key replays the first result"""
+        if idempotency_key is not None:
+            return self._apply_once("withdraw", amount, idempotency_key, self.withdraw)
+        started = time.perf_counter() if self.event_sink.enabled else None
+        amount = Money.of(amount)
+        if amount.cents <= 0:
+            self._emit("withdraw", amount, reason=INVALID_AMOUNT, started=started)
             return False
         
-        self.balance -= amount
-        self._add_transaction("Withdrawal", -amount)
-        print(f"Withdrew ${amount:.2f}. New balance: ${self.balance:.2f}")
+        with self.lock:
+            reason = self._check_withdrawal(amount)
+            if reason is None:
+                reason = self._check_velocity(amount)
+            if reason is not None:
+                self._emit("withdraw", amount, reason=reason, started=started)
+                return False
+            
+            self._balance_cents -= amount.cents
+            self._add_transaction("Withdrawal", -amount)
+            self._emit("withdraw", amount, started=started)
         return True
     
+    def _apply_once(self, operation, amount, key, apply):
+        """Run ``apply(amount)`` once per idempotency key and return the recorded result on retries"""
+        amount = Money.of(amount)
+        index = self.idempotency_index
+        scoped_key = (self.account_number, key)
+        with self.lock:
+            recorded = index.get(scoped_key)
+            if recorded is not None:
+                if recorded[:2] != (operation, amount.cents):
+                    raise ValueError(f"Idempotency key {key!r} was already used for a different operation")
+                return recorded[2]
+            result = apply(amount)
+            index.put(scoped_key, (operation, amount.cents, result))
+        return result
+    
+    def _check_withdrawal(self, amount):
+        """Return the reason a withdrawal must be rejected, or None if allowed"""
+        if amount.cents > self._balance_cents:
+            return INSUFFICIENT_FUNDS
+        return None
+    
+    def _check_velocity(self, amount):
+        """Count the withdrawal against every velocity rule, or return VELOCITY_LIMIT"""
+        counters = self._velocity
+        if counters is None:
+            if not self.velocity_rules:
+                return None
+            counters = self._velocity = tuple(rule.counter() for rule in self.velocity_rules)
+        if not counters:
+            return None
+        now = time.time()
+        for counter in counters:
+            if not counter.allows(amount.cents, now):
+                return VELOCITY_LIMIT
+        for counter in counters:
+            counter.record(amount.cents, now)
+        return None
+    
+    def set_velocity_rules(self, *rules):
+        """Replace this account's velocity rules; no rules disables the limits"""
+        with self.lock:
+            self._velocity = tuple(rule.counter() for rule in rules)
+    
     def get_balance(self):
         """Get current account balance"""
         return self.balance
     
+    def get_withdrawal_floor(self):
+        """Lowest balance a withdrawal may leave behind"""
+        return Money(0)
+    
     def get_account_info(self):
         """Get account information"""
         return {
@@ -58,23 +195,80 @@ class BankAccount:
             'account_holder': self.account_holder,
             'account_type': self.account_type,
             'balance': self.balance,
+            'currency': self.currency,
             'created_date': self.created_date.strftime("%Y-%m-%d %H:%M:%S"),
             'transaction_count': len(self.transactions)
         }
     
     def get_transaction_history(self):
         """Get transaction history"""
-        return self.transactions.copy()
+        return self.transactions.to_list()
+    
+    def last_activity(self):
+        """Epoch seconds of the newest transaction, or of account creation"""
+        if self._ledger is not None and len(self._ledger):
+            return self._ledger.last_timestamp()
+        return self._created_ts
+    
+    def get_recent_transactions(self, count=5):
+        """The last ``count`` transactions, without copying the whole history"""
+        return self.transactions.last(count)
+    
+    def history_cursor(self, position=None, page_size=20):
+        """Cursor for paging through history; starts after the newest entry"""
+        return self.transactions.cursor(position, page_size)
+    
+    def balance_at(self, moment):
+        """Balance as of a datetime or epoch timestamp, from the ledger"""
+        return self.transactions.balance_at(moment)
+    
+    def sum_by_type(self, start, end):
+        """Totals per transaction type for start <= time < end"""
+        return self.transactions.sum_by_type(start, end)
+    
+    def transactions_between(self, start, end):
+        """Transactions with start <= time < end"""
+        return self.transactions.transactions_between(start, end)
     
     def _add_transaction(self, transaction_type, amount):
         """Add a transaction to the history"""
-        transaction = {
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'type': transaction_type,
+        self.transactions.append(transaction_type, amount, Money(self._balance_cents))
+    
+    def _emit(self, event, amount, reason=None, started=None):
+        """Send an operation event to the configured sink.
+
+        ``started`` is the time.perf_counter() reading taken when the operation
+        began; when given, the event carries the operation's latency.
+        """
+        sink = self.event_sink
+        if not sink.enabled:
+            return
+        record = {
+            'event': event,
+            'account_number': self.account_number,
+            'account_type': self.account_type,
             'amount': amount,
-            'balance_after': self.balance
+            'balance': self.balance,
+            'accepted': reason is None,
+            'reason': reason
         }
-        self.transactions.append(transaction)
+        if reason is not None and reason not in (INVALID_AMOUNT, VELOCITY_LIMIT):
+            record['floor'] = self.get_withdrawal_floor()
+        if started is not None:
+            record['latency'] = time.perf_counter() - started
+        sink.emit(record)
+    
+    def __getstate__(self):
+        # Locks cannot be pickled; each copy gets a fresh one
+        return {name: getattr(self, name)
+                for cls in type(self).__mro__ for name in getattr(cls, '__slots__', ())
+                if name != '_lock'}
+    
+    def __setstate__(self, state):
+        state.setdefault('currency', DEFAULT_CURRENCY)
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._lock = None
     
     def __str__(self):
         return f"Account {self.account_number} - {self.account_holder} (${self.balance:.2f})"
@@ -86,42 +280,81 @@ class BankAccount:
 class SavingsAccount(BankAccount):
     """Savings account with interest calculation and minimum balance requirements"""
     
-    def __init__(self, account_number, account_holder, initial_balance=0.0, interest_rate=0.02, minimum_balance=100.0):
-        super().__init__(account_number, account_holder, initial_balance)
-        self.account_type = "Savings"
+    __slots__ = ('interest_rate', '_minimum_balance_cents', '_last_interest_ts', '_interest_day')
+    
+    account_type = "Savings"
+    
+    def __init__(self, account_number, account_holder, initial_balance=0.0, interest_rate=0.02, minimum_balance=100.0,
+                 currency=DEFAULT_CURRENCY):
+        super().__init__(account_number, account_holder, initial_balance, currency)
         self.interest_rate = interest_rate
         self.minimum_balance = minimum_balance
         self.last_interest_date = datetime.now()
     
-    def withdraw(self, amount):
-        """Override withdraw to check minimum balance requirement"""
-        if amount <= 0:
-            print("Error: Withdrawal amount must be positive.")
-            return False
-        
-        if amount > self.balance:
-            print(f"Error: Insufficient funds. Available balance: ${self.balance:.2f}")
-            return False
+    @property
+    def minimum_balance(self):
+        return Money(self._minimum_balance_cents)
+    
+    @minimum_balance.setter
+    def minimum_balance(self, value):
+        self._minimum_balance_cents = Money.of(value).cents
+    
+    @property
+    def last_interest_date(self):
+        return datetime.fromtimestamp(self._last_interest_ts)
+    
+    @last_interest_date.setter
+    def last_interest_date(self, value):
+        """Set the date and anchor monthly interest to its day of the month"""
+        self._last_interest_ts = value.timestamp()
+        self._interest_day = value.day
+    
+    @property
+    def interest_day(self):
+        """Day of the month monthly interest falls due, clamped in shorter months"""
+        return self._interest_day
+    
+    @interest_day.setter
+    def interest_day(self, value):
+        if not 1 <= value <= 31:
+            raise ValueError(f"interest day must be between 1 and 31: {value}")
+        self._interest_day = value
+    
+    def advance_interest_date(self, moment):
+        """Move the last interest date without changing the interest day"""
+        self._last_interest_ts = to_epoch(moment)
+    
+    def _check_withdrawal(self, amount):
+        """Override withdrawal check to enforce the minimum balance requirement"""
+        reason = super()._check_withdrawal(amount)
+        if reason is not None:
+            return reason
         
         # Check if withdrawal would violate minimum balance
-        if (self.balance - amount) < self.minimum_balance:
-            print(f"Error: Withdrawal would violate minimum balance requirement of ${self.minimum_balance:.2f}")
-            return False
-        
-        self.balance -= amount
-        self._add_transaction("Withdrawal", -amount)
-        print(f"Withdrew ${amount:.2f}. New balance: ${self.balance:.2f}")
-        return True
+        if (self._balance_cents - amount.cents) < self._minimum_balance_cents:
+            return MINIMUM_BALANCE
+        return None
+    
+    def get_withdrawal_floor(self):
+        """Withdrawals may not go below zero or the minimum balance"""
+        return Money(max(0, self._minimum_balance_cents))
     
     def calculate_interest(self):
         """Calculate and add interest to the account"""
         # Simple interest calculation (in real banking, this would be more complex)
-        interest_amount = self.balance * self.interest_rate
-        self.balance += interest_amount
-        self._add_transaction("Interest", interest_amount)
-        self.last_interest_date = datetime.now()
-        print(f"Interest of ${interest_amount:.2f} added. New balance: ${self.balance:.2f}")
-        return interest_amount
+        with self.lock:
+            return self.post_interest(self.balance * self.interest_rate)
+    
+    def post_interest(self, amount, as_of=None):
+        """Credit interest computed elsewhere and move the last interest date to ``as_of``"""
+        started = time.perf_counter() if self.event_sink.enabled else None
+        amount = Money.of(amount)
+        with self.lock:
+            self._balance_cents += amount.cents
+            self._add_transaction("Interest", amount)
+            self._last_interest_ts = time.time() if as_of is None else to_epoch(as_of)
+            self._emit("interest", amount, started=started)
+        return amount
     
     def get_interest_info(self):
         """Get interest-related information"""
@@ -132,6 +365,11 @@ class SavingsAccount(BankAccount):
             'projected_annual_interest': self.balance * self.interest_rate
         }
     
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        if 'interest_day' not in state and '_interest_day' not in state:
+            self._interest_day = self.last_interest_date.day
+    
     def __str__(self):
         return f"Savings Account {self.account_number} - {self.account_holder} (${self.balance:.2f}) [Rate: {self.interest_rate:.1%}]"
 
@@ -139,30 +377,32 @@ class SavingsAccount(BankAccount):
 class CheckingAccount(BankAccount):
     """Checking account with overdraft protection"""
     
-    def __init__(self, account_number, account_holder, initial_balance=0.0, overdraft_limit=500.0):
-        super().__init__(account_number, account_holder, initial_balance)
-        self.account_type = "Checking"
+    __slots__ = ('_overdraft_limit_cents',)
+    
+    account_type = "Checking"
+    
+    def __init__(self, account_number, account_holder, initial_balance=0.0, overdraft_limit=500.0,
+                 currency=DEFAULT_CURRENCY):
+        super().__init__(account_number, account_holder, initial_balance, currency)
         self.overdraft_limit = overdraft_limit
     
-    def withdraw(self, amount):
-        """Override withdraw to allow overdraft up to limit"""
-        if amount <= 0:
-            print("Error: Withdrawal amount must be positive.")
-            return False
-        
-        if amount > (self.balance + self.overdraft_limit):
-            print(f"Error: Withdrawal exceeds available funds and overdraft limit.")
-            print(f"Available: ${self.balance:.2f}, Overdraft limit: ${self.overdraft_limit:.2f}")
-            return False
-        
-        self.balance -= amount
-        self._add_transaction("Withdrawal", -amount)
-        
-        if self.balance < 0:
-            print(f"Withdrew ${amount:.2f}. New balance: ${self.balance:.2f} (Overdraft: ${abs(self.balance):.2f})")
-        else:
-            print(f"Withdrew ${amount:.2f}. New balance: ${self.balance:.2f}")
-        return True
+    @property
+    def overdraft_limit(self):
+        return Money(self._overdraft_limit_cents)
+    
+    @overdraft_limit.setter
+    def overdraft_limit(self, value):
+        self._overdraft_limit_cents = Money.of(value).cents
+    
+    def _check_withdrawal(self, amount):
+        """Override withdrawal check to allow overdraft up to limit"""
+        if amount.cents > (self._balance_cents + self._overdraft_limit_cents):
+            return OVERDRAFT_EXCEEDED
+        return None
+    
+    def get_withdrawal_floor(self):
+        """Withdrawals may overdraw the account up to the overdraft limit"""
+        return -self.overdraft_limit
     
     def get_overdraft_info(self):
         """Get overdraft information"""
@@ -173,8 +413,107 @@ class CheckingAccount(BankAccount):
         }
 
 
+def _lock_order(account):
+    """Global lock acquisition order: by account number, then identity"""
+    return (account.account_number, id(account))
+
+
+def transfer(source, destination, amount, idempotency_key=None):
+    """Atomically move money between two accounts.
+
+    Both account locks are taken in a fixed global order, so concurrent
+    transfers in opposite directions cannot deadlock. The source account's
+    own withdrawal rules (minimum balance, overdraft limit) apply. With an
+    idempotency key, a retried transfer returns the first result instead of
+    moving the money again. Both accounts must hold the same currency.
+    """
+    if source is destination:
+        return False
+    if source.currency != destination.currency:
+        raise ValueError(f"Cannot transfer from a {source.currency} account to a {destination.currency} account")
+    first, second = sorted((source, destination), key=_lock_order)
+    with first.lock, second.lock:
+        if idempotency_key is not None:
+            return source._apply_once(f"transfer:{destination.account_number}", amount, idempotency_key,
+                                      lambda amount: transfer(source, destination, amount))
+        # Journal both halves as one record, so a crash cannot keep only the debit
+        with source.event_sink.atomic():
+            if not source.withdraw(amount):
+                return False
+            destination.deposit(amount)
+    return True
+
+
+def interest_columns(accounts):
+    """Balance cents, rates, last interest epochs and interest days of savings accounts.
+
+    Read straight from the slots into typed arrays in one pass each.
+    """
+    return (array('q', [a._balance_cents for a in accounts]),
+            array('d', [a.interest_rate for a in accounts]),
+            array('d', [a._last_interest_ts for a in accounts]),
+            array('q', [a._interest_day for a in accounts]))
+
+
+def post_interest_batch(accounts, interest_cents, interest_dates, timestamp=None):
+    """Credit precomputed interest and move last interest dates (epoch seconds).
+
+    Each account is updated under its own lock and the interest is added to
+    its current balance, so operations that ran since the amounts were
+    computed are kept. Events go to the sink as with post_interest().
+    """
+    interest_code = TransactionLedger.type_code("Interest")
+    timestamp = time.time() if timestamp is None else timestamp
+    for account, cents, moment in zip(accounts, interest_cents, interest_dates):
+        with account.lock:
+            if cents:
+                account._balance_cents += cents
+                account.transactions.append_cents(interest_code, cents, account._balance_cents, timestamp)
+                account._emit("interest", Money(cents))
+            account._last_interest_ts = moment
+
+
+def charge_fee_batch(accounts, fee_cents, timestamp=None):
+    """Charge precomputed fees, yielding whether each account was charged.
+
+    Each fee is checked against the account's own withdrawal rules and
+    applied under its lock, as withdraw() would, but without the per-call
+    amount parsing, idempotency and velocity bookkeeping: velocity limits
+    cap customer withdrawals, not the bank's own charges. Fees are applied
+    as the generator is consumed, so a caller can record each result as it
+    happens. Events go to the sink as with withdraw().
+    """
+    withdrawal_code = TransactionLedger.type_code("Withdrawal")
+    timestamp = time.time() if timestamp is None else timestamp
+    for account, cents in zip(accounts, fee_cents):
+        amount = Money(cents)
+        with account.lock:
+            reason = account._check_withdrawal(amount)
+            if reason is None:
+                account._balance_cents -= cents
+                account.transactions.append_cents(withdrawal_code, -cents, account._balance_cents, timestamp)
+            account._emit("withdraw", amount, reason=reason)
+        yield reason is None
+
+
+def set_event_sink(sink):
+    """Route events from every account to ``sink`` and return the previous sink"""
+    previous = BankAccount.event_sink
+    BankAccount.event_sink = sink
+    return previous
+
+
 def demonstrate_oop_concepts():
     """Demonstrate OOP concepts with banking examples"""
+    previous_sink = set_event_sink(ConsoleSink())
+    try:
+        _show_oop_concepts()
+    finally:
+        set_event_sink(previous_sink)
+
+
+def _show_oop_concepts():
+    """Walk through the banking examples, printing each operation"""
     
     print("=" * 60)
     print("🐍 PYTHON OOP CONCEPTS DEMONSTRATION")
@@ -241,8 +580,7 @@ def demonstrate_oop_concepts():
     
     for account in accounts:
         print(f"\n{account.account_holder}'s Transaction History:")
-        transactions = account.get_transaction_history()
-        for transaction in transactions[-3:]:  # Show last 3 transactions
+        for transaction in account.get_recent_transactions(3):
             print(f"  {transaction['timestamp']}: {transaction['type']} ${transaction['amount']:.2f} (Balance: ${transaction['balance_after']:.2f})")
     
     print("\n9. Polymorphism Example - Account Processing:")
@@ -0,0 +1,38 @@
+import pytest
+
+from ..banking_account_book import AccountBook
+from ..python_oop_banking import BankAccount, CheckingAccount, SavingsAccount
+
+
+@pytest.fixture
+def book():
+    return AccountBook([
+        BankAccount("BA001", "Ann Lee", 100.0),
+        SavingsAccount("SA001", "Ann Lee", 1000.0),
+        CheckingAccount("CA001", "Bo Chan", 50.0),
+        SavingsAccount("SA002", "Bo Chan", 2000.0),
+    ])
+
+
+def test_lookup_by_number_holder_and_type(book):
+    assert book["SA002"].account_holder == "Bo Chan"
+    assert "CA001" in book and "XX999" not in book
+    assert [a.account_number for a in book.find_by_holder("Ann Lee")] == ["BA001", "SA001"]
+    assert [a.account_number for a in book.iter_by_type("Savings")] == ["SA001", "SA002"]
+    assert book.count_by_type("Checking") == 1
+
+
+def test_close_updates_all_indexes(book):
+    closed = book.close("CA001")
+
+    assert closed.account_number == "CA001"
+    assert len(book) == 3
+    assert book.get("CA001") is None
+    assert [a.account_number for a in book.find_by_holder("Bo Chan")] == ["SA002"]
+    assert list(book.iter_by_type("Checking")) == []
+    assert "Checking" not in book.account_types()
+
+
+def test_duplicate_account_numbers_are_rejected(book):
+    with pytest.raises(ValueError):
+        book.add(BankAccount("BA001", "Someone Else"))
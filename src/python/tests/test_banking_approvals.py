@@ -0,0 +1,60 @@
+from datetime import datetime
+import sqlite3
+
+import pytest
+
+from ..banking_approvals import APPROVED, PENDING, REJECTED_AMOUNT, REJECTED_BALANCE, approve_pending, evaluate_orders
+
+SCHEMA = """
+CREATE TABLE Accounts (account_id INTEGER PRIMARY KEY, customer_id INT NOT NULL,
+                       balance DECIMAL(15,2) DEFAULT 0.00, is_active BOOLEAN DEFAULT TRUE);
+CREATE TABLE Orders (order_id INTEGER PRIMARY KEY, customer_id INT NOT NULL, order_type VARCHAR(20) NOT NULL,
+                     amount DECIMAL(15,2) NOT NULL, status VARCHAR(20) DEFAULT 'PENDING',
+                     approved_date TIMESTAMP NULL);
+"""
+
+
+@pytest.fixture
+def connection():
+    connection = sqlite3.connect(":memory:")
+    connection.executescript(SCHEMA)
+    connection.executemany("INSERT INTO Accounts (customer_id, balance, is_active) VALUES (?, ?, ?)", [
+        (1, 2500.00, 1), (1, 5000.00, 1), (3, 3500.00, 1), (8, 600.00, 1), (8, 9000.00, 0),
+    ])
+    connection.executemany("INSERT INTO Orders (customer_id, order_type, amount, status) VALUES (?, ?, ?, ?)", [
+        (1, 'LOAN', 15000.00, 'APPROVED'),
+        (3, 'MORTGAGE', 300000.00, 'PENDING'),
+        (8, 'LOAN', 3000.00, 'PENDING'),
+        (8, 'LOAN', 9000.00, 'PENDING'),
+        (1, 'LOAN', 75000.00, 'PENDING'),
+        (1, 'SAFE_DEPOSIT', 100.00, 'PENDING'),
+        (2, 'CREDIT_CARD', 500.00, 'PENDING'),
+    ])
+    yield connection
+    connection.close()
+
+
+def test_rules_reject_over_limit_and_underfunded_orders():
+    decisions = evaluate_orders(['LOAN', 'LOAN', 'LOAN', 'SAFE_DEPOSIT'],
+                                [100_000, 6_000_000, 100_000, 100], [10_000, 10_000_000, 9_999, 0])
+
+    assert decisions.tolist() == [APPROVED, REJECTED_AMOUNT, REJECTED_BALANCE, PENDING]
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_pending_backlog_is_decided_and_written_back(connection, workers):
+    approved_at = datetime(2024, 3, 1, 9, 0)
+
+    totals = approve_pending(connection, chunk_size=2, workers=workers, approved_at=approved_at)
+
+    statuses = dict(connection.execute("SELECT order_id, status FROM Orders"))
+    # Customer 8's inactive account does not count towards the balance check
+    assert statuses == {1: 'APPROVED', 2: 'APPROVED', 3: 'APPROVED', 4: 'REJECTED',
+                        5: 'REJECTED', 6: 'PENDING', 7: 'REJECTED'}
+    assert totals == {'orders': 6, 'updated': 5, 'approved': 2, 'amount_limit': 1,
+                      'insufficient_balance': 2, 'manual_review': 1}
+    stamps = dict(connection.execute("SELECT order_id, approved_date FROM Orders WHERE order_id > 1"))
+    assert stamps == {2: '2024-03-01 09:00:00', 3: '2024-03-01 09:00:00', 4: None, 5: None, 6: None, 7: None}
+
+    rerun = approve_pending(connection, workers=0)
+    assert rerun['orders'] == 1 and rerun['updated'] == 0
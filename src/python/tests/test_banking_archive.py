@@ -0,0 +1,110 @@
+import pickle
+import threading
+
+from ..banking_archive import LedgerArchive
+from ..banking_ledger import TransactionLedger
+
+
+def _pair(count=1000):
+    """The same history in a plain ledger and in one with most of it archived"""
+    plain, tiered = TransactionLedger(), TransactionLedger()
+    balance = 0
+    for i in range(count):
+        kind, amount = ("Deposit", 7.5) if i % 3 else ("Withdrawal", -2.25)
+        balance += amount
+        for ledger in (plain, tiered):
+            ledger.append(kind, amount, balance, timestamp=1_000_000 + i // 4)
+    assert tiered.archive(keep_recent=100, block_size=128) == 896
+    return plain, tiered
+
+
+def test_archived_ledger_answers_like_the_plain_one():
+    plain, tiered = _pair()
+
+    assert tiered.archived_count() == 896 and len(tiered) == 1000
+    assert tiered.to_list() == plain.to_list()
+    assert list(tiered) == list(plain)
+    assert tiered[130:140] == plain[130:140] and tiered[-3] == plain[-3]
+    for moment in (999_999, 1_000_000, 1_000_031.5, 1_000_032, 1_000_224, 1_000_249, 1_000_250):
+        assert tiered.position_at(moment) == plain.position_at(moment)
+        assert tiered.balance_at(moment) == plain.balance_at(moment)
+        assert tiered.balance_before(moment) == plain.balance_before(moment)
+    for start, end in ((1_000_000, 1_000_300), (1_000_010, 1_000_100), (1_000_200, 1_000_240)):
+        assert tiered.sum_by_type(start, end) == plain.sum_by_type(start, end)
+        assert tiered.transactions_between(start, end) == plain.transactions_between(start, end)
+        assert tiered.columns_between(start, end) == plain.columns_between(start, end)
+
+
+def test_hot_limit_archives_automatically_and_survives_pickling():
+    policy = TransactionLedger.hot_limit, TransactionLedger.block_size
+    TransactionLedger.hot_limit, TransactionLedger.block_size = 50, 64
+    try:
+        ledger = TransactionLedger()
+        for i in range(300):
+            ledger.append("Deposit", 1, i + 1, timestamp=i)
+    finally:
+        TransactionLedger.hot_limit, TransactionLedger.block_size = policy
+
+    assert ledger.archived_count() == 192
+    copy = pickle.loads(pickle.dumps(ledger))
+    assert copy.to_list() == ledger.to_list()
+    assert copy.last_timestamp() == 299
+
+
+def test_concurrent_readers_share_the_decoded_block_cache():
+    plain, tiered = _pair()
+    expected = plain.to_list()
+    errors = []
+
+    def read(offset):
+        try:
+            for i in range(offset, offset + 896, 37):
+                assert tiered[i % 896] == expected[i % 896]
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read, args=(offset,)) for offset in range(0, 800, 100)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(tiered._archive._cache) <= 4
+
+
+
+class _PausingArchive(LedgerArchive):
+    """Pauses inside archive(), after a block is sealed but before the hot columns shrink"""
+
+    __slots__ = ('sealed', 'resume')
+
+    def seal(self, *columns):
+        block = super().seal(*columns)
+        self.sealed.set()
+        self.resume.wait(0.1)
+        return block
+
+
+def test_readers_never_see_a_half_finished_archive_pass():
+    ledger = TransactionLedger()
+    deposit = TransactionLedger.type_code("Deposit")
+    for i in range(200):
+        ledger.append_cents(deposit, 1, i + 1, timestamp=1_000_000 + i)
+    archive = ledger._archive = _PausingArchive()
+    archive.sealed, archive.resume = threading.Event(), threading.Event()
+    seen = []
+
+    def read():
+        archive.sealed.wait(5)
+        seen.append((len(ledger), [entry['balance_after'] for entry in ledger.to_list()]))
+        archive.resume.set()
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    ledger.archive(keep_recent=8, block_size=64)
+    reader.join()
+
+    length, balances = seen[0]
+    assert length == 200
+    assert balances == [b / 100 for b in range(1, 201)]
@@ -0,0 +1,98 @@
+import random
+import threading
+
+import numpy as np
+import pytest
+
+from ..banking_batch import DEPOSIT, WITHDRAW, amounts_to_cents, apply_batch
+from ..banking_ledger import to_cents
+from ..python_oop_banking import BankAccount, CheckingAccount, SavingsAccount
+
+
+def _make_accounts():
+    return [
+        BankAccount("BA001", "Basic Holder", 100.0),
+        SavingsAccount("SA001", "Savings Holder", 1000.0, 0.02, 500.0),
+        CheckingAccount("CA001", "Checking Holder", 50.0, 200.0),
+    ]
+
+
+def test_batch_enforces_per_class_rules():
+    accounts = _make_accounts()
+    mask = apply_batch(accounts, [
+        (0, WITHDRAW, 150.0),   # insufficient funds
+        (1, WITHDRAW, 600.0),   # would break the 500 minimum balance
+        (2, WITHDRAW, 250.0),   # exactly uses the overdraft
+        (2, WITHDRAW, 0.01),    # overdraft exceeded
+        (0, DEPOSIT, -5.0),     # non-positive amount
+        (0, DEPOSIT, 25.0),
+    ])
+
+    assert mask.tolist() == [False, False, True, False, False, True]
+    assert accounts[0].balance == 125.0
+    assert accounts[1].balance == 1000.0
+    assert accounts[2].balance == -200.0
+    assert accounts[2].get_transaction_history()[-1]['balance_after'] == -200.0
+
+
+def test_batch_matches_one_at_a_time_processing(capsys):
+    rng = random.Random(7)
+    operations = [
+        (rng.randrange(3), rng.choice((DEPOSIT, WITHDRAW)), rng.choice((-1.0, 0.0, 40.0, 125.5, 300.0)))
+        for _ in range(400)
+    ]
+    expected_accounts = _make_accounts()
+    expected_mask = []
+    for account_id, kind, amount in operations:
+        account = expected_accounts[account_id]
+        action = account.deposit if kind == DEPOSIT else account.withdraw
+        expected_mask.append(action(amount))
+    capsys.readouterr()
+
+    accounts = _make_accounts()
+    mask = apply_batch(accounts, operations)
+
+    assert mask.tolist() == expected_mask
+    for account, expected in zip(accounts, expected_accounts):
+        assert account.balance == pytest.approx(expected.balance)
+        assert [t['balance_after'] for t in account.get_transaction_history()] == pytest.approx(
+            [t['balance_after'] for t in expected.get_transaction_history()])
+
+
+def test_batch_rejects_unknown_accounts():
+    with pytest.raises(IndexError):
+        apply_batch(_make_accounts(), np.array([(3, DEPOSIT, 1.0)], dtype=[('account', 'i8'), ('kind', 'i1'), ('amount', 'f8')]))
+
+
+def test_batch_holds_account_locks_and_rounds_to_cents():
+    accounts = _make_accounts()
+    done = threading.Event()
+
+    def concurrent_deposit():
+        accounts[0].deposit(10.0)
+        done.set()
+
+    with accounts[0].lock:
+        worker = threading.Thread(target=concurrent_deposit)
+        worker.start()
+        assert not done.wait(0.05)
+        mask = apply_batch(accounts, [(0, DEPOSIT, 1.005), (0, WITHDRAW, 0.004)])
+    worker.join()
+
+    assert mask.tolist() == [True, False]
+    assert accounts[0].balance == 111.0
+
+
+def test_half_cent_amounts_round_like_deposit_and_withdraw(capsys):
+    amounts = [146.985, 1.005, 2.675, 0.125, 0.135, 10.015, 0.005]
+    assert amounts_to_cents(amounts).tolist() == [to_cents(amount) for amount in amounts]
+
+    operations = [(0, DEPOSIT, amount) for amount in amounts] + [(0, WITHDRAW, amount) for amount in amounts[:3]]
+    expected = _make_accounts()[0]
+    expected_mask = [(expected.deposit if kind == DEPOSIT else expected.withdraw)(amount)
+                     for _, kind, amount in operations]
+    capsys.readouterr()
+
+    accounts = _make_accounts()
+    assert apply_batch(accounts, operations).tolist() == expected_mask
+    assert accounts[0].balance == expected.balance
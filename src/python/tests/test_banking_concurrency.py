@@ -0,0 +1,41 @@
+import pickle
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from ..python_oop_banking import BankAccount, CheckingAccount, SavingsAccount, transfer
+
+
+def test_transfer_applies_source_withdrawal_rules():
+    savings = SavingsAccount("SA001", "Ann", 600.0, 0.02, 500.0)
+    checking = CheckingAccount("CA001", "Ann", 0.0, 100.0)
+
+    assert not transfer(savings, checking, 150.0)
+    assert transfer(savings, checking, 100.0)
+    assert transfer(checking, savings, 180.0)
+    assert not transfer(checking, savings, 50.0)
+    assert not transfer(savings, savings, 1.0)
+    assert (savings.balance, checking.balance) == (680.0, -80.0)
+
+
+def test_concurrent_transfers_conserve_money():
+    accounts = [CheckingAccount(f"CA{i:03d}", "Holder", 1000.0, 200.0) for i in range(8)]
+    rng = random.Random(11)
+    pairs = [tuple(rng.sample(accounts, 2)) for _ in range(4000)]
+
+    def move(pair):
+        return transfer(pair[0], pair[1], 37.0)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(move, pairs))
+
+    assert sum(a.balance for a in accounts) == 8000.0
+    assert all(a.balance >= -200.0 for a in accounts)
+
+
+def test_accounts_survive_pickling_with_a_fresh_lock():
+    account = BankAccount("BA001", "Ann", 25.0)
+    copy = pickle.loads(pickle.dumps(account))
+
+    assert copy.balance == 25.0
+    assert copy.lock is not account.lock
+    assert copy.deposit(5.0) and copy.balance == 30.0
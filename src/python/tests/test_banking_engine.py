@@ -0,0 +1,93 @@
+import pytest
+
+from ..banking_batch import DEPOSIT, WITHDRAW
+from ..banking_engine import ShardedEngine
+from ..python_oop_banking import BankAccount, CheckingAccount, SavingsAccount
+
+
+def test_engine_applies_class_rules_across_shards():
+    accounts = [
+        BankAccount("BA001", "John Doe", 100.0),
+        SavingsAccount("SA001", "Jane Smith", 500.0, 0.02, 100.0),
+        CheckingAccount("CA001", "Bob Johnson", 100.0, 50.0),
+    ] + [BankAccount(f"AC{i:04d}", "Customer", 10.0) for i in range(50)]
+    operations = [
+        ("BA001", WITHDRAW, 150.0),
+        ("BA001", DEPOSIT, 60.0),
+        ("BA001", WITHDRAW, 150.0),
+        ("SA001", WITHDRAW, 450.0),
+        ("SA001", WITHDRAW, 400.0),
+        ("CA001", WITHDRAW, 140.0),
+        ("CA001", WITHDRAW, 20.0),
+    ] + [(f"AC{i:04d}", DEPOSIT, 1.5) for i in range(50)]
+
+    with ShardedEngine(accounts, shards=3) as engine:
+        accepted = engine.apply(operations)
+        engine.sync(accounts)
+        total = engine.total_balance()
+
+    assert accepted[:7].tolist() == [False, True, True, False, True, True, False]
+    assert accepted[7:].all()
+    assert [a.balance for a in accounts[:3]] == [10, 100, -40]
+    assert accounts[-1].balance == 11.5
+    assert total == 10 + 100 - 40 + 50 * 11.5
+
+
+def test_engine_routes_each_account_to_its_shard_and_grows_request_blocks():
+    accounts = [BankAccount(f"AC{i:04d}", "Customer", 0.0) for i in range(200)]
+    operations = [(f"AC{i % 200:04d}", DEPOSIT, 1.0) for i in range(6000)]
+
+    with ShardedEngine(accounts, shards=4) as engine:
+        owners = {engine._slot_shards[engine.slots[a.account_number]] for a in accounts}
+        assert engine.apply(operations[:10]).all()
+        assert engine.apply(operations).all()   # larger than the first request blocks
+        balances = [engine.balance(a.account_number) for a in accounts]
+
+    assert owners == {0, 1, 2, 3}
+    assert balances == [31] * 10 + [30] * 190
+
+
+def test_engine_rejects_savings_minimum_and_checking_overdraft():
+    accounts = [
+        SavingsAccount("SA001", "Jane Smith", 500.0, 0.02, 100.0),
+        CheckingAccount("CA001", "Bob Johnson", 0.0, 50.0),
+    ]
+
+    with ShardedEngine(accounts, shards=2) as engine:
+        accepted = engine.apply([
+            ("SA001", WITHDRAW, 400.01),   # would leave less than the 100 minimum
+            ("SA001", WITHDRAW, 400.0),
+            ("CA001", WITHDRAW, 50.01),    # past the 50 overdraft
+            ("CA001", WITHDRAW, 50.0),
+        ])
+        balances = [engine.balance("SA001"), engine.balance("CA001")]
+
+    assert accepted.tolist() == [False, True, False, True]
+    assert balances == [100, -50]
+
+
+def test_engine_raises_when_a_worker_dies():
+    accounts = [BankAccount(f"AC{i:04d}", "Customer", 10.0) for i in range(20)]
+
+    with ShardedEngine(accounts, shards=2) as engine:
+        engine.poll_interval = 0.05
+        engine._workers[0].terminate()
+        engine._workers[0].join()
+        victim = next(number for number, slot in engine.slots.items() if engine._slot_shards[slot] == 0)
+
+        with pytest.raises(RuntimeError, match="shard worker 0"):
+            engine.apply([(victim, DEPOSIT, 1.0)])
+        with pytest.raises(RuntimeError, match="unusable"):
+            engine.apply([(victim, DEPOSIT, 1.0)])
+
+
+def test_engine_rounds_half_cents_like_deposit(capsys):
+    amounts = [146.985, 1.005, 2.675, 0.125]
+    expected = BankAccount("BA001", "John Doe", 0.0)
+    for amount in amounts:
+        expected.deposit(amount)
+    capsys.readouterr()
+
+    with ShardedEngine([BankAccount("BA001", "John Doe", 0.0)], shards=1) as engine:
+        assert engine.apply([("BA001", DEPOSIT, amount) for amount in amounts]).all()
+        assert engine.balance("BA001") == expected.balance
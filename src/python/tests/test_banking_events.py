@@ -0,0 +1,70 @@
+import io
+import json
+
+import pytest
+
+from ..banking_events import (ConsoleSink, JsonlFileSink, MemorySink, INSUFFICIENT_FUNDS,
+                              MINIMUM_BALANCE, OVERDRAFT_EXCEEDED)
+from ..python_oop_banking import BankAccount, CheckingAccount, SavingsAccount, set_event_sink
+
+
+@pytest.fixture
+def sink():
+    sink = MemorySink()
+    previous = set_event_sink(sink)
+    yield sink
+    set_event_sink(previous)
+
+
+def test_operations_are_silent_by_default(capsys):
+    account = BankAccount("BA001", "Quiet User", 10.0)
+    account.deposit(5.0)
+    account.withdraw(100.0)
+    assert capsys.readouterr().out == ""
+
+
+def test_rejections_carry_a_reason(sink):
+    BankAccount("BA001", "Ann", 10.0).withdraw(20.0)
+    SavingsAccount("SA001", "Ann", 150.0, 0.02, 100.0).withdraw(60.0)
+    CheckingAccount("CA001", "Ann", 0.0, 50.0).withdraw(60.0)
+
+    assert [e['reason'] for e in sink.events] == [INSUFFICIENT_FUNDS, MINIMUM_BALANCE, OVERDRAFT_EXCEEDED]
+    assert not any(e['accepted'] for e in sink.events)
+
+
+def test_console_sink_renders_legacy_messages():
+    stream = io.StringIO()
+    previous = set_event_sink(ConsoleSink(stream=stream))
+    try:
+        account = CheckingAccount("CA001", "Ann", 100.0, 500.0)
+        account.deposit(50.0)
+        account.withdraw(200.0)
+        account.withdraw(1000.0)
+    finally:
+        set_event_sink(previous)
+
+    assert stream.getvalue().splitlines() == [
+        "Deposited $50.00. New balance: $150.00",
+        "Withdrew $200.00. New balance: $-50.00 (Overdraft: $50.00)",
+        "Error: Withdrawal exceeds available funds and overdraft limit.",
+        "Available: $-50.00, Overdraft limit: $500.00",
+    ]
+
+
+def test_jsonl_sink_writes_in_batches(tmp_path):
+    path = tmp_path / "events.jsonl"
+    jsonl = JsonlFileSink(str(path), batch_size=2)
+    previous = set_event_sink(jsonl)
+    try:
+        account = BankAccount("BA001", "Ann")
+        account.deposit(1.0)
+        assert path.read_text() == ""
+        account.deposit(2.0)
+        account.deposit(3.0)
+        assert len(path.read_text().splitlines()) == 2
+    finally:
+        set_event_sink(previous)
+        jsonl.close()
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e['amount'] for e in events] == [1.0, 2.0, 3.0]
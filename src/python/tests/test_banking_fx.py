@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from ..banking_fx import FxRates, FxTable, balances_by_currency, snapshot_total_balance, total_balance
+from ..banking_money import Money
+from ..banking_snapshot import SnapshotReader, write_snapshot
+from ..python_oop_banking import BankAccount, CheckingAccount, SavingsAccount, transfer
+
+
+def write_rates(path, rates, base="USD"):
+    path.write_text(json.dumps({'base': base, 'rates': rates}))
+
+
+@pytest.fixture
+def book():
+    return [
+        CheckingAccount("CHK001", "John Smith", 2500.00),
+        SavingsAccount("SAV001", "Jane Doe", 920.00, currency="EUR"),
+        BankAccount("BAS001", "Bob Johnson", 15000.00, currency="JPY"),
+        CheckingAccount("CHK002", "Alice Brown", 0.01, currency="EUR"),
+    ]
+
+
+def test_conversion_uses_cross_rates_and_rounds_to_cents():
+    rates = FxRates("USD", {"EUR": 0.92, "JPY": 150.0})
+
+    assert rates.convert(920, "EUR", "USD") == Money(100000)
+    assert rates.convert(100, "USD", "JPY") == Money(1500000)
+    assert rates.rate("EUR", "JPY") == pytest.approx(150.0 / 0.92)
+    converted = rates.convert_cents([92000, 1, 1500000], ["EUR", "EUR", ""], "USD")
+    assert converted.tolist() == [100000, 1, 1500000]
+    with pytest.raises(KeyError):
+        rates.convert(1, "GBP", "USD")
+
+
+def test_table_caches_rates_until_the_ttl_expires(tmp_path):
+    path = tmp_path / "rates.json"
+    write_rates(path, {"EUR": 0.5})
+    now = [0.0]
+    table = FxTable(str(path), ttl=60, clock=lambda: now[0])
+
+    first = table.rates()
+    write_rates(path, {"EUR": 0.25})
+    path.touch()
+    assert table.rates() is first
+    assert table.convert(10, "EUR", "USD") == 20
+
+    now[0] = 61.0
+    assert table.convert(10, "EUR", "USD") == 40
+    path.write_text("not json")
+    now[0] = 200.0
+    assert table.convert(10, "EUR", "USD") == 40
+
+
+def test_book_totals_convert_every_account_in_one_pass(tmp_path, book):
+    fx = FxRates("USD", {"EUR": 0.92, "JPY": 150.0})
+
+    assert total_balance(book, fx) == Money(250000 + 100000 + 10000 + 1)
+    assert total_balance(book, fx) == sum((fx.convert(a.balance, a.currency, "USD") for a in book), Money(0))
+    assert balances_by_currency(book) == {"EUR": Money(92001), "JPY": Money(1500000), "USD": Money(250000)}
+
+    path = str(tmp_path / "accounts.snap")
+    write_snapshot(path, book)
+    with SnapshotReader(path) as reader:
+        assert reader.get("SAV001").currency == "EUR"
+        assert snapshot_total_balance(reader, fx, "EUR") == total_balance(book, fx, "EUR")
+
+
+def test_transfers_require_matching_currencies(book):
+    with pytest.raises(ValueError):
+        transfer(book[0], book[1], 10)
+    assert transfer(book[1], book[3], 10)
+    assert book[3].get_account_info()['currency'] == "EUR"
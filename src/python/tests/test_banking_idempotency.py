@@ -0,0 +1,49 @@
+import pytest
+
+from ..banking_idempotency import IdempotencyIndex
+from ..python_oop_banking import BankAccount, CheckingAccount, transfer
+
+
+def test_retried_operations_apply_once():
+    account = BankAccount("ACC001", "John Doe", 100.0)
+
+    assert account.deposit(50, idempotency_key="msg-1")
+    assert account.deposit(50, idempotency_key="msg-1")
+    assert not account.withdraw(500, idempotency_key="msg-2")
+    account.deposit(1000)
+    # The recorded rejection is replayed even though funds are now available
+    assert not account.withdraw(500, idempotency_key="msg-2")
+
+    assert account.balance == 1150
+    assert len(account.transactions) == 3
+
+
+def test_key_reuse_for_a_different_operation_is_an_error():
+    account = BankAccount("ACC002", "John Doe", 100.0)
+    account.deposit(10, idempotency_key="msg-1")
+
+    with pytest.raises(ValueError):
+        account.withdraw(10, idempotency_key="msg-1")
+
+
+def test_transfer_retry_moves_money_once():
+    source = CheckingAccount("CA001", "Bob Johnson", 100.0)
+    destination = BankAccount("BA001", "John Doe")
+
+    assert transfer(source, destination, 30, idempotency_key="t-1")
+    assert transfer(source, destination, 30, idempotency_key="t-1")
+
+    assert (source.balance, destination.balance) == (70, 30)
+
+
+def test_index_evicts_oldest_and_expired_entries():
+    index = IdempotencyIndex(max_entries=2, ttl=10)
+    index.put("a", 1, now=0)
+    index.put("b", 2, now=1)
+    index.put("c", 3, now=2)
+
+    assert index.get("a", now=3) is None
+    assert index.get("b", now=3) == 2
+    assert index.get("b", now=11) is None
+    assert index.get("c", now=11) == 3
+    assert len(index) == 1
@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import pytest
+
+from ..banking_events import EventSink
+from ..banking_interest import DAILY, MONTHLY, accrue_interest
+from ..python_oop_banking import SavingsAccount, interest_columns, post_interest_batch, set_event_sink
+
+
+def _savings(number, balance, rate, last_interest_date):
+    account = SavingsAccount(number, "Saver", balance, rate, 0.0)
+    account.last_interest_date = last_interest_date
+    return account
+
+
+def test_monthly_compounding_uses_whole_months_since_last_interest():
+    accounts = [
+        _savings("SA001", 1200.0, 0.12, datetime(2024, 1, 15)),
+        _savings("SA002", 1000.0, 0.06, datetime(2024, 3, 20)),
+    ]
+
+    interest = accrue_interest(accounts, as_of=datetime(2024, 4, 16), mode=MONTHLY)
+
+    # SA001: three months at 1% per month; SA002: not a full month yet
+    assert interest.tolist() == pytest.approx([round(1200 * (1.01 ** 3 - 1), 2), 0.0])
+    assert accounts[0].balance == pytest.approx(1236.36)
+    assert accounts[0].last_interest_date == datetime(2024, 4, 15)
+    assert accounts[0].get_transaction_history()[-1]['type'] == "Interest"
+    assert accounts[1].last_interest_date == datetime(2024, 3, 20)
+    assert len(accounts[1].get_transaction_history()) == 1
+
+
+def test_monthly_dates_clamp_to_short_months():
+    account = _savings("SA001", 1000.0, 0.12, datetime(2024, 1, 31))
+
+    accrue_interest([account], as_of=datetime(2024, 3, 1), mode=MONTHLY)
+
+    assert account.last_interest_date.date() == datetime(2024, 2, 29).date()
+
+
+def test_daily_accrual_is_simple_interest_per_day():
+    account = _savings("SA001", 3650.0, 0.10, datetime(2024, 1, 1, 12))
+
+    interest = accrue_interest([account], as_of=datetime(2024, 1, 11, 13), mode=DAILY)
+
+    assert interest.tolist() == [10.0]
+    assert account.balance == 3660.0
+    assert account.last_interest_date == datetime(2024, 1, 11, 12)
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        accrue_interest([_savings("SA001", 1.0, 0.1, datetime(2024, 1, 1))], mode="weekly")
+
+
+def test_monthly_dates_keep_the_interest_day_after_short_months():
+    account = _savings("SA001", 1000.0, 0.12, datetime(2024, 1, 31))
+
+    accrue_interest([account], as_of=datetime(2024, 3, 1), mode=MONTHLY)
+    accrue_interest([account], as_of=datetime(2024, 3, 30), mode=MONTHLY)
+    assert account.last_interest_date.date() == datetime(2024, 2, 29).date()
+    accrue_interest([account], as_of=datetime(2024, 3, 31), mode=MONTHLY)
+
+    assert account.last_interest_date.date() == datetime(2024, 3, 31).date()
+    assert account.interest_day == 31
+
+
+def test_accrual_adds_to_balances_changed_by_concurrent_operations():
+    account = _savings("SA001", 1200.0, 0.12, datetime(2024, 1, 15))
+    recorded = []
+
+    class Sink(EventSink):
+        def emit(self, event):
+            recorded.append(event)
+
+    original = set_event_sink(Sink())
+    try:
+        accounts = [account]
+        _balances, _rates, last_epochs, _days = interest_columns(accounts)
+        account.deposit(100.0)
+        post_interest_batch(accounts, [1200], [last_epochs[0]])
+    finally:
+        set_event_sink(original)
+
+    assert account.balance == 1312.0
+    assert [event['event'] for event in recorded] == ["deposit", "interest"]
@@ -0,0 +1,158 @@
+from datetime import datetime
+import json
+import os
+
+import pytest
+
+from ..banking_events import MemorySink
+from ..banking_jobs import (DormancyJob, InterestJob, MaintenanceJob, MonthlyFeeJob, run_maintenance,
+                            shard_of)
+from ..banking_journal import AccountJournal
+from ..python_oop_banking import BankAccount, CheckingAccount, SavingsAccount, set_event_sink
+
+
+def _accounts():
+    savings = SavingsAccount("SA001", "Jane Smith", 1000.0, 0.12, 100.0)
+    savings.last_interest_date = datetime(2024, 1, 15)
+    return [
+        BankAccount("BA001", "John Doe", 100.0),
+        BankAccount("BA002", "Broke Bob", 3.0),
+        CheckingAccount("CA001", "Bob Johnson", 0.0, 5.0),
+        savings,
+    ]
+
+
+def test_monthly_fees_and_interest_follow_account_type_rules():
+    accounts = _accounts()
+
+    report = run_maintenance(accounts, [MonthlyFeeJob(), InterestJob()],
+                             as_of=datetime(2024, 3, 20), shards=3, workers=0)
+
+    fees, interest = report['jobs']['monthly_fee'], report['jobs']['interest']
+    assert [a.balance for a in accounts[:3]] == [95, 3, 0]
+    assert fees['posted'] == 1 and sorted(fees['declined_accounts']) == ["BA002", "CA001"]
+    # Two whole months at 1% per month on 1000.00
+    assert accounts[3].balance == 1020.10 and interest['total'] == 20.10
+    assert accounts[3].last_interest_date == datetime(2024, 3, 15)
+
+
+def test_process_pool_matches_and_events_are_emitted():
+    accounts = _accounts()
+    sink = MemorySink()
+    previous = set_event_sink(sink)
+    try:
+        report = run_maintenance(accounts, [MonthlyFeeJob()], shards=4, workers=2)
+    finally:
+        set_event_sink(previous)
+
+    assert report['jobs']['monthly_fee']['total'] == 5
+    assert [e['account_number'] for e in sink.events if e['accepted']] == ["BA001"]
+
+
+class _PerAccountFeeJob(MonthlyFeeJob):
+    post_batch = MaintenanceJob.post_batch
+
+
+def test_bulk_fee_posting_matches_withdraw():
+    results = []
+    for job in (_PerAccountFeeJob(), MonthlyFeeJob()):
+        accounts = _accounts()
+        sink = MemorySink()
+        previous = set_event_sink(sink)
+        try:
+            run_maintenance(accounts, [job], as_of=datetime(2024, 3, 20), shards=1, workers=0)
+        finally:
+            set_event_sink(previous)
+        results.append(([a.balance for a in accounts],
+                        [[t['type'], t['amount']] for a in accounts for t in a.get_transaction_history()],
+                        [(e['account_number'], e['amount'], e['accepted'], e['reason']) for e in sink.events]))
+
+    assert results[0] == results[1]
+
+
+def test_dormancy_flags_idle_accounts():
+    accounts = _accounts()
+
+    report = run_maintenance(accounts, [DormancyJob(days=30)], as_of=datetime(2099, 1, 1), workers=0)
+
+    assert sorted(report['jobs']['dormancy']['flagged']) == ["BA001", "BA002", "CA001", "SA001"]
+
+
+def test_rerun_skips_checkpointed_shards(tmp_path):
+    accounts = _accounts()
+    options = dict(as_of=datetime(2024, 3, 20), shards=2, workers=0,
+                   checkpoint_dir=str(tmp_path), run_id="2024-03")
+
+    first = run_maintenance(accounts, [MonthlyFeeJob()], **options)
+    second = run_maintenance(accounts, [MonthlyFeeJob()], **options)
+
+    assert accounts[0].balance == 95
+    assert second['resumed_shards'] == len({shard_of(a.account_number, 2) for a in accounts})
+    assert second['jobs'] == first['jobs']
+
+
+class _CrashingFeeJob(MonthlyFeeJob):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def post_batch(self, accounts, cents, effective):
+        for account, amount, moment in zip(accounts, cents, effective):
+            self.calls += 1
+            if self.calls == 2:
+                raise RuntimeError("crash")
+            yield from super().post_batch([account], [amount], [moment])
+
+
+def test_rerun_after_a_crash_mid_shard_does_not_charge_twice(tmp_path):
+    accounts = _accounts()
+    options = dict(as_of=datetime(2024, 3, 20), shards=1, workers=0,
+                   checkpoint_dir=str(tmp_path), run_id="2024-03")
+
+    with pytest.raises(RuntimeError):
+        run_maintenance(accounts, [_CrashingFeeJob()], **options)
+    assert accounts[0].balance == 95
+    report = run_maintenance(accounts, [MonthlyFeeJob()], **options)
+
+    fees = report['jobs']['monthly_fee']
+    assert accounts[0].balance == 95
+    assert fees['posted'] == 1 and fees['total'] == 5
+    assert sorted(fees['declined_accounts']) == ["BA002", "CA001"]
+    assert report['resumed_shards'] == 0
+    assert list(tmp_path.joinpath("2024-03").iterdir()) == [tmp_path / "2024-03" / "shard-0000.json"]
+
+
+def test_journal_keeps_shard_progress_with_the_postings_it_covers(tmp_path):
+    journal_dir = str(tmp_path / "journal")
+    options = dict(as_of=datetime(2024, 3, 20), shards=1, workers=0,
+                   checkpoint_dir=str(tmp_path / "runs"), run_id="2024-03")
+    journal = AccountJournal.recover(journal_dir)
+    previous = set_event_sink(journal)
+    try:
+        for account in _accounts():
+            journal.register(account)
+        with pytest.raises(RuntimeError):
+            run_maintenance(list(journal.accounts), [_CrashingFeeJob()], **options)
+    finally:
+        set_event_sink(previous)
+        journal.close()
+
+    records = [json.loads(line) for name in sorted(os.listdir(journal_dir)) if name.startswith("journal-")
+               for line in open(os.path.join(journal_dir, name), encoding='utf-8')]
+    group = next(r for r in records if r['op'] == 'group')
+    assert [r['op'] for r in group['records']] == ["withdraw", "progress"]
+    assert not os.path.exists(tmp_path / "runs" / "2024-03" / "shard-0000.progress")
+
+    journal = AccountJournal.recover(journal_dir)
+    previous = set_event_sink(journal)
+    try:
+        report = run_maintenance(list(journal.accounts), [MonthlyFeeJob()], **options)
+        assert journal.progress("2024-03/0000") == []
+    finally:
+        set_event_sink(previous)
+        journal.close()
+
+    fees = report['jobs']['monthly_fee']
+    assert journal.accounts["BA001"].balance == 95
+    assert fees['posted'] == 1 and fees['total'] == 5
+    assert sorted(fees['declined_accounts']) == ["BA002", "CA001"]
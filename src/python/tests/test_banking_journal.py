@@ -0,0 +1,190 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from ..banking_batch import DEPOSIT, apply_batch
+from ..banking_journal import AccountJournal
+from ..python_oop_banking import BankAccount, CheckingAccount, SavingsAccount, set_event_sink, transfer
+
+
+@pytest.fixture
+def journal_dir(tmp_path):
+    return str(tmp_path / "journal")
+
+
+def _run_session(journal_dir, **options):
+    journal = AccountJournal.recover(journal_dir, **options)
+    previous = set_event_sink(journal)
+    return journal, previous
+
+
+def test_recovery_replays_journal_tail(journal_dir):
+    journal, previous = _run_session(journal_dir, fsync_batch_size=2, fsync_interval=60)
+    try:
+        savings = journal.register(SavingsAccount("SA001", "Ann", 1000.0, 0.03, 500.0))
+        checking = journal.register(CheckingAccount("CA001", "Bo", 0.0, 200.0))
+        savings.deposit(250.0)
+        savings.withdraw(900.0)        # rejected: not journaled
+        checking.withdraw(150.0)
+    finally:
+        set_event_sink(previous)
+        journal.close()
+
+    recovered = AccountJournal.recover(journal_dir)
+    assert recovered.accounts["SA001"].balance == 1250.0
+    assert recovered.accounts["SA001"].minimum_balance == 500.0
+    assert recovered.accounts["CA001"].balance == -150.0
+    assert [t['type'] for t in recovered.accounts["SA001"].get_transaction_history()] == ["Deposit"]
+    recovered.close()
+
+
+def test_snapshot_compacts_journal(journal_dir):
+    journal, previous = _run_session(journal_dir, snapshot_every=5)
+    try:
+        account = journal.register(BankAccount("BA001", "Ann", 0.0))
+        for _ in range(12):
+            account.deposit(10.0)
+        journal.close_account("BA001")
+        journal.register(BankAccount("BA002", "Bo", 30.0))
+    finally:
+        set_event_sink(previous)
+        journal.close()
+
+    segments = [name for name in os.listdir(journal_dir) if name.startswith("journal-")]
+    assert len(segments) == 1
+    recovered = AccountJournal.recover(journal_dir)
+    assert "BA001" not in recovered.accounts
+    assert recovered.accounts["BA002"].balance == 30.0
+    recovered.close()
+
+
+def test_torn_tail_record_is_discarded(journal_dir):
+    journal, previous = _run_session(journal_dir, fsync_batch_size=1)
+    try:
+        journal.register(BankAccount("BA001", "Ann", 0.0)).deposit(5.0)
+    finally:
+        set_event_sink(previous)
+        journal.close()
+    segment = os.path.join(journal_dir, sorted(os.listdir(journal_dir))[0])
+    with open(segment, 'a') as file:
+        file.write('{"op": "deposit", "seq": 3, "account_')
+
+    recovered = AccountJournal.recover(journal_dir)
+    assert recovered.accounts["BA001"].balance == 5.0
+    recovered.close()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_idle_journal_commits_and_snapshots_in_the_background(journal_dir):
+    journal, previous = _run_session(journal_dir, fsync_batch_size=1000, fsync_interval=0.02,
+                                     snapshot_every=3)
+    try:
+        journal.register(BankAccount("BA001", "Ann", 0.0)).deposit(5.0)
+
+        def committed():
+            for path in journal._segments():
+                with open(path, 'rb') as file:
+                    if b'"deposit"' in file.read():
+                        return True
+            return False
+        # No further records arrive, yet the deposit reaches disk
+        assert _wait_for(committed)
+        assert not os.path.exists(os.path.join(journal_dir, "snapshot.json"))
+
+        journal.accounts["BA001"].deposit(1.0)
+        assert _wait_for(lambda: os.path.exists(os.path.join(journal_dir, "snapshot.json")))
+    finally:
+        set_event_sink(previous)
+        journal.close()
+
+    assert not journal._flusher.is_alive()
+    recovered = AccountJournal.recover(journal_dir)
+    assert recovered.accounts["BA001"].balance == 6.0
+    recovered.close()
+
+
+def test_registering_while_snapshots_run_recovers_every_account(journal_dir):
+    journal, previous = _run_session(journal_dir, snapshot_every=7, fsync_interval=0.001)
+    stop = threading.Event()
+
+    def snapshot_repeatedly():
+        while not stop.is_set():
+            journal.snapshot()
+
+    snapshotter = threading.Thread(target=snapshot_repeatedly)
+    snapshotter.start()
+    try:
+        for i in range(200):
+            journal.register(BankAccount(f"BA{i:03d}", "Ann", 1.0))
+            if i % 3 == 0:
+                journal.close_account(f"BA{i:03d}")
+    finally:
+        stop.set()
+        snapshotter.join()
+        set_event_sink(previous)
+        journal.close()
+
+    recovered = AccountJournal.recover(journal_dir)
+    assert len(recovered.accounts) == 200 - 67
+    recovered.close()
+
+
+def test_replay_tolerates_an_open_already_in_the_snapshot(journal_dir):
+    os.makedirs(journal_dir)
+    state = {'account_type': "Basic", 'account_number': "BA1", 'account_holder': "Ann",
+             'balance': 7.0, 'currency': "USD"}
+    with open(os.path.join(journal_dir, "snapshot.json"), 'w') as file:
+        json.dump({'seq': 1, 'created': 0, 'accounts': [state]}, file)
+    with open(os.path.join(journal_dir, "journal-000000000001.log"), 'w') as file:
+        file.write(json.dumps({'op': 'open', 'state': {**state, 'balance': 0.0}, 'seq': 2}) + "\n")
+        file.write(json.dumps({'op': 'close', 'account_number': "BA2", 'seq': 3}) + "\n")
+
+    recovered = AccountJournal.recover(journal_dir)
+    assert recovered.accounts["BA1"].balance == 7.0
+    recovered.close()
+
+
+def test_transfer_is_journaled_as_one_record(journal_dir):
+    journal, previous = _run_session(journal_dir, fsync_batch_size=1)
+    try:
+        source = journal.register(BankAccount("BA001", "Ann", 100.0))
+        destination = journal.register(BankAccount("BA002", "Bo", 0.0))
+        assert transfer(source, destination, 40.0)
+    finally:
+        set_event_sink(previous)
+        journal.close()
+
+    with open(journal._segments()[-1]) as file:
+        records = [json.loads(line) for line in file]
+    assert [record['op'] for record in records] == ["open", "open", "group"]
+    assert [member['op'] for member in records[-1]['records']] == ["withdraw", "deposit"]
+    recovered = AccountJournal.recover(journal_dir)
+    assert recovered.accounts["BA001"].balance == 60.0
+    assert recovered.accounts["BA002"].balance == 40.0
+    recovered.close()
+
+
+def test_snapshot_makes_bulk_batches_durable(journal_dir):
+    journal, previous = _run_session(journal_dir)
+    try:
+        account = journal.register(BankAccount("BA001", "Ann", 0.0))
+        apply_batch([account], [(0, DEPOSIT, 25.0)])
+        journal.snapshot()
+    finally:
+        set_event_sink(previous)
+        journal.close()
+
+    recovered = AccountJournal.recover(journal_dir)
+    assert recovered.accounts["BA001"].balance == 25.0
+    recovered.close()
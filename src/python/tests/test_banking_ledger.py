@@ -0,0 +1,136 @@
+from datetime import datetime
+import sys
+import threading
+
+from ..banking_ledger import TransactionLedger
+from ..python_oop_banking import BankAccount
+
+
+def test_ledger_materializes_entries_on_read():
+    ledger = TransactionLedger()
+    ledger.append("Deposit", 10.25, 110.25, timestamp=0)
+    ledger.append("Withdrawal", -5.5, 104.75, timestamp=60)
+
+    assert len(ledger) == 2
+    assert ledger[-1]['type'] == "Withdrawal"
+    assert ledger[-1]['amount'] == -5.5
+    assert ledger[0]['balance_after'] == 110.25
+    assert [entry['type'] for entry in ledger] == ["Deposit", "Withdrawal"]
+
+
+def test_type_names_are_interned_across_ledgers():
+    assert TransactionLedger.type_code("Deposit") == TransactionLedger.type_code("Deposit")
+    assert TransactionLedger.type_code("Deposit") != TransactionLedger.type_code("Withdrawal")
+
+
+def test_account_history_keeps_dict_shape():
+    account = BankAccount("BA100", "Test User", 100.0)
+    account.deposit(50.0)
+    account.withdraw(20.0)
+
+    history = account.get_transaction_history()
+    assert [entry['type'] for entry in history] == ["Initial Deposit", "Deposit", "Withdrawal"]
+    assert history[-1]['amount'] == -20.0
+    assert history[-1]['balance_after'] == 130.0
+    assert set(history[0]) == {'timestamp', 'type', 'amount', 'balance_after'}
+    assert account.get_account_info()['transaction_count'] == 3
+
+
+def _march_ledger():
+    ledger = TransactionLedger()
+    base = datetime(2024, 3, 1).timestamp()
+    ledger.append("Deposit", 100.0, 100.0, timestamp=base - 86400)
+    ledger.append("Withdrawal", -20.0, 80.0, timestamp=base)
+    ledger.append("Deposit", 50.0, 130.0, timestamp=base + 86400)
+    ledger.append("Withdrawal", -30.0, 100.0, timestamp=base + 2 * 86400)
+    ledger.append("Withdrawal", -10.0, 90.0, timestamp=datetime(2024, 4, 1).timestamp())
+    return ledger
+
+
+def test_balance_at_uses_last_entry_at_or_before_moment():
+    ledger = _march_ledger()
+
+    assert ledger.balance_at(datetime(2024, 2, 1)) == 0
+    assert ledger.balance_at(datetime(2024, 3, 1)) == 80
+    assert ledger.balance_at(datetime(2024, 3, 2, 12)) == 130
+    assert ledger.balance_at(datetime(2030, 1, 1)) == 90
+
+
+def test_range_queries_are_half_open():
+    ledger = _march_ledger()
+    march, april = datetime(2024, 3, 1), datetime(2024, 4, 1)
+
+    assert ledger.sum_by_type(march, april) == {"Withdrawal": -50, "Deposit": 50}
+    assert [t['amount'] for t in ledger.transactions_between(march, april)] == [-20, 50, -30]
+    assert ledger.sum_by_type(datetime(2025, 1, 1), datetime(2026, 1, 1)) == {}
+
+    # Index stays correct when entries are appended after the first query
+    ledger.append("Deposit", 5.0, 95.0, timestamp=datetime(2024, 4, 2).timestamp())
+    assert ledger.sum_by_type(april, datetime(2024, 5, 1)) == {"Withdrawal": -10, "Deposit": 5}
+
+
+def test_timestamps_never_go_backwards():
+    ledger = TransactionLedger()
+    ledger.append("Deposit", 1.0, 1.0, timestamp=1000)
+    ledger.append("Deposit", 1.0, 2.0, timestamp=900)
+
+    assert ledger.position_at(999) == 0
+    assert ledger.position_at(1000) == 2
+
+
+def test_cursor_pages_backwards_and_forwards():
+    ledger = TransactionLedger()
+    for i in range(1, 8):
+        ledger.append("Deposit", i, i)
+    cursor = ledger.cursor(page_size=3)
+
+    assert [t['amount'] for t in cursor.previous_page()] == [5, 6, 7]
+    assert [t['amount'] for t in cursor.previous_page()] == [2, 3, 4]
+    assert [t['amount'] for t in cursor.previous_page()] == [1]
+    assert not cursor.has_previous()
+    assert [t['amount'] for t in cursor.next_page()] == [1, 2, 3]
+    assert [t['amount'] for t in cursor] == [4, 5, 6, 7]
+    assert not cursor.has_next()
+
+
+def test_recent_transactions_returns_last_entries():
+    account = BankAccount("ACC001", "John Doe", 100.0)
+    for amount in (1, 2, 3, 4, 5, 6):
+        account.deposit(amount)
+
+    recent = account.get_recent_transactions(3)
+
+    assert [t['amount'] for t in recent] == [4, 5, 6]
+    assert account.get_recent_transactions(0) == []
+    assert len(account.get_recent_transactions(50)) == 7
+
+
+def test_concurrent_sum_by_type_builds_the_index_once():
+    account = BankAccount("BA001", "John Doe")
+    deposit = TransactionLedger.type_code("Deposit")
+    for i in range(20000):
+        account.transactions.append_cents(deposit, 1, i + 1, timestamp=5)
+    barrier = threading.Barrier(4)
+    results, errors = [], []
+
+    def query():
+        barrier.wait()
+        try:
+            results.append(account.sum_by_type(0, 10))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=query) for _ in range(4)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)   # switch threads often, inside the index build
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    assert results == [{"Deposit": 200}] * 4
+    assert account.sum_by_type(0, 10) == {"Deposit": 200}
@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+import numpy as np
+
+from ..banking_loans import (FIXED_RATE, INTEREST_ONLY, amortize, iter_amortize, monthly_payment,
+                             schedule_orders, write_schedules_csv)
+
+ORDERS = [
+    {'order_id': 1, 'order_type': 'LOAN', 'amount': Decimal('15000.00'), 'status': 'APPROVED'},
+    {'order_id': 2, 'order_type': 'CREDIT_CARD', 'amount': Decimal('5000.00'), 'status': 'APPROVED'},
+    {'order_id': 3, 'order_type': 'MORTGAGE', 'amount': Decimal('300000.00'), 'status': 'PENDING'},
+    {'order_id': 5, 'order_type': 'INVESTMENT', 'amount': Decimal('25000.00'), 'status': 'APPROVED'},
+    {'order_id': 7, 'order_type': 'MORTGAGE', 'amount': Decimal('500000.00'), 'status': 'APPROVED'},
+]
+
+
+def test_fixed_rate_schedule_splits_level_payments():
+    schedule = amortize(10000.0, 0.06, 12)
+
+    payment = monthly_payment(1_000_000, 0.06, 12)
+    assert payment == 86066
+    assert (schedule['payment'][:-1] == payment).all()
+    assert schedule['principal'].sum() == 1_000_000
+    assert schedule['interest'][0] == 5000
+    assert schedule['balance'][-1] == 0
+    assert (np.diff(schedule['balance']) < 0).all()
+
+
+def test_interest_only_and_zero_rate_loans():
+    schedule = amortize([1200.0, 1200.0], [0.12, 0.0], [3, 4], [INTEREST_ONLY, FIXED_RATE])
+
+    interest_only = schedule[schedule['loan'] == 0]
+    assert interest_only['interest'].tolist() == [1200, 1200, 1200]
+    assert interest_only['principal'].tolist() == [0, 0, 120000]
+    zero_rate = schedule[schedule['loan'] == 1]
+    assert zero_rate['payment'].tolist() == [30000] * 4
+    assert zero_rate['interest'].sum() == 0
+
+
+def test_orders_book_schedules_approved_loans_only(tmp_path):
+    schedule = schedule_orders(ORDERS)
+
+    assert sorted(set(schedule['loan'].tolist())) == [1, 2, 7]
+    assert (schedule['loan'] == 7).sum() == 360
+
+    chunks = list(schedule_orders(ORDERS, chunk_size=1))
+    assert len(chunks) == 3
+    assert np.array_equal(np.concatenate(chunks), schedule)
+    assert write_schedules_csv(tmp_path / "schedules.csv", iter(chunks)) == len(schedule)
+    assert list(iter_amortize([100.0] * 5, 0.05, 2, chunk_size=2))[-1]['loan'].tolist() == [4, 4]
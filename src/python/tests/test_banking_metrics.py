@@ -0,0 +1,52 @@
+from urllib.request import urlopen
+
+from ..banking_events import INSUFFICIENT_FUNDS, OVERDRAFT_EXCEEDED
+from ..banking_metrics import LatencyHistogram, MetricsSink, start_metrics_server
+from ..python_oop_banking import BankAccount, CheckingAccount, set_event_sink
+
+
+def test_counts_outcomes_and_records_latency():
+    metrics = MetricsSink()
+    previous = set_event_sink(metrics)
+    try:
+        basic = BankAccount("BA001", "John Doe", 100.0)
+        checking = CheckingAccount("CA001", "Bob Johnson", 0.0, 50.0)
+        basic.deposit(10)
+        basic.withdraw(500)
+        checking.withdraw(40)
+        checking.withdraw(40)
+    finally:
+        set_event_sink(previous)
+
+    assert metrics.count("deposit") == 1
+    assert metrics.count("withdraw") == 1
+    assert metrics.count("withdraw", INSUFFICIENT_FUNDS) == 1
+    assert metrics.count("withdraw", OVERDRAFT_EXCEEDED, "Checking") == 1
+    assert metrics.histograms[("withdraw", "Checking")].count == 2
+
+    text = metrics.to_prometheus()
+    assert 'banking_operations_total{operation="withdraw",account_type="Checking",outcome="accepted"} 1' in text
+    assert 'banking_operation_latency_seconds_bucket{operation="deposit",account_type="Basic",le="+Inf"} 1' in text
+
+
+def test_histogram_quantile_uses_bucket_bounds():
+    histogram = LatencyHistogram(bounds=(0.001, 0.01, 0.1))
+    for seconds in (0.0005, 0.0005, 0.005, 0.05):
+        histogram.observe(seconds)
+
+    assert histogram.quantile(0.5) == 0.001
+    assert histogram.quantile(0.99) == 0.1
+
+
+def test_http_endpoint_serves_text_format():
+    metrics = MetricsSink()
+    metrics.emit({'event': "deposit", 'account_type': "Basic", 'reason': None, 'latency': 0.0001})
+    server = start_metrics_server(metrics, port=0)
+    try:
+        with urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            body = response.read().decode()
+    finally:
+        server.shutdown()
+
+    assert response.headers['Content-Type'].startswith("text/plain; version=0.0.4")
+    assert "banking_operations_total" in body
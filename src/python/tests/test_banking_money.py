@@ -0,0 +1,16 @@
+from decimal import Decimal
+from fractions import Fraction
+
+from ..banking_money import Money
+
+
+def test_comparisons_are_exact_and_agree_with_hash():
+    money = Money(100)
+
+    assert money == 1 == 1.0 == Decimal("1.00") == Fraction(1)
+    assert hash(money) == hash(1) == hash(1.0) == hash(Decimal("1.00"))
+    assert money != 1.004 and money < 1.004 and money <= 1.004
+    assert money != Decimal("1.001") and money > Decimal("0.999")
+    assert Money.of(0.1) == 0.1 and Money(10) != Fraction(1, 3)
+    assert money < float('inf') and not money == float('nan')
+    assert money.__eq__("1.00") is NotImplemented
@@ -0,0 +1,72 @@
+from datetime import datetime
+import random
+
+from ..banking_scheduler import AccountScheduler, TimingWheel, add_months
+from ..python_oop_banking import CheckingAccount, SavingsAccount
+
+
+def test_wheel_fires_each_event_once_when_due_across_levels():
+    wheel = TimingWheel(start=0, resolution=1, slots=4, levels=3)
+    rng = random.Random(7)
+    pending = {}
+    now = 0
+    for _ in range(200):
+        for _ in range(rng.randint(0, 4)):
+            due = now + rng.choice((rng.randint(0, 5), rng.randint(0, 60), rng.randint(0, 500)))
+            pending[wheel.schedule(due, "tick")] = due
+        if pending and rng.random() < 0.3:
+            cancelled = rng.choice(list(pending))
+            assert wheel.cancel(cancelled) and not wheel.cancel(cancelled)
+            del pending[cancelled]
+        now += rng.choice((1, 3, 20, 90))
+
+        fired = wheel.advance(now)
+
+        assert set(fired) == {event for event, due in pending.items() if due <= now}
+        for event in fired:
+            del pending[event]
+        assert len(wheel) == len(pending)
+
+
+def test_recurring_events_rearm_and_skip_missed_periods():
+    wheel = TimingWheel(start=0, resolution=10)
+    event = wheel.schedule(100, "poll", interval=100)
+
+    assert wheel.advance(250) == [event]
+    assert event.due == 300
+    assert wheel.advance(1000) == [event]
+    assert event.due == 1100 and event.active
+    assert wheel.cancel(event)
+    assert wheel.advance(5000) == []
+    assert add_months(datetime(2024, 1, 31).timestamp()) == datetime(2024, 2, 29).timestamp()
+
+
+def test_account_scheduler_posts_due_batches():
+    start = datetime(2024, 1, 1)
+    savings = SavingsAccount("SAV001", "Jane Doe", 12000.0, interest_rate=0.12)
+    savings.last_interest_date = start
+    checking = CheckingAccount("CHK001", "John Smith", 500.0)
+    empty = CheckingAccount("CHK002", "Bob Johnson", 0.0, overdraft_limit=0.0)
+
+    scheduler = AccountScheduler(start=start)
+    scheduler.schedule_interest(savings, datetime(2024, 2, 1))
+    for account in (checking, empty):
+        scheduler.schedule_monthly_fee(account, datetime(2024, 1, 31))
+    rent = scheduler.schedule_standing_order(checking, savings, 100.0, datetime(2024, 1, 15))
+
+    assert scheduler.run_due(datetime(2024, 1, 10)) == {}
+    report = scheduler.run_due(datetime(2024, 2, 1))
+
+    assert report['standing_order']['posted'] == 1
+    assert report['monthly_fee']['posted'] == 1
+    assert report['monthly_fee']['declined_accounts'] == ["CHK002"]
+    assert report['interest']['posted'] == 1
+    assert checking.balance == 390.0
+    assert savings.balance == 12221.0
+    assert savings.last_interest_date == datetime(2024, 2, 1)
+
+    scheduler.cancel(rent)
+    report = scheduler.run_due(datetime(2024, 3, 1))
+    assert 'standing_order' not in report
+    assert report['interest']['total'] == 122.21
+    assert len(scheduler) == 3
@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+from ..banking_service import BankingService, create_demo_book
+
+
+def test_requests_for_one_account_are_coalesced():
+    service = BankingService(create_demo_book())
+
+    async def scenario():
+        return await asyncio.gather(*(
+            service.submit({'op': "deposit", 'account': "CA001", 'amount': 10.0}) for _ in range(50)
+        ))
+
+    responses = asyncio.run(scenario())
+    assert all(r['ok'] and r['accepted'] for r in responses)
+    assert responses[-1]['balance'] == 2500.0
+    assert service.batches_run == 1
+    assert service.pending == 0
+
+
+def test_full_queue_pushes_back():
+    service = BankingService(create_demo_book(), max_pending=3)
+
+    async def scenario():
+        return await asyncio.gather(*(
+            service.submit({'op': "balance", 'account': "BA001"}) for _ in range(5)
+        ))
+
+    errors = [r.get('error') for r in asyncio.run(scenario())]
+    assert errors == [None, None, None, "overloaded", "overloaded"]
+
+
+def test_tcp_round_trip_with_unknown_account():
+    async def scenario():
+        service = BankingService(create_demo_book())
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        replies = []
+        for request in ({'id': 1, 'op': "withdraw", 'account': "SA001", 'amount': 4600},
+                        {'id': 2, 'op': "balance", 'account': "XX000"}):
+            writer.write(json.dumps(request).encode() + b"\n")
+            replies.append(json.loads(await reader.readline()))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return replies
+
+    first, second = asyncio.run(scenario())
+    assert first == {'id': 1, 'ok': True, 'accepted': False, 'balance': 5000.0}
+    assert second['id'] == 2 and not second['ok']
+
+
+def test_unexpected_errors_answer_only_the_failing_request():
+    service = BankingService(create_demo_book())
+
+    async def scenario():
+        return await asyncio.gather(
+            service.submit({'op': "deposit", 'account': "CA001", 'amount': 10.0}),
+            service.submit({'op': "history", 'account': "CA001", 'limit': float('inf')}),
+            service.submit({'op': "balance", 'account': "CA001"}),
+        )
+
+    deposit, history, balance = asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert deposit['ok'] and balance['ok']
+    assert not history['ok'] and history['error']
+    assert service.pending == 0
+
+
+def test_non_object_requests_are_rejected_without_dropping_the_connection():
+    async def scenario():
+        service = BankingService(create_demo_book())
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        replies = []
+        for line in (b"[1, 2]", b"null", b"{not json", json.dumps({'id': 3, 'op': "balance", 'account': "CA001"}).encode()):
+            writer.write(line + b"\n")
+            replies.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return replies
+
+    array, null, garbage, balance = asyncio.run(scenario())
+    assert array == null == {'ok': False, 'error': "request must be a JSON object"}
+    assert garbage == {'ok': False, 'error': "invalid JSON"}
+    assert balance['id'] == 3 and balance['ok']
+
+
+def test_malformed_fields_and_oversized_lines_answer_only_that_request():
+    async def scenario():
+        service = BankingService(create_demo_book())
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        replies = []
+        for request in ({'op': "deposit", 'account': ["x"], 'amount': 1},
+                        {'op': "transfer", 'account': "CA001", 'to': {"a": 1}, 'amount': 1},
+                        {'op': "balance", 'account': "CA001", 'pad': "x" * 200_000},
+                        {'id': 4, 'op': "balance", 'account': "CA001"}):
+            writer.write(json.dumps(request).encode() + b"\n")
+            replies.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return replies
+
+    unhashable, bad_target, too_long, balance = asyncio.run(scenario())
+    assert not unhashable['ok'] and not bad_target['ok']
+    assert too_long == {'ok': False, 'error': "request line too long"}
+    assert balance == {'id': 4, 'ok': True, 'balance': 2000.0}
@@ -0,0 +1,72 @@
+from ..banking_events import INSUFFICIENT_FUNDS, MINIMUM_BALANCE, OVERDRAFT_EXCEEDED, MemorySink
+from ..banking_simulation import population_from_accounts, simulate, simulate_chunk, synthetic_population
+from ..python_oop_banking import CheckingAccount, SavingsAccount, set_event_sink
+
+QUIET = {'deposit_probability': 0.0, 'withdraw_probability': 0.0}
+
+
+def test_runs_reproduce_for_a_seed_whatever_the_worker_count():
+    population = synthetic_population(3000, seed=4)
+
+    in_process = simulate(population, steps=60, seed=9, chunk_size=1000, workers=0)
+    pooled = simulate(population, steps=60, seed=9, chunk_size=1000, workers=2)
+    other_seed = simulate(population, steps=60, seed=10, chunk_size=1000, workers=0)
+
+    assert (in_process['final_balances'] == pooled['final_balances']).all()
+    for field, values in in_process['months'].items():
+        assert (values == pooled['months'][field]).all()
+    assert not (in_process['final_balances'] == other_seed['final_balances']).all()
+
+
+def test_month_end_applies_interest_and_fees_like_the_account_classes():
+    savings = SavingsAccount("S1", "Ann", 1200.0, interest_rate=0.12)
+    checking = CheckingAccount("C1", "Bob", 100.0)
+    broke = CheckingAccount("C2", "Cy", 0.0, overdraft_limit=15.0)
+    population = population_from_accounts([savings, checking, broke])
+
+    months, final = simulate_chunk(population, steps=2, steps_per_month=1, seed=0, behaviour=QUIET)
+
+    # 1% a month on savings, $10 fee on checking; the fee is refused past the overdraft
+    assert final.tolist() == [122412, 8000, -1000]
+    assert months['interest_paid'].tolist() == [1200, 1212]
+    assert months['fees_charged'].tolist() == [2000, 1000]
+    assert months['fees_rejected'].tolist() == [0, 1]
+    assert months['overdrawn_accounts'].tolist() == [1, 1]
+    assert months['overdraft_used'].tolist() == [1000, 1000]
+
+
+def test_withdrawals_never_break_minimum_balance_or_overdraft():
+    population = synthetic_population(2000, seed=1)
+    behaviour = {'withdraw_probability': 0.9, 'withdraw_mean': 800.0, 'deposit_probability': 0.05}
+
+    result = simulate(population, steps=90, seed=3, chunk_size=500, workers=0, behaviour=behaviour)
+
+    assert (result['final_balances'] >= population['floor']).all()
+    assert result['months'][MINIMUM_BALANCE].sum() > 0
+    assert result['months'][OVERDRAFT_EXCEEDED].sum() > 0
+    assert result['months']['overdrawn_accounts'][-1] > 0
+    assert result['final_percentiles']['p1'] <= result['final_percentiles']['p50']
+
+
+def test_rejections_are_counted_under_the_reason_withdraw_reports():
+    accounts = [
+        SavingsAccount("S1", "Ann", 150.0, minimum_balance=100.0),   # 120 breaks the minimum
+        SavingsAccount("S2", "Bo", 110.0, minimum_balance=100.0),    # 120 exceeds the balance
+        CheckingAccount("C1", "Cy", 0.0, overdraft_limit=50.0),
+    ]
+    behaviour = {'withdraw_probability': 1.0, 'withdraw_mean': 120.0, 'amount_sigma': 0.0,
+                 'deposit_probability': 0.0}
+
+    months, _final = simulate_chunk(population_from_accounts(accounts), steps=1, steps_per_month=1,
+                                    seed=0, behaviour=behaviour, fees={})
+    sink = MemorySink()
+    previous = set_event_sink(sink)
+    try:
+        for account in accounts:
+            account.withdraw(120.0)
+    finally:
+        set_event_sink(previous)
+
+    reasons = [event['reason'] for event in sink.events]
+    for reason in (INSUFFICIENT_FUNDS, MINIMUM_BALANCE, OVERDRAFT_EXCEEDED):
+        assert months[reason].tolist() == [reasons.count(reason)] == [1]
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+
+from ..banking_snapshot import SnapshotReader, write_snapshot
+from ..python_oop_banking import BankAccount, CheckingAccount, SavingsAccount
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    savings = SavingsAccount("SA001", "Ann Lee", 1500.25, 0.035, 250.0)
+    savings.last_interest_date = datetime(2024, 5, 1, 9, 30)
+    accounts = [
+        CheckingAccount("CA001", "Bo Chan", -75.5, 300.0),
+        savings,
+        BankAccount("BA001", "Cy Diaz", 10.0),
+    ]
+    path = str(tmp_path / "accounts.snap")
+    write_snapshot(path, accounts)
+    return path
+
+
+def test_accounts_materialize_lazily_by_number(snapshot_path):
+    with SnapshotReader(snapshot_path) as snapshot:
+        assert len(snapshot) == 3
+        assert snapshot.total_balance() == pytest.approx(1434.75)
+
+        savings = snapshot.get("SA001")
+        assert isinstance(savings, SavingsAccount)
+        assert (savings.balance, savings.interest_rate, savings.minimum_balance) == (1500.25, 0.035, 250.0)
+        assert savings.last_interest_date == datetime(2024, 5, 1, 9, 30)
+        assert snapshot.get("SA001") is savings
+
+        checking = snapshot.get("CA001")
+        assert (checking.balance, checking.overdraft_limit) == (-75.5, 300.0)
+        assert snapshot.get("ZZ999") is None
+        assert [a.account_number for a in snapshot] == ["BA001", "CA001", "SA001"]
+
+
+def test_empty_snapshot(tmp_path):
+    path = str(tmp_path / "empty.snap")
+    write_snapshot(path, [])
+    with SnapshotReader(path) as snapshot:
+        assert len(snapshot) == 0
+        assert snapshot.get("BA001") is None
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a snapshot at all, just some bytes")
+    with pytest.raises(ValueError):
+        SnapshotReader(str(path))
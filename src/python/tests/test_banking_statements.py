@@ -0,0 +1,42 @@
+import csv
+from datetime import datetime
+import json
+
+from ..banking_statements import JSONL, export_statements, statement_path, write_statement
+from ..python_oop_banking import BankAccount
+
+
+def _account(number="ACC001"):
+    account = BankAccount(number, "John Doe")
+    ledger = account.transactions
+    ledger.append("Deposit", 100.0, 100.0, timestamp=datetime(2024, 2, 20).timestamp())
+    ledger.append("Deposit", 50.0, 150.0, timestamp=datetime(2024, 3, 2).timestamp())
+    ledger.append("Withdrawal", -20.25, 129.75, timestamp=datetime(2024, 3, 5).timestamp())
+    ledger.append("Withdrawal", -9.75, 120.0, timestamp=datetime(2024, 3, 9).timestamp())
+    ledger.append("Deposit", 1.0, 121.0, timestamp=datetime(2024, 4, 1).timestamp())
+    return account
+
+
+def test_csv_statement_has_opening_totals_and_closing(tmp_path):
+    path = tmp_path / "statement.csv"
+
+    entries = write_statement(_account(), path, datetime(2024, 3, 1), datetime(2024, 4, 1))
+
+    rows = list(csv.DictReader(open(path, newline='')))
+    assert entries == 3
+    assert [r['record'] for r in rows] == ["opening", "entry", "entry", "entry", "total", "total", "closing"]
+    assert rows[0]['balance'] == "100.00" and rows[-1]['balance'] == "120.00"
+    assert {r['type']: r['amount'] for r in rows if r['record'] == "total"} == {"Deposit": "50.00", "Withdrawal": "-30.00"}
+
+
+def test_parallel_jsonl_export_writes_one_file_per_account(tmp_path):
+    accounts = [_account(f"ACC{i:03d}") for i in range(5)]
+
+    totals = export_statements(accounts, tmp_path, datetime(2024, 3, 1), datetime(2024, 4, 1),
+                               fmt=JSONL, workers=2, chunk_entries=4)
+
+    assert totals == {'statements': 5, 'entries': 15}
+    lines = [json.loads(line) for line in open(statement_path(tmp_path, "ACC004", JSONL))]
+    assert lines[0]['record'] == "statement" and lines[0]['account_type'] == "Basic"
+    assert lines[-1] == {'record': "closing", 'account_number': "ACC004",
+                         'timestamp': "2024-04-01 00:00:00", 'balance': 120.0}
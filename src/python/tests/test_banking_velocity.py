@@ -0,0 +1,57 @@
+from ..banking_events import MemorySink, VELOCITY_LIMIT
+from ..banking_velocity import VelocityRule
+from ..python_oop_banking import CheckingAccount, SavingsAccount, set_event_sink
+
+
+def test_counter_expires_withdrawals_as_the_window_slides():
+    counter = VelocityRule(window=60, max_count=2, max_amount=100.0, buckets=6).counter()
+
+    counter.record(4000, now=0)
+    counter.record(4000, now=25)
+    assert not counter.allows(100, now=55)
+    assert not counter.allows(6001, now=61)
+    # The first bucket [0, 10) leaves once all of it is a full window old
+    assert counter.allows(6000, now=70)
+    assert not counter.allows(6001, now=70)
+    assert counter.allows(10000, now=1000)
+    assert counter.count == 0
+
+
+def test_window_is_never_shorter_than_configured():
+    counter = VelocityRule(window=60, max_count=1, buckets=6).counter()
+
+    counter.record(100, now=9.99)
+    assert not counter.allows(100, now=60)
+    assert not counter.allows(100, now=69.99)
+    assert counter.allows(100, now=70)
+    assert counter.count == 0
+
+
+
+def test_withdraw_enforces_count_and_amount_limits():
+    account = CheckingAccount("CA001", "Bob Johnson", 1000.0)
+    account.set_velocity_rules(VelocityRule(window=3600, max_count=3),
+                               VelocityRule(window=86400, max_amount=250.0))
+    sink = MemorySink()
+    previous = set_event_sink(sink)
+    try:
+        results = [account.withdraw(100), account.withdraw(200), account.withdraw(100),
+                   account.withdraw(50), account.withdraw(1)]
+    finally:
+        set_event_sink(previous)
+
+    assert results == [True, False, True, True, False]
+    assert account.balance == 750
+    assert [e['reason'] for e in sink.events] == [None, VELOCITY_LIMIT, None, None, VELOCITY_LIMIT]
+
+
+def test_class_default_rules_apply_to_new_withdrawals():
+    SavingsAccount.velocity_rules = (VelocityRule(window=60, max_count=1),)
+    try:
+        account = SavingsAccount("SA001", "Jane Smith", 5000.0)
+        assert account.withdraw(10)
+        assert not account.withdraw(10)
+        account.set_velocity_rules()
+        assert account.withdraw(10)
+    finally:
+        SavingsAccount.velocity_rules = ()